@@ -2,15 +2,49 @@ from datetime import datetime, timezone
 import random
 import subprocess
 import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional
+
+from metrics.cpu_sampler import CpuSampler, CpuUsage
+from metrics.procfs_backend import ProcfsBackend
+from metrics.public_ip import PublicIPResolver, PublicIPResult
+from metrics.sample import MetricSample
+from metrics.throughput import DiskThroughput, NetworkThroughput, format_rate
+from metrics.scheduler import COST_CHEAP, COST_IO, MetricScheduler, MetricSpec
+from metrics.warm_cache import WarmCache, default_cache_path
 
 class DataGatherer:
     """Gathers system and network metrics, with simulated fallbacks for non-Raspberry environments."""
 
     # Constants
     HEAVY_GATHER_INTERVAL = 300  # seconds between expensive gathers
+    SIMULATED_CORES = 4
+    SIMULATED_UPTIME = (98400, "1d 3h 20m")  # seconds, display string
+
+    # Refresh interval (seconds), cost class and jitter (seconds) of every metric
+    METRIC_SCHEDULE = {
+        'public_ip': (5.0, COST_CHEAP, 0.0),  # only reads the resolver's last result
+        'local_ip':  (60.0, COST_IO, 5.0),
+        'disk':      (30.0, COST_IO, 5.0),
+        'cpu':       (1.0, COST_CHEAP, 0.0),
+        'mem':       (2.0, COST_CHEAP, 0.0),
+        'temp':      (2.0, COST_CHEAP, 0.0),
+        'uptime':    (30.0, COST_CHEAP, 0.0),
+        'time':      (1.0, COST_CHEAP, 0.0),
+        'net':       (2.0, COST_CHEAP, 0.0),
+        'diskio':    (2.0, COST_CHEAP, 0.0),
+    }
+
+    # Slow-changing metrics kept in the warm cache, with their maximum age (seconds)
+    PERSISTED_METRICS = {
+        'public_ip': 24 * 3600,
+        'local_ip':  3600,
+        'disk':      3600,
+    }
+    WARM_CACHE_SAVE_INTERVAL = 600  # seconds before an unchanged entry's timestamp is refreshed on disk
+    NATIVE_RETRY_INTERVAL = 300     # seconds a metric uses its shell command after the native reader failed
 
     # Shell commands as constants
-    PUBLIC_IP_CMD = "curl -s ifconfig.me"
     LOCAL_IP_CMD = "hostname -I | awk '{print $1}'"
     DISK_USAGE_CMD = "df / | awk 'NR==2 {print $5}'"
     TEMP_CMD = "awk '{printf \"%.1f°C\\n\", $1/1000}' /sys/class/thermal/thermal_zone0/temp"
@@ -25,83 +59,286 @@ class DataGatherer:
         )
     RAM_USAGE_CMD = "free | awk '/Mem:/ {printf \"%.1f%%\\n\", ($3/$2)*100}'"
 
-    def __init__(self, is_raspberry: bool = True) -> None:
-        """Initialize the DataGatherer with a flag indicating if it's running on a Raspberry Pi."""
-        self.is_raspberry = is_raspberry
+    def __init__(self, is_raspberry: bool = True, use_procfs: bool = True, cache_path: Optional[str] = None) -> None:
+        """Initialize the DataGatherer with a flag indicating if it's running on a Raspberry Pi.
 
-        # Caches for infrequently-changing values
-        self._caches = {
-            'public_ip': {'value': '', 'timestamp': 0},
-            'local_ip':  {'value': '', 'timestamp': 0},
-            'disk':      {'value': '', 'timestamp': 0},
-        }
+        When `use_procfs` is set, metrics are read natively from procfs/sysfs
+        and the shell commands are only used as a fallback. Slow metrics are
+        warmed from `cache_path` (default: see metrics.warm_cache) on real
+        hardware; simulated data is never persisted.
+        """
+        self.is_raspberry = is_raspberry
+        self.backend: Optional[ProcfsBackend] = ProcfsBackend() if is_raspberry and use_procfs else None
+        self.cpu_sampler: Optional[CpuSampler] = CpuSampler(self.backend) if self.backend else None
+        self.net_throughput: Optional[NetworkThroughput] = NetworkThroughput(self.backend) if self.backend else None
+        self.disk_throughput: Optional[DiskThroughput] = DiskThroughput(self.backend) if self.backend else None
+        self.public_ip_resolver: Optional[PublicIPResolver] = (
+            PublicIPResolver(refresh_interval=self.HEAVY_GATHER_INTERVAL) if is_raspberry else None
+        )
 
         # State for simulated metrics
         self._sim_cpu = 5.0
         self._sim_mem = 35.0
         self._sim_temp = 65.0
 
-    def _run_cached(self, key: str, cmd: str) -> str:
-        """Run a shell command if cache is stale, else return cached value."""
-        cache = self._caches[key]
+        # Each metric is refreshed on its own schedule
+        self.scheduler = MetricScheduler(self._metric_specs())
+        self._native_retry_at: Dict[str, float] = {}  # metric -> monotonic time to try its native reader again
+
+        # Values of slow metrics from the previous run, served until refreshed
+        self.warm_cache: Optional[WarmCache] = WarmCache(cache_path or default_cache_path()) if is_raspberry else None
+        self._persisted: Dict[str, tuple] = {}
+        self._load_warm_cache()
+
+    def _load_warm_cache(self) -> None:
+        """Seed the scheduler (and public IP resolver) with unexpired values from disk."""
+        if self.warm_cache is None:
+            return
+        self._persisted = self.warm_cache.load(self.PERSISTED_METRICS)
+        for key, (value, timestamp) in self._persisted.items():
+            try:
+                numeric = self.parse_metric_value(key, value)
+            except ValueError:
+                continue
+            self.scheduler.seed(key, MetricSample(value, numeric, stale=True))
+            if key == 'public_ip' and self.public_ip_resolver is not None:
+                self.public_ip_resolver.seed(value, timestamp)
+
+    def _save_warm_cache(self, updated: Dict[str, MetricSample]) -> None:
+        """Persist refreshed slow metrics when they changed or their entry is getting old."""
+        if self.warm_cache is None:
+            return
         now = time.time()
-        if now - cache['timestamp'] > self.HEAVY_GATHER_INTERVAL:
-            output = subprocess.check_output(cmd, shell=True).decode().strip()
-            cache.update(value=output, timestamp=now)
-        return cache['value']
+        dirty = False
+        for key in self.PERSISTED_METRICS:
+            sample = updated.get(key)
+            if sample is None or not sample.text or sample.stale:
+                continue  # only persist values that were actually read
+            timestamp = now
+            if key == 'public_ip':
+                timestamp = self.public_ip_resolver.current().fetched_at
+            value, saved_at = self._persisted.get(key, ('', 0.0))
+            if value != sample.text or timestamp - saved_at > self.WARM_CACHE_SAVE_INTERVAL:
+                self._persisted[key] = (sample.text, timestamp)
+                dirty = True
+        if dirty:
+            self.warm_cache.save(self._persisted)
+
+    def start(self) -> None:
+        """Start background helpers (the public IP resolver)."""
+        if self.public_ip_resolver is not None:
+            self.public_ip_resolver.start()
+
+    def stop(self) -> None:
+        """Stop background helpers and release open file handles."""
+        if self.public_ip_resolver is not None:
+            self.public_ip_resolver.stop()
+        if self.backend is not None:
+            self.backend.close()
+
+    def _readers(self) -> Dict[str, Callable[[], MetricSample]]:
+        """Return the sample reader of every available metric, keyed like METRIC_SCHEDULE."""
+        readers = {
+            'public_ip': self.read_public_ip, 'local_ip': self.read_local_ip,
+            'cpu': self.read_cpu, 'mem': self.read_mem,
+            'disk': self.read_disk, 'temp': self.read_temp,
+            'uptime': self.read_uptime, 'time': self.read_time,
+        }
+        # Throughput has no shell fallback, so it needs procfs (or simulation)
+        if self.backend is not None or not self.is_raspberry:
+            readers.update(net=self.read_net, diskio=self.read_diskio)
+        return readers
+
+    def _metric_specs(self) -> List[MetricSpec]:
+        """Build the metric registry from METRIC_SCHEDULE."""
+        readers = self._readers()
+        return [
+            MetricSpec(key, readers[key], interval, cost, jitter)
+            for key, (interval, cost, jitter) in self.METRIC_SCHEDULE.items()
+            if key in readers
+        ]
+
+    def snapshot(self) -> Dict[str, MetricSample]:
+        """Sample every due metric exactly once and return the latest sample of all metrics."""
+        self.refresh_due()
+        return self.cached_values()
+
+    def refresh_due(self) -> Dict[str, MetricSample]:
+        """Read only the metrics whose refresh interval has elapsed and return their samples."""
+        updated = self.scheduler.run_due()
+        self._save_warm_cache(updated)
+        return updated
+
+    def cached_values(self) -> Dict[str, MetricSample]:
+        """Return the latest known sample of every metric, including values warmed from disk."""
+        return dict(self.scheduler.values)
+
+    def next_due(self) -> float:
+        """Return the time.monotonic() instant at which the next metric is due."""
+        return self.scheduler.next_deadline()
+
+    def _sample(self, key: str, cmd: str, native: Callable[[], MetricSample]) -> MetricSample:
+        """Read a metric natively when possible, falling back to the shell command (parsed once, here).
+
+        A native reader that failed (e.g. no thermal zone) is not tried again
+        for NATIVE_RETRY_INTERVAL seconds.
+        """
+        if self.backend is not None and time.monotonic() >= self._native_retry_at.get(key, 0.0):
+            try:
+                sample = native()
+                self._native_retry_at.pop(key, None)
+                return sample
+            except (OSError, ValueError, KeyError):
+                self._native_retry_at[key] = time.monotonic() + self.NATIVE_RETRY_INTERVAL
+        text = subprocess.check_output(cmd, shell=True).decode().strip()
+        return MetricSample(text, self.parse_metric_value(key, text))
+
+    # --- Sample readers ---
+
+    def read_public_ip(self) -> MetricSample:
+        """Return the last known public IP; it is resolved in the background every HEAVY_GATHER_INTERVAL seconds."""
+        result = self.get_public_ip_result()
+        return MetricSample(result.value, stale=result.stale)
+
+    def read_local_ip(self) -> MetricSample:
+        """Return the local IP."""
+        if not self.is_raspberry:
+            return MetricSample(f"192.168.0.{random.randint(1,254)}")
+        return self._sample('local_ip', self.LOCAL_IP_CMD, lambda: MetricSample(self.backend.local_ip()))
+
+    def read_cpu(self) -> MetricSample:
+        """Return CPU usage (fraction), with per-core, iowait and steal figures in `detail`."""
+        usage = self.get_cpu_breakdown()
+        if usage is None:
+            text = subprocess.check_output(self.CPU_USAGE_CMD, shell=True).decode().strip()
+            return MetricSample(text, self.parse_metric_value('cpu', text))
+        detail = {'iowait': usage.iowait, 'steal': usage.steal}
+        detail.update((f"cpu{i}", core) for i, core in enumerate(usage.per_core))
+        return MetricSample(usage.text, usage.total, detail=MappingProxyType(detail))
+
+    def read_mem(self) -> MetricSample:
+        """Return memory usage (fraction)."""
+        if not self.is_raspberry:
+            self._sim_mem = max(40.0, min(90.0, self._sim_mem + random.uniform(-2,2)))
+            return MetricSample(f"{self._sim_mem:.1f}%", self._sim_mem / 100)
+
+        def native() -> MetricSample:
+            ratio = self.backend.mem_used_ratio()
+            return MetricSample(f"{ratio * 100:.1f}%", ratio)
+        return self._sample('mem', self.RAM_USAGE_CMD, native)
+
+    def read_disk(self) -> MetricSample:
+        """Return disk usage of root (/) (fraction)."""
+        if not self.is_raspberry:
+            percent = random.randint(5,15)
+            return MetricSample(f"{percent}%", percent / 100)
+
+        def native() -> MetricSample:
+            percent = self.backend.disk_used_percent()
+            return MetricSample(f"{percent}%", percent / 100)
+        return self._sample('disk', self.DISK_USAGE_CMD, native)
+
+    def read_temp(self) -> MetricSample:
+        """Return CPU temperature (degrees Celsius)."""
+        if not self.is_raspberry:
+            self._sim_temp += random.uniform(-1.5,1.5)
+            return MetricSample(f"{self._sim_temp:.1f}°C", self._sim_temp)
+
+        def native() -> MetricSample:
+            celsius = self.backend.read_temperature()
+            return MetricSample(f"{celsius:.1f}°C", celsius)
+        return self._sample('temp', self.TEMP_CMD, native)
+
+    def read_uptime(self) -> MetricSample:
+        """Return system uptime (seconds) in human-readable form."""
+        if not self.is_raspberry:
+            seconds, text = self.SIMULATED_UPTIME
+            return MetricSample(text, seconds)
+
+        def native() -> MetricSample:
+            seconds = self.backend.read_uptime_seconds()
+            return MetricSample(ProcfsBackend.format_uptime(seconds), seconds)
+        return self._sample('uptime', self.UPTIME_CMD, native)
+
+    def read_time(self) -> MetricSample:
+        """Return local system time with timezone (value: seconds since the epoch)."""
+        now = time.time()
+        if not self.is_raspberry:
+            local = datetime.now(timezone.utc).astimezone()
+            offset = int(local.strftime('%z')) // 100
+            return MetricSample(local.strftime(f"%H:%M GMT{offset:+d}"), now)
+        return self._sample('time', self.SYSTIME_CMD, lambda: MetricSample(ProcfsBackend.systime(), now))
+
+    def read_net(self) -> MetricSample:
+        """Return total network throughput (bytes/s), with per-interface rx/tx rates in `detail`."""
+        if not self.is_raspberry:
+            rx, tx = random.uniform(1e3, 2e6), random.uniform(1e3, 5e5)
+            detail = MappingProxyType({'eth0.rx': rx, 'eth0.tx': tx})
+            return MetricSample(f"{format_rate(rx)}/{format_rate(tx)}", rx + tx, detail=detail)
+        return self.net_throughput.sample()
+
+    def read_diskio(self) -> MetricSample:
+        """Return total block-device throughput (bytes/s), with per-disk rates and IOPS in `detail`."""
+        if not self.is_raspberry:
+            read, write = random.uniform(0, 1e6), random.uniform(0, 3e5)
+            detail = MappingProxyType({'mmcblk0.read': read, 'mmcblk0.write': write,
+                                       'mmcblk0.iops': random.uniform(0, 50)})
+            return MetricSample(f"{format_rate(read)}/{format_rate(write)}", read + write, detail=detail)
+        return self.disk_throughput.sample()
+
+    # --- String getters ---
 
     def get_public_ip(self) -> str:
-        """Return the public IP, cached for HEAVY_GATHER_INTERVAL seconds."""
+        """Return the last known public IP; it is resolved in the background every HEAVY_GATHER_INTERVAL seconds."""
+        return self.read_public_ip().text
+
+    def get_public_ip_result(self) -> PublicIPResult:
+        """Return the last known public IP along with its staleness; never blocks (resolved once start() was called)."""
         if not self.is_raspberry:
-            return f"138.36.96.{random.randint(1,254)}"
-        return self._run_cached('public_ip', self.PUBLIC_IP_CMD)
+            return PublicIPResult(f"138.36.96.{random.randint(1,254)}", time.time(), False)
+        return self.public_ip_resolver.current()
 
     def get_local_ip(self) -> str:
-        """Return the local IP, cached for HEAVY_GATHER_INTERVAL seconds."""
-        if not self.is_raspberry:
-            return f"192.168.0.{random.randint(1,254)}"
-        return self._run_cached('local_ip', self.LOCAL_IP_CMD)
+        """Return the local IP."""
+        return self.read_local_ip().text
 
     def get_cpu_usage(self) -> str:
         """Return CPU usage as a percentage string."""
+        return self.read_cpu().text
+
+    def get_cpu_breakdown(self) -> Optional[CpuUsage]:
+        """Return total, per-core, iowait and steal usage since the previous call, or None if /proc/stat is unavailable."""
         if not self.is_raspberry:
             self._sim_cpu = max(20.0, min(80.0, self._sim_cpu + random.uniform(-5,5)))
-            return f"{self._sim_cpu:.1f}%"
-        return subprocess.check_output(self.CPU_USAGE_CMD, shell=True).decode().strip()
+            cores = [max(0.0, min(1.0, self._sim_cpu / 100 + random.uniform(-0.1, 0.1)))
+                     for _ in range(self.SIMULATED_CORES)]
+            return CpuUsage(self._sim_cpu / 100, 0.01, 0.0, cores, f"{self._sim_cpu:.1f}%")
+        if self.cpu_sampler is None:
+            return None
+        try:
+            return self.cpu_sampler.sample()
+        except (OSError, ValueError):
+            return None
 
     def get_mem_usage(self) -> str:
         """Return memory usage as a percentage string."""
-        if not self.is_raspberry:
-            self._sim_mem = max(40.0, min(90.0, self._sim_mem + random.uniform(-2,2)))
-            return f"{self._sim_mem:.1f}%"
-        return subprocess.check_output(self.RAM_USAGE_CMD, shell=True).decode().strip()
+        return self.read_mem().text
 
     def get_disk_usage(self) -> str:
         """Return disk usage of root (/) as a percentage string."""
-        if not self.is_raspberry:
-            return f"{random.randint(5,15)}%"
-        return self._run_cached('disk', self.DISK_USAGE_CMD)
+        return self.read_disk().text
 
     def get_temperature(self) -> str:
         """Return CPU temperature in Celsius."""
-        if not self.is_raspberry:
-            self._sim_temp += random.uniform(-1.5,1.5)
-            return f"{self._sim_temp:.1f}°C"
-        return subprocess.check_output(self.TEMP_CMD, shell=True).decode().strip()
+        return self.read_temp().text
 
     def get_uptime(self) -> str:
         """Return system uptime in human-readable form."""
-        if not self.is_raspberry:
-            return "1d 3h 20m"
-        return subprocess.check_output(self.UPTIME_CMD, shell=True).decode().strip()
+        return self.read_uptime().text
 
     def get_systime(self) -> str:
         """Return local system time with timezone."""
-        if not self.is_raspberry:
-            now = datetime.now(timezone.utc).astimezone()
-            offset = int(now.strftime('%z')) // 100
-            return now.strftime(f"%H:%M GMT{offset:+d}")
-        return subprocess.check_output(self.SYSTIME_CMD, shell=True).decode().strip()
+        return self.read_time().text
 
     # --- Numeric helpers ---
 
@@ -109,16 +346,17 @@ class DataGatherer:
         """Remove a suffix and convert to float."""
         return float(text.replace(suffix, '').strip())
 
-    def get_metric_value(self, key: str) -> float:
-        """Return the numeric value of a metric based on its key."""
+    def parse_metric_value(self, key: str, text: str) -> float:
+        """Return the numeric value of an already-gathered metric string."""
         key = key.lower()
-        if key == 'cpu':
-            return self._strip_suffix(self.get_cpu_usage(), '%') / 100.0
-        elif key == 'mem':
-            return self._strip_suffix(self.get_mem_usage(), '%') / 100.0
-        elif key == 'disk':
-            return self._strip_suffix(self.get_disk_usage(), '%') / 100.0
+        if key in ('cpu', 'mem', 'disk'):
+            return self._strip_suffix(text, '%') / 100.0
         elif key == 'temp':
-            return self._strip_suffix(self.get_temperature(), '°C')
+            return self._strip_suffix(text, '°C')
         else:
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+    def get_metric_value(self, key: str) -> float:
+        """Return the numeric value of a metric based on its key (reads the metric once)."""
+        reader = self._readers().get(key.lower())
+        return reader().value if reader else 0.0
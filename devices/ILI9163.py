@@ -2,9 +2,13 @@ import numpy as np
 from periphery import GPIO
 from PIL import Image
 import spidev
+from typing import Optional
 import time
 
 from devices.device import Device
+from utils.dirty_rects import find_dirty_rects, transfer_cost
+from utils.frame_dedup import DedupStats, FrameDeduplicator
+from utils.rgb565 import BIG_ENDIAN, RGB565Converter
 
 # GPIO chip path
 GPIO_CHIP_PATH = "/dev/gpiochip0"
@@ -54,7 +58,8 @@ ROTATION_MADCTL = {
 
 class ILI9163(Device):
     def __init__(self, spi_bus: int = 0, spi_device: int = 0, dc_pin: int = 25, rst_pin: int = 24, cs_pin: int = 5,
-                 width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT, rotation: int = 180):
+                 width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT, rotation: int = 180,
+                 refresh_interval: Optional[float] = None):
         """
         Initialize the display and SPI connection.
 
@@ -67,6 +72,7 @@ class ILI9163(Device):
             width (int): Display width in pixels.
             height (int): Display height in pixels.
             rotation (int): Display rotation in degrees (0, 90, 180, 270).
+            refresh_interval (float): Seconds after which an unchanged frame is sent anyway (None to never).
         """
         super().__init__(width, height)
 
@@ -78,8 +84,12 @@ class ILI9163(Device):
         self.rst = GPIO(GPIO_CHIP_PATH, rst_pin, "out")
         self.cs = GPIO(GPIO_CHIP_PATH, cs_pin, "out")
         self._setup_spi(spi_bus, spi_device)
-        self.front_buffer: np.ndarray = np.zeros((height, width), dtype=np.uint16)
+        # Buffers hold big-endian words, the order the controller expects, so they go out without a byteswap
+        self._converter = RGB565Converter(width, height, BIG_ENDIAN)
+        self.front_buffer: np.ndarray = self._converter.new_buffer()
         self.back_buffer: np.ndarray = np.zeros_like(self.front_buffer)
+        self._dedup = FrameDeduplicator(refresh_interval)
+        self._front_on_panel = False # front buffer matches the panel's memory (after the first full send)
         self._display_ready = False
         self._init_display()
         time.sleep(0.5)
@@ -154,12 +164,26 @@ class ILI9163(Device):
         return [start >> 8, start & 0xFF, end >> 8, end & 0xFF]
 
     def set_window(self, x0=0, y0=0, x1=None, y1=None):
+        """
+        Set the RAM window (inclusive) for the next pixel write and start the write.
+        """
         x1 = x1 if x1 is not None else self.width - 1
         y1 = y1 if y1 is not None else self.height - 1
-        self._write([CMD_CASET] + self._pack_coords(x0, x1), True)
-        self._write([CMD_PASET] + self._pack_coords(y0, y1), True)
+        self._write([CMD_CASET], True)
+        self._write(self._pack_coords(x0, x1), False)
+        self._write([CMD_PASET], True)
+        self._write(self._pack_coords(y0, y1), False)
         self._write([CMD_RAMWR], True)
 
+    def _write_pixels(self, data: bytes) -> None:
+        """Send pixel data for the current window, falling back to chunked transfer if needed."""
+        try:
+            self._write(data, is_command=False)
+        except Exception:
+            # Fallback: send data in smaller chunks
+            for i in range(0, len(data), CHUNK_SIZE):
+                self._write(data[i:i+CHUNK_SIZE], is_command=False)
+
     def clear(self, color=COLOR_BLACK):
         """
         Fill the screen with a single color.
@@ -174,19 +198,28 @@ class ILI9163(Device):
         """
         Send the front buffer to the display.
         Swaps front and back buffers before sending.
-        Falls back to chunked transfer if needed.
+        Skips the transfer if the back buffer matches the last frame sent.
+        Only the changed rectangles are sent, unless one full-frame transfer is cheaper.
         """
         if not self._display_ready:
             return
+        if self._dedup.is_duplicate(self.back_buffer):
+            return
+        start = self.frame_timer.start()
+        # No rectangles (a forced refresh) or too many to beat one transfer: send the whole frame
+        rects = find_dirty_rects(self.front_buffer, self.back_buffer) if self._front_on_panel else []
+        full_cost = transfer_cost([(0, 0, self.width - 1, self.height - 1)])
         self.swap_buffers()
-        self.set_window()
-        data = self.front_buffer.byteswap().tobytes()
-        try:
-            self._write(data, is_command=False)
-        except Exception:
-            # Fallback: send data in smaller chunks
-            for i in range(0, len(data), CHUNK_SIZE):
-                self._write(data[i:i+CHUNK_SIZE], is_command=False)
+        if rects and transfer_cost(rects) < full_cost:
+            for x0, y0, x1, y1 in rects:
+                self.set_window(x0, y0, x1, y1)
+                self._write_pixels(self.front_buffer[y0:y1 + 1, x0:x1 + 1].tobytes())
+        else:
+            self.set_window()
+            self._write_pixels(self.front_buffer.tobytes())
+            self._front_on_panel = True
+        self._dedup.mark_sent(self.front_buffer)
+        self.frame_timer.record("push", start)
 
     def display(self, image: Image.Image) -> None:
         """
@@ -195,19 +228,36 @@ class ILI9163(Device):
         Args:
             image (PIL.Image.Image): Input image to display.
         """
-        if image.mode == 'RGBA':
-            bg = Image.new("RGBA", image.size, (0, 0, 0, 255))
-            image = Image.alpha_composite(bg, image)
-        
-        img = image.convert('RGB').resize((self.width, self.height))
-        arr = np.array(img, dtype=np.uint16)
-        r = (arr[:, :, 0] & 0xF8) << 8
-        g = (arr[:, :, 1] & 0xFC) << 3
-        b = (arr[:, :, 2] & 0xF8) >> 3
-        rgb565 = r | g | b
-        np.copyto(self.back_buffer, rgb565)
+        start = self.frame_timer.start()
+        self._converter.convert(image, out=self.back_buffer)
+        self.frame_timer.record("convert", start)
         self.update()
 
+    @property
+    def rgb565_byteorder(self) -> str:
+        """The controller takes big-endian RGB565 words."""
+        return BIG_ENDIAN
+
+    def display_rgb565(self, frame: np.ndarray) -> bool:
+        """
+        Show a ready-made big-endian RGB565 frame, with a single copy into the back buffer.
+
+        Args:
+            frame (np.ndarray): (height, width) array of big-endian RGB565 words.
+
+        Returns:
+            bool: False if the frame does not match the display.
+        """
+        if frame.shape != self.back_buffer.shape or frame.dtype != self.back_buffer.dtype:
+            return False
+        np.copyto(self.back_buffer, frame)
+        self.update()
+        return True
+
+    def transmission_stats(self) -> DedupStats:
+        """Frames sent over SPI and unchanged frames skipped."""
+        return self._dedup.stats()
+
     def rgb_to_565(self, r: int, g: int, b: int) -> int:
         """
         Convert 24-bit RGB color to 16-bit RGB565 format.
@@ -1,8 +1,15 @@
 from PIL import Image
+import numpy as np
+from typing import Optional
+
+from utils.frame_dedup import DedupStats
+from utils.frame_timing import FrameTimer, NULL_TIMER
 
 class Device:
     """This class defines the interface for devices that can display images."""
-    
+    frame_timer: FrameTimer = NULL_TIMER # records the "convert" and "push" stages when enabled
+    max_frame_interval: float = float('inf') # longest the device may go without a frame (seconds)
+
     def __init__(self, width: int, height: int) -> None:
         """Initialize the device with a given width and height."""
         self.width = width
@@ -16,6 +23,19 @@ class Device:
         """This method should be overridden by subclasses."""
         pass
 
+    @property
+    def rgb565_byteorder(self) -> Optional[str]:
+        """Byte order of frames accepted by display_rgb565, or None if the device has no native path."""
+        return None
+
+    def display_rgb565(self, frame: np.ndarray) -> bool:
+        """Show a (height, width) RGB565 frame as is; return False if the device cannot take it."""
+        return False
+
+    def transmission_stats(self) -> Optional[DedupStats]:
+        """Sent/skipped frame counters, or None if the device does not skip unchanged frames."""
+        return None
+
     def clear(self) -> None:
         """This method should be overridden by subclasses."""
         pass
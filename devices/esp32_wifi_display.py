@@ -5,10 +5,12 @@ import time
 import logging
 from PIL import Image
 import numpy as np
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Union
 from queue import Queue, Empty
 
 from devices.device import Device
+from utils.frame_dedup import DedupStats, FrameDeduplicator
+from utils.rgb565 import BIG_ENDIAN, LITTLE_ENDIAN, RGB565Converter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -28,6 +30,10 @@ ACK_TIMEOUT = 10.0
 MAX_RETRIES = 3
 CHUNK_SIZE = 4096
 
+# The firmware shows "Waiting for client" after 30 s without a DISPLAY frame (CONNECTION_TIMEOUT in config.h),
+# so an unchanged frame is resent at least this often
+KEEPALIVE_INTERVAL = 15.0
+
 # Reconnection backoff
 RECONNECT_DELAYS = [1.0, 2.0, 5.0, 10.0, 15.0]
 
@@ -44,7 +50,8 @@ class ESP32WiFiDisplay(Device):
         port: int = 8080,
         width: int = 128,
         height: int = 128,
-        reconnect_indefinitely: bool = True
+        reconnect_indefinitely: bool = True,
+        refresh_interval: Optional[float] = None
     ):
         super().__init__(width, height)
         self.host = host
@@ -61,6 +68,18 @@ class ESP32WiFiDisplay(Device):
         self.device_format: Optional[str] = None
         self.device_endianness: Optional[str] = None
 
+        # RGB565 conversion, set up for the endianness reported in the handshake
+        self._converter: Optional[RGB565Converter] = None
+        self._frame_buffer: Optional[np.ndarray] = None
+
+        # Unchanged frames are not sent, but one is forced through every refresh_interval seconds,
+        # never less often than KEEPALIVE_INTERVAL
+        keepalive = min(refresh_interval, KEEPALIVE_INTERVAL) if refresh_interval else KEEPALIVE_INTERVAL
+        self._dedup = FrameDeduplicator(keepalive)
+        # Frames must keep coming even when nothing changes (e.g. the display is switched off); at half
+        # the keepalive, a forced resend is never more than 1.5 keepalives after the previous send
+        self.max_frame_interval = keepalive / 2
+
         # Threading
         self.receiver_thread: Optional[threading.Thread] = None
         self.running = False
@@ -178,6 +197,7 @@ class ESP32WiFiDisplay(Device):
                 return False
 
             self.handshake_done = True
+            self._dedup.invalidate()  # a (re)connected display may not show the last frame sent
             return True
 
         except json.JSONDecodeError as e:
@@ -356,26 +376,16 @@ class ESP32WiFiDisplay(Device):
         if not self.reconnect_indefinitely:
             logger.info("Stopped reconnection attempts (reconnect_indefinitely=False)")
 
-    def _convert_to_rgb565(self, image: Image.Image) -> bytes:
-        """Convert PIL image to RGB565 little-endian bytes."""
-        # Handle RGBA
-        if image.mode == 'RGBA':
-            bg = Image.new("RGBA", image.size, (0, 0, 0, 255))
-            image = Image.alpha_composite(bg, image)
-
-        # Convert to RGB and resize
-        img = image.convert('RGB').resize((self.width, self.height))
+    def _convert_to_rgb565(self, image: Image.Image) -> memoryview:
+        """Convert PIL image to RGB565 bytes in the device's byte order (little-endian by default)."""
+        byteorder = BIG_ENDIAN if self.device_endianness == BIG_ENDIAN else LITTLE_ENDIAN
+        if self._converter is None or self._converter.byteorder != byteorder:
+            self._converter = RGB565Converter(self.width, self.height, byteorder)
+            self._frame_buffer = self._converter.new_buffer()
 
-        # Convert to RGB565
-        arr = np.array(img, dtype=np.uint16)
-        r = (arr[:, :, 0] & 0xF8) << 8
-        g = (arr[:, :, 1] & 0xFC) << 3
-        b = (arr[:, :, 2] & 0xF8) >> 3
-        rgb565 = r | g | b
-
-        # Convert to little-endian bytes
-        data = rgb565.tobytes()
-        return data
+        # Converted in place; the byte view is only valid until the next frame
+        self._converter.convert(image, out=self._frame_buffer)
+        return memoryview(self._frame_buffer).cast('B')
 
     def display(self, image: Image.Image) -> None:
         """Send image to ESP32 display."""
@@ -384,15 +394,46 @@ class ESP32WiFiDisplay(Device):
             return
 
         # Convert image
+        start = self.frame_timer.start()
         try:
             data = self._convert_to_rgb565(image)
         except Exception as e:
             logger.error(f"Image conversion error: {e}")
             return
+        self.frame_timer.record("convert", start)
+
+        self._send_frame(data)
 
+    @property
+    def rgb565_byteorder(self) -> Optional[str]:
+        """Byte order reported by the device; unknown (no native path) until the handshake is done."""
+        if not self.handshake_done:
+            return None
+        return BIG_ENDIAN if self.device_endianness == BIG_ENDIAN else LITTLE_ENDIAN
+
+    def display_rgb565(self, frame: np.ndarray) -> bool:
+        """Send a ready-made RGB565 frame in the device's byte order without converting it."""
+        byteorder = self.rgb565_byteorder
+        if byteorder is None or frame.shape != (self.height, self.width) or not frame.flags.c_contiguous:
+            return False
+        if frame.dtype != np.dtype('>u2' if byteorder == BIG_ENDIAN else '<u2'):
+            return False
+        if not self.connected or not self.handshake_done:
+            return True  # dropped, exactly like display() while disconnected
+        self._send_frame(memoryview(frame).cast('B'))
+        return True
+
+    def _send_frame(self, data: Union[bytes, memoryview]) -> None:
+        """Send one frame of RGB565 data unless it is unchanged, retrying and reconnecting on repeated failures."""
+        frame = np.frombuffer(data, dtype=np.uint8)
+        if self._dedup.is_duplicate(frame):
+            return
+        start = self.frame_timer.start()
         # Send with retries
         for attempt in range(MAX_RETRIES):
             if self._send_display_data(data, self.last_screen_id):
+                self.frame_timer.record("push", start)
+                self._dedup.mark_sent(frame)
                 self.successful_sends += 1
                 self.last_successful_send = time.time()
                 self.failed_sends = 0  # Reset failure counter on success
@@ -410,7 +451,7 @@ class ESP32WiFiDisplay(Device):
             logger.error("Too many consecutive send failures, triggering reconnection")
             self._handle_disconnect()
 
-    def _send_display_data(self, data: bytes, screen_id: str) -> bool:
+    def _send_display_data(self, data: Union[bytes, memoryview], screen_id: str) -> bool:
         """Send display data with protocol handshake."""
         with self.send_lock:
             if not self.connected or not self.socket:
@@ -471,6 +512,10 @@ class ESP32WiFiDisplay(Device):
                 logger.error(f"Send error: {e}")
                 return False
 
+    def transmission_stats(self) -> DedupStats:
+        """Frames sent to the ESP32 and unchanged frames skipped."""
+        return self._dedup.stats()
+
     def set_screen_id(self, screen_id: str) -> None:
         """Set the current screen ID for tracking."""
         self.last_screen_id = screen_id
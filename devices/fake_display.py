@@ -25,7 +25,7 @@ class FakeDisplay(Device):
         )
         self.canvas.pack()
         self.tk_image = None
-        self.alpha_bg = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        self.alpha_bg = Image.new("RGBA", (width, height), CLEAR_COLOR + (255,))  # frames are composited onto black
 
     def display(self, image: Image.Image):
         """Display the given PIL image on the canvas."""
@@ -40,6 +40,7 @@ class FakeDisplay(Device):
             self.closed = True
             return
 
+        start = self.frame_timer.start()
         try:
             if image.mode != 'RGBA':
                 image = image.convert('RGBA')
@@ -53,6 +54,7 @@ class FakeDisplay(Device):
             self.canvas.create_image(self.width // 2, self.height // 2, anchor=tk.NW, image=self.tk_image)
         except tk.TclError:
             self.closed = True
+        self.frame_timer.record("convert", start)
 
     def clear(self):
         """Clear the display by filling it with black."""
@@ -66,11 +68,13 @@ class FakeDisplay(Device):
         """Update the Tkinter event loop."""
         if self.closed:
             return
+        start = self.frame_timer.start()
         try:
             self.root.update_idletasks()
             self.root.update()
         except tk.TclError:
             self.closed = True
+        self.frame_timer.record("push", start)
 
     def close(self):
         """Close the Tkinter window."""
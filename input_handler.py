@@ -3,6 +3,7 @@ import time
 class InputHandler:
     LONG_PRESS_THRESHOLD = 3  # seconds
     BUTTON_PIN = 18 # GPIO pin number for the button (BCM numbering)
+    POLL_INTERVAL = 0.01 # seconds between checks while waiting for input without edge events
 
     def __init__(self, is_raspberry: bool = True, use_gpio: bool = True) -> None:
         """
@@ -20,13 +21,19 @@ class InputHandler:
         self._pressed_time = None
         self._is_pressed = False
         self._gpio_button = None
+        self._gpio_edges = False # whether the button line reports edge events
         self._window = None
 
         # Only initialize GPIO if we're in native Raspberry Pi mode with GPIO
         if self.is_raspberry and self.use_gpio:
             try:
                 from periphery import GPIO
-                self._gpio_button = GPIO("/dev/gpiochip0", self.BUTTON_PIN, "in", bias="pull_up")
+                try:
+                    # Edge events let wait_for_input() sleep in the kernel instead of polling
+                    self._gpio_button = GPIO("/dev/gpiochip0", self.BUTTON_PIN, "in", bias="pull_up", edge="both")
+                    self._gpio_edges = True
+                except Exception:
+                    self._gpio_button = GPIO("/dev/gpiochip0", self.BUTTON_PIN, "in", bias="pull_up")
                 print("GPIO initialized for button input")
             except Exception as e:
                 print(f"GPIO initialization failed: {e}")
@@ -89,6 +96,38 @@ class InputHandler:
                 self._handle_press_release()
                 self._pressed_time = None
 
+    def wait_for_input(self, timeout: float) -> bool:
+        """Block for up to `timeout` seconds; return True as soon as the button may have changed state."""
+        if not self.is_raspberry and self._window:
+            # Tk only delivers key events while its event loop is serviced
+            deadline = time.monotonic() + timeout
+            state = (self._is_pressed, self._short_press_detected, self._long_press_detected)
+            while True:
+                self._window.update()
+                if (self._is_pressed, self._short_press_detected, self._long_press_detected) != state:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(self.POLL_INTERVAL, remaining))
+
+        if self.is_raspberry and self.use_gpio and self._gpio_button:
+            if self._gpio_edges:
+                if self._gpio_button.poll(timeout):
+                    self._gpio_button.read_event()
+                    return True
+                return False
+            deadline = time.monotonic() + timeout
+            level = self._gpio_button.read()
+            while time.monotonic() < deadline:
+                time.sleep(min(self.POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+                if self._gpio_button.read() != level:
+                    return True
+            return False
+
+        time.sleep(timeout)
+        return False
+
     def _handle_press_release(self) -> None:
         """Handle the button press and release event."""
         press_duration = time.time() - (self._pressed_time or 0)
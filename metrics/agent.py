@@ -0,0 +1,110 @@
+import json
+import logging
+import socket
+import socketserver
+import threading
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
+
+from metrics.collector import MetricCollector, MetricsSnapshot
+from metrics.sample import MetricSample
+
+logger = logging.getLogger(__name__)
+
+# Wire protocol: newline-delimited JSON over a persistent TCP connection.
+# The client sends REQUEST_LINE and the agent answers with one JSON line
+# holding its latest snapshot; the connection stays open for the next poll.
+DEFAULT_PORT = 7007
+REQUEST_LINE = b"GET\n"
+MAX_LINE_BYTES = 64 * 1024  # a snapshot is a few hundred bytes; anything larger is garbage
+
+def encode_snapshot(snapshot: MetricsSnapshot, host: str) -> bytes:
+    """Serialize a snapshot as one newline-terminated JSON line."""
+    samples = {
+        key: {"text": s.text, "value": s.value, "stale": s.stale, "detail": dict(s.detail)}
+        for key, s in snapshot.samples.items()
+    }
+    payload = {"host": host, "generation": snapshot.generation, "timestamp": snapshot.timestamp, "samples": samples}
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def decode_samples(payload: Mapping[str, Any]) -> Mapping[str, MetricSample]:
+    """Rebuild the MetricSamples of a decoded snapshot payload."""
+    return MappingProxyType({
+        key: MetricSample(str(s["text"]), float(s.get("value", 0.0)), bool(s.get("stale", False)),
+                          MappingProxyType({k: float(v) for k, v in s.get("detail", {}).items()}))
+        for key, s in payload["samples"].items()
+    })
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    """Answers every request line on a connection with the agent's latest snapshot."""
+
+    def handle(self) -> None:
+        """Serve requests until the client closes the connection."""
+        while True:
+            line = self.rfile.readline(MAX_LINE_BYTES)
+            if not line:
+                return
+            try:
+                self.wfile.write(self.server.agent.payload())
+            except OSError:
+                return  # client went away mid-reply
+
+class _AgentServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], agent: "MetricsAgent") -> None:
+        self.agent = agent
+        super().__init__(address, _AgentHandler)
+
+class MetricsAgent:
+    """Serves the collector's latest snapshot to remote aggregators over TCP.
+
+    The snapshot is encoded once per generation, so any number of polling
+    clients costs one dictionary lookup each instead of a metric read.
+    """
+
+    def __init__(self, collector: MetricCollector, bind: str = "0.0.0.0", port: int = DEFAULT_PORT,
+                 name: Optional[str] = None) -> None:
+        """Initialize the agent; nothing is bound until start()."""
+        self.collector = collector
+        self.bind = bind
+        self.port = port
+        self.name = name or socket.gethostname()
+        self._encoded: Tuple[int, bytes] = (-1, b"")
+        self._server: Optional[_AgentServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return the bound (host, port); the port is resolved once started with port 0."""
+        if self._server is not None:
+            return self._server.server_address[:2]
+        return self.bind, self.port
+
+    def payload(self) -> bytes:
+        """Return the encoded latest snapshot, re-encoding only when the generation changed."""
+        snapshot = self.collector.latest
+        generation, data = self._encoded
+        if generation != snapshot.generation:
+            data = encode_snapshot(snapshot, self.name)
+            self._encoded = (snapshot.generation, data)
+        return data
+
+    def start(self) -> None:
+        """Bind the listening socket and serve on a background thread (no-op if already serving)."""
+        if self._server is not None:
+            return
+        self._server = _AgentServer((self.bind, self.port), self)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsAgent", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics agent '{self.name}' listening on {self.address[0]}:{self.address[1]}")
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,193 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+import json
+import logging
+import socket
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from metrics.agent import DEFAULT_PORT, MAX_LINE_BYTES, REQUEST_LINE, decode_samples
+from metrics.sample import MetricSample
+
+logger = logging.getLogger(__name__)
+
+Address = Tuple[str, int]
+
+def parse_address(text: str, default_port: int = DEFAULT_PORT) -> Address:
+    """Parse 'host', 'host:port' or '[v6]:port' into an address tuple."""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else default_port
+    if text.count(":") == 1:
+        host, port = text.split(":")
+        return host, int(port)
+    return text, default_port
+
+@dataclass(frozen=True)
+class HostStatus:
+    """Last known state of one remote agent."""
+    address: Address
+    name: str = ""  # hostname reported by the agent, or the address until it answers
+    online: bool = False
+    samples: Mapping[str, MetricSample] = field(default_factory=lambda: MappingProxyType({}))
+    updated_at: float = 0.0  # time.monotonic() of the last successful poll
+    error: str = ""
+
+class AgentConnection:
+    """Persistent connection to one agent, reopened transparently after a failure."""
+
+    def __init__(self, address: Address, timeout: float) -> None:
+        """Initialize the connection; the socket is opened on the first request."""
+        self.address = address
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def request(self) -> dict:
+        """Send one poll request and return the decoded reply; raises on timeout or bad data."""
+        try:
+            if self._sock is None:
+                self._sock = socket.create_connection(self.address, timeout=self.timeout)
+                self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._reader = self._sock.makefile("rb")
+            self._sock.sendall(REQUEST_LINE)
+            line = self._reader.readline(MAX_LINE_BYTES)
+            if not line.endswith(b"\n"):
+                raise ConnectionError("connection closed" if not line else "reply too long")
+            return json.loads(line)
+        except Exception:
+            # The stream may hold half a reply; start over on a fresh connection
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Close the socket; the next request reconnects."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+class HostAggregator:
+    """Polls many metric agents concurrently and keeps the latest status of each.
+
+    Every host has its own pooled connection and is polled on a shared worker
+    pool with a per-host socket timeout. A host whose previous poll is still
+    in flight is skipped, so one slow node never delays the others or the
+    render loop, which only reads `statuses()`.
+    """
+    DEFAULT_INTERVAL = 2.0  # seconds between polls of each host
+    DEFAULT_TIMEOUT = 1.0   # per-host connect/read timeout
+    MAX_WORKERS = 32        # upper bound on concurrent polls
+    JOIN_TIMEOUT = 2.0      # seconds to wait for the thread on stop()
+
+    def __init__(self, hosts: Sequence[str], interval: float = DEFAULT_INTERVAL,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        """Initialize the aggregator for 'host[:port]' entries; nothing is polled until start() or poll_once()."""
+        self.addresses: List[Address] = [parse_address(h) for h in hosts]
+        self.interval = interval
+        self.timeout = timeout
+        self._pool: Dict[Address, AgentConnection] = {a: AgentConnection(a, timeout) for a in self.addresses}
+        self._status: Dict[Address, HostStatus] = {a: HostStatus(a, f"{a[0]}:{a[1]}") for a in self.addresses}
+        self._in_flight: Set[Address] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, min(self.MAX_WORKERS, len(self.addresses))),
+                                            thread_name_prefix="HostPoll")
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        """Return True while the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start polling on a background thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="HostAggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and close every pooled connection; queued polls are cancelled."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.JOIN_TIMEOUT)
+            self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for connection in self._pool.values():
+            connection.close()
+
+    # --- Results ---
+
+    def statuses(self) -> List[HostStatus]:
+        """Return the latest status of every host in configuration order; never blocks on the network."""
+        return [self._status[a] for a in self.addresses]
+
+    # --- Polling ---
+
+    def _poll(self, address: Address) -> None:
+        """Poll one host and publish its new status."""
+        previous = self._status[address]
+        try:
+            payload = self._pool[address].request()
+            status = HostStatus(address, str(payload.get("host") or previous.name), True,
+                                decode_samples(payload), time.monotonic())
+        except Exception as e:
+            logger.debug(f"Polling {address[0]}:{address[1]} failed: {e}")
+            # Keep the last values around, but marked stale
+            samples = MappingProxyType({k: MetricSample(s.text, s.value, True, s.detail)
+                                        for k, s in previous.samples.items()})
+            status = HostStatus(address, previous.name, False, samples, previous.updated_at, str(e) or type(e).__name__)
+        self._status[address] = status
+        self._release(address)
+
+    def _release(self, address: Address) -> None:
+        """Mark a host as no longer being polled."""
+        with self._lock:
+            self._in_flight.discard(address)
+
+    def _release_if_cancelled(self, address: Address, future: Future) -> None:
+        """Release a host whose queued poll was cancelled by stop() before it ran."""
+        if future.cancelled():
+            self._release(address)
+
+    def poll_once(self) -> List[Future]:
+        """Submit a poll for every host that is not already being polled and return the futures.
+
+        Returns no futures once stop() was called, as the worker pool is shut down.
+        """
+        futures = []
+        if self._stop_event.is_set():
+            return futures
+        with self._lock:
+            idle = [a for a in self.addresses if a not in self._in_flight]
+            self._in_flight.update(idle)
+        for address in idle:
+            try:
+                future = self._executor.submit(self._poll, address)
+            except RuntimeError:  # stop() shut the pool down meanwhile
+                self._release(address)
+                continue
+            future.add_done_callback(partial(self._release_if_cancelled, address))
+            futures.append(future)
+        return futures
+
+    def poll_all(self) -> List[HostStatus]:
+        """Poll every host and wait for the round to finish (bounded by the per-host timeout)."""
+        wait(self.poll_once())
+        return self.statuses()
+
+    def _run(self) -> None:
+        """Polling loop executed on the background thread."""
+        while not self._stop_event.is_set():
+            self.poll_once()
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,136 @@
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+
+from data_gatherer import DataGatherer
+from metrics.history import MetricHistory
+from metrics.sample import MetricSample
+from metrics.trace import TraceRecorder
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable, timestamped set of metric samples published by the collector."""
+    timestamp: float = 0.0  # wall-clock time the snapshot was taken
+    generation: int = 0     # increases by one with every published snapshot
+    samples: Mapping[str, MetricSample] = field(default_factory=lambda: MappingProxyType({}))
+    next_update: float = 0.0  # time.monotonic() instant at which the next metric is due
+
+    @property
+    def data(self) -> Dict[str, str]:
+        """Return the display string of every metric."""
+        return {k: s.text for k, s in self.samples.items()}
+
+    @property
+    def values(self) -> Dict[str, float]:
+        """Return the numeric value of every metric."""
+        return {k: s.value for k, s in self.samples.items()}
+
+class MetricCollector:
+    """Gathers metrics on a background thread and publishes immutable snapshots.
+
+    Readers only ever look at `latest`, which is replaced by a single reference
+    assignment, so the render loop never waits on a lock or on metric I/O.
+    """
+    DEFAULT_INTERVAL = 1.0  # maximum seconds between scheduler checks
+    MIN_WAIT = 0.01         # minimum seconds between scheduler checks
+    JOIN_TIMEOUT = 2.0      # seconds to wait for the thread on stop()
+
+    def __init__(self, data_gatherer: DataGatherer, interval: float = DEFAULT_INTERVAL,
+                 history: Optional[MetricHistory] = None, recorder: Optional[TraceRecorder] = None) -> None:
+        """Initialize the collector around a DataGatherer (or ReplayGatherer).
+
+        Numeric values are recorded into `history` and every batch of updated
+        samples is written to `recorder`, when given.
+        """
+        self.data_gatherer = data_gatherer
+        self.interval = interval
+        self.history = history
+        self.recorder = recorder
+        self.listeners: List[Callable[[MetricsSnapshot], None]] = []  # called on the collector thread after each publish
+        self.latest = MetricsSnapshot()
+        warm = data_gatherer.cached_values()
+        if warm:
+            # Values restored from the warm cache are shown before the first collection
+            self._publish(warm)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background collection thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.data_gatherer.start()
+        self._thread = threading.Thread(target=self._run, name="MetricCollector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the collection thread to stop and wait briefly for it to exit.
+
+        The thread stops the data gatherer on its way out; if it is still busy
+        after JOIN_TIMEOUT, the gatherer is left to it rather than torn down
+        under a read in progress.
+        """
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if thread is None:
+            self.data_gatherer.stop()
+            return
+        # The thread is a daemon, so a metric stuck in I/O cannot block shutdown
+        thread.join(timeout=self.JOIN_TIMEOUT)
+        if thread.is_alive():
+            logger.warning("Metric collection still busy after stop(); it releases the gatherer when it exits")
+
+    def collect_once(self) -> MetricsSnapshot:
+        """Refresh the metrics that are due and publish them as the latest snapshot.
+
+        When nothing was due the current snapshot is kept, so readers can tell
+        from the generation whether anything changed.
+        """
+        updated = self.data_gatherer.refresh_due()
+        if not updated and self.latest.generation:
+            return self.latest
+        return self._publish(updated)
+
+    def _publish(self, updated: Dict[str, MetricSample]) -> MetricsSnapshot:
+        """Merge updated samples into a new immutable snapshot and make it the latest."""
+        previous = self.latest
+        samples = dict(previous.samples)
+        samples.update(updated)
+        snapshot = MetricsSnapshot(
+            timestamp=time.time(),
+            generation=previous.generation + 1,
+            samples=MappingProxyType(samples),
+            next_update=self.data_gatherer.next_due(),
+        )
+        self.latest = snapshot
+        if self.history is not None:
+            self.history.record(snapshot.values, snapshot.timestamp)
+        if self.recorder is not None:
+            self.recorder.record(updated)
+        for listener in self.listeners:
+            listener(snapshot)
+        return snapshot
+
+    def _run(self) -> None:
+        """Collection loop executed on the background thread; sleeps until the next metric is due."""
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.collect_once()
+                except Exception as e:
+                    logger.error(f"Metric collection failed: {e}")
+                wait = self.data_gatherer.next_due() - time.monotonic()
+                self._stop_event.wait(min(self.interval, max(self.MIN_WAIT, wait)))
+        finally:
+            self.data_gatherer.stop()
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from metrics.procfs_backend import IDLE, IOWAIT, STEAL, ProcfsBackend
+
+@dataclass(frozen=True)
+class CpuUsage:
+    """CPU utilisation over the interval between two samples, as fractions in [0, 1]."""
+    total: float  # truncated to a whole percent like `text`, so both always agree
+    iowait: float = 0.0
+    steal: float = 0.0
+    per_core: List[float] = field(default_factory=list)
+    text: str = ""  # Display string, formatted like DataGatherer.CPU_USAGE_CMD
+
+    @property
+    def busiest_core(self) -> float:
+        """Return the usage of the most loaded core (or the total on single-core boards)."""
+        return max(self.per_core) if self.per_core else self.total
+
+class CpuSampler:
+    """Non-blocking CPU sampler computing usage from /proc/stat counter deltas.
+
+    Instead of sleeping between two reads, the sampler keeps the counters from
+    the previous call and reports usage over the time elapsed since then. The
+    very first call reports the average since boot.
+    """
+
+    def __init__(self, backend: ProcfsBackend) -> None:
+        """Initialize the sampler on top of a ProcfsBackend."""
+        self.backend = backend
+        self._prev: Dict[str, List[int]] = {}
+        self.last: Optional[CpuUsage] = None
+
+    @staticmethod
+    def _ratios(prev: List[int], curr: List[int]) -> Optional[tuple]:
+        """Return (busy, iowait, steal) fractions between two counter rows, or None if no time passed."""
+        deltas = ProcfsBackend.cpu_deltas(prev, curr)
+        total = sum(deltas)
+        if total <= 0:
+            return None
+        # Like CPU_USAGE_CMD, anything that is not idle counts as busy (iowait included)
+        return (total - deltas[IDLE]) / total, deltas[IOWAIT] / total, deltas[STEAL] / total
+
+    def sample(self) -> CpuUsage:
+        """Read /proc/stat once and return usage since the previous sample."""
+        table = self.backend.read_cpu_table()
+        prev, self._prev = self._prev, table
+
+        def previous(label: str) -> List[int]:
+            return prev.get(label) or [0] * len(table[label])
+
+        deltas = ProcfsBackend.cpu_deltas(previous("cpu"), table["cpu"])
+        if sum(deltas) <= 0:
+            # Called twice within one jiffy: keep reporting the last known figures
+            return self.last or CpuUsage(0.0, text="0%")
+
+        per_core = []
+        for label in sorted((k for k in table if k != "cpu"), key=lambda k: int(k[3:])):
+            core = self._ratios(previous(label), table[label])
+            per_core.append(core[0] if core else 0.0)
+
+        # The bar, history and text all show the same whole-percent figure
+        usage = ProcfsBackend.cpu_busy_percent(deltas)
+        total = sum(deltas)
+        self.last = CpuUsage(usage / 100, deltas[IOWAIT] / total, deltas[STEAL] / total, per_core,
+                             ProcfsBackend.format_cpu_percent(usage))
+        return self.last
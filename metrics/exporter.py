@@ -0,0 +1,211 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from metrics.collector import MetricCollector, MetricsSnapshot
+from metrics.history import MetricHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9877
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "lcdstats_"
+
+# metric key -> (name, unit, help); the sample value is exported as a gauge
+GAUGES: Dict[str, Tuple[str, str, str]] = {
+    "cpu": ("cpu_usage_ratio", "ratio", "Fraction of CPU time spent busy."),
+    "mem": ("memory_used_ratio", "ratio", "Fraction of memory in use."),
+    "disk": ("filesystem_used_ratio", "ratio", "Fraction of the root filesystem in use."),
+    "temp": ("temperature_celsius", "celsius", "CPU temperature."),
+    "uptime": ("uptime_seconds", "seconds", "Time since the system booted."),
+}
+
+# metric key -> {detail suffix: (name, unit, help, label)}; detail entries are named "<label value>.<suffix>"
+DETAIL_GAUGES: Dict[str, Dict[str, Tuple[str, str, str, str]]] = {
+    "net": {
+        "rx": ("network_receive_bytes_per_second", "bytes_per_second", "Receive rate per interface.", "interface"),
+        "tx": ("network_transmit_bytes_per_second", "bytes_per_second", "Transmit rate per interface.", "interface"),
+    },
+    "diskio": {
+        "read": ("disk_read_bytes_per_second", "bytes_per_second", "Read rate per disk.", "device"),
+        "write": ("disk_written_bytes_per_second", "bytes_per_second", "Write rate per disk.", "device"),
+        "iops": ("disk_io_operations_per_second", "", "Completed reads and writes per second per disk.", "device"),
+    },
+}
+
+INFO_KEYS = ("local_ip", "public_ip")  # text-only metrics exported as labels of lcdstats_host_info
+
+def format_value(value: float) -> str:
+    """Format a sample value the way OpenMetrics expects (NaN, +Inf, -Inf)."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+class MetricFamily:
+    """Accumulates the exposition lines of one metric family."""
+
+    def __init__(self, name: str, kind: str, help_text: str, unit: str = "") -> None:
+        """Initialize the family with its metadata lines."""
+        self.name = PREFIX + name
+        self.sample_name = self.name + "_info" if kind == "info" else self.name
+        self.lines = [f"# TYPE {self.name} {kind}"]
+        if unit:
+            self.lines.append(f"# UNIT {self.name} {unit}")
+        self.lines.append(f"# HELP {self.name} {help_text}")
+        self.samples = 0
+
+    def add(self, value: float, **labels: str) -> None:
+        """Add one sample, optionally labelled."""
+        label_text = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+        self.lines.append(f"{self.sample_name}{{{label_text}}} {format_value(value)}" if label_text
+                          else f"{self.sample_name} {format_value(value)}")
+        self.samples += 1
+
+def render(snapshot: MetricsSnapshot, history: Optional[MetricHistory] = None) -> bytes:
+    """Render a snapshot (and the history summary, if given) as an OpenMetrics text body."""
+    families: List[MetricFamily] = []
+    samples = snapshot.samples
+
+    for key, (name, unit, help_text) in GAUGES.items():
+        if key in samples:
+            family = MetricFamily(name, "gauge", help_text, unit)
+            family.add(samples[key].value)
+            families.append(family)
+
+    cpu = samples.get("cpu")
+    if cpu is not None and cpu.detail:
+        cores = MetricFamily("cpu_core_usage_ratio", "gauge", "Fraction of time each core spent busy.", "ratio")
+        for name, value in cpu.detail.items():
+            if name.startswith("cpu"):
+                cores.add(value, core=name[3:])
+        for name in ("iowait", "steal"):
+            if name in cpu.detail:
+                family = MetricFamily(f"cpu_{name}_ratio", "gauge", f"Fraction of CPU time spent in {name}.", "ratio")
+                family.add(cpu.detail[name])
+                families.append(family)
+        if cores.samples:
+            families.append(cores)
+
+    for key, suffixes in DETAIL_GAUGES.items():
+        if key not in samples:
+            continue
+        by_suffix = {suffix: MetricFamily(name, "gauge", help_text, unit)
+                     for suffix, (name, unit, help_text, _) in suffixes.items()}
+        for name, value in samples[key].detail.items():
+            device, _, suffix = name.rpartition(".")
+            if suffix in by_suffix:
+                by_suffix[suffix].add(value, **{suffixes[suffix][3]: device})
+        families.extend(f for f in by_suffix.values() if f.samples)
+
+    info = {k: samples[k].text for k in INFO_KEYS if k in samples}
+    if info:
+        family = MetricFamily("host", "info", "Addresses of the host.")
+        family.add(1, **info)
+        families.append(family)
+
+    stale = MetricFamily("metric_stale", "gauge", "1 when a metric could not be refreshed and shows its last known value.")
+    for key, sample in samples.items():
+        stale.add(1 if sample.stale else 0, metric=key)
+    families.append(stale)
+
+    if history is not None and history.timestamps.count:
+        window = f"{history.capacity * history.sample_interval:g}s"
+        mean = MetricFamily("history_mean", "gauge", "Mean of the recent metric history.")
+        peak = MetricFamily("history_max", "gauge", "Maximum of the recent metric history.")
+        for key, buffer in history.buffers.items():
+            values = buffer.latest(buffer.count)
+            if np.isnan(values).all():
+                continue
+            mean.add(float(np.nanmean(values)), metric=key, window=window)
+            peak.add(float(np.nanmax(values)), metric=key, window=window)
+        families.extend(f for f in (mean, peak) if f.samples)
+
+    meta = MetricFamily("snapshot_timestamp_seconds", "gauge", "Wall-clock time of the exported snapshot.", "seconds")
+    meta.add(snapshot.timestamp)
+    families.append(meta)
+
+    lines = [line for family in families for line in family.lines]
+    lines.append("# EOF\n")
+    return "\n".join(lines).encode("utf-8")
+
+class _ExporterHandler(BaseHTTPRequestHandler):
+    """Serves the cached exposition body on /metrics."""
+
+    def do_GET(self) -> None:
+        """Reply with the latest body; never samples anything."""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.exporter.body()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Keep scrapes out of the log."""
+        pass
+
+class MetricsExporter:
+    """Exposes the collector's latest snapshot over HTTP in OpenMetrics text format.
+
+    Scrapes only read `collector.latest`; the body is rendered once per
+    snapshot/history generation and served from cache in between.
+    """
+
+    def __init__(self, collector: MetricCollector, bind: str = "0.0.0.0", port: int = DEFAULT_PORT) -> None:
+        """Initialize the exporter; nothing is bound until start()."""
+        self.collector = collector
+        self.bind = bind
+        self.port = port
+        self._cached: Tuple[Tuple[int, int], bytes] = ((-1, -1), b"")
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return the bound (host, port); the port is resolved once started with port 0."""
+        if self._server is not None:
+            return self._server.server_address[:2]
+        return self.bind, self.port
+
+    def body(self) -> bytes:
+        """Return the exposition body, re-rendering only when a new snapshot or history sample exists."""
+        snapshot, history = self.collector.latest, self.collector.history
+        key = (snapshot.generation, history.generation if history is not None else 0)
+        cached_key, data = self._cached
+        if cached_key != key:
+            data = render(snapshot, history)
+            self._cached = (key, data)
+        return data
+
+    def start(self) -> None:
+        """Bind the HTTP server and serve on a background thread (no-op if already serving)."""
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self.bind, self.port), _ExporterHandler)
+        self._server.daemon_threads = True
+        self._server.exporter = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsExporter", daemon=True)
+        self._thread.start()
+        logger.info(f"OpenMetrics exporter listening on {self.address[0]}:{self.address[1]}")
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, Mapping, Optional
+import numpy as np
+
+DEFAULT_CAPACITY = 600       # samples kept per metric (10 minutes at 1 Hz)
+DEFAULT_SAMPLE_INTERVAL = 1.0  # seconds between history samples
+DEFAULT_KEYS = ("cpu", "mem", "disk", "temp")
+
+class RingBuffer:
+    """Fixed-size float ring buffer backed by a single preallocated NumPy array.
+
+    Appending writes one element in place (O(1), no allocation). Slots that
+    have never been written hold NaN.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32) -> None:
+        """Initialize the buffer with `capacity` empty (NaN) slots."""
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._data = np.full(capacity, np.nan, dtype=dtype)
+        self._index = 0  # next slot to write
+        self.count = 0   # number of valid samples
+
+    def append(self, value: float) -> None:
+        """Store a sample, overwriting the oldest one when full."""
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the last `n` samples in chronological order, NaN-padded at the front.
+
+        Pass a preallocated `out` array of length `n` to avoid allocating.
+        """
+        if out is None:
+            out = np.empty(n, dtype=self._data.dtype)
+        n = len(out)
+        take = min(n, self.capacity)
+        out[:n - take] = np.nan
+
+        # The last `take` samples end right before the write index and may wrap around
+        start = self._index - take
+        if start >= 0:
+            out[n - take:] = self._data[start:self._index]
+        else:
+            head = -start
+            out[n - take:n - take + head] = self._data[start:]
+            out[n - take + head:] = self._data[:self._index]
+        return out
+
+    def last(self) -> float:
+        """Return the most recent sample (NaN when empty)."""
+        return float(self._data[self._index - 1])
+
+class MetricHistory:
+    """One RingBuffer per metric, sampled at a fixed interval."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, keys: Iterable[str] = DEFAULT_KEYS,
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        """Initialize empty buffers for every metric key."""
+        self.capacity = capacity
+        self.sample_interval = sample_interval
+        self.buffers: Dict[str, RingBuffer] = {k: RingBuffer(capacity) for k in keys}
+        self.timestamps = RingBuffer(capacity, dtype=np.float64)
+        self.generation = 0  # increases with every recorded sample
+
+    @property
+    def keys(self) -> Iterable[str]:
+        """Return the metric keys tracked by the history."""
+        return self.buffers.keys()
+
+    def record(self, values: Mapping[str, float], timestamp: float) -> bool:
+        """Append one sample per metric if `sample_interval` has passed since the last one."""
+        if self.timestamps.count and timestamp - self.timestamps.last() < self.sample_interval:
+            return False
+        for key, buffer in self.buffers.items():
+            buffer.append(values.get(key, np.nan))
+        self.timestamps.append(timestamp)
+        self.generation += 1
+        return True
+
+    def series(self, key: str, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the last `n` samples of a metric in chronological order."""
+        if out is None:
+            out = np.empty(n, dtype=np.float32)
+        return self.buffers[key].latest(n, out)
@@ -0,0 +1,307 @@
+import fcntl
+import glob
+import math
+import os
+import re
+import socket
+import struct
+import time
+from typing import Dict, IO, List, Optional, Tuple
+
+# Kernel interfaces read by the backend
+PROC_STAT_PATH = "/proc/stat"
+PROC_MEMINFO_PATH = "/proc/meminfo"
+PROC_UPTIME_PATH = "/proc/uptime"
+PROC_NET_DEV_PATH = "/proc/net/dev"
+PROC_DISKSTATS_PATH = "/proc/diskstats"
+SYS_BLOCK_DIR = "/sys/block"
+THERMAL_GLOB = "/sys/class/thermal/thermal_zone*/temp"
+DISK_PATH = "/"
+
+# ioctl request to read the IPv4 address of an interface
+SIOCGIFADDR = 0x8915
+LOOPBACK_PREFIX = "127."
+LOOPBACK_INTERFACE = "lo"
+
+# Block devices that never carry interesting I/O
+VIRTUAL_BLOCK_PREFIXES = ("loop", "ram", "zram")
+SECTOR_SIZE = 512  # /proc/diskstats always counts 512-byte sectors
+
+# Column indexes of a /proc/stat cpu line (after the label)
+USER, NICE, SYSTEM, IDLE, IOWAIT, IRQ, SOFTIRQ, STEAL = range(8)
+CPU_FIELD_COUNT = 8  # user..steal; guest/guest_nice are already accounted in user/nice
+
+# Units used by `uptime -p`, largest first, with the modulo procps applies to each count
+# (so a 365-day year shows as "1 year, 1 day": 52 weeks are dropped but the spare day is not)
+UPTIME_UNITS = [
+    ("decade", 10 * 365 * 24 * 3600, None),
+    ("year", 365 * 24 * 3600, 10),
+    ("week", 7 * 24 * 3600, 52),
+    ("day", 24 * 3600, 7),
+    ("hour", 3600, 24),
+    ("minute", 60, 60),
+]
+
+# The sed rewrites applied to `uptime -p` by DataGatherer.UPTIME_CMD
+UPTIME_REWRITES = [
+    (re.compile(r"up "), ""),
+    (re.compile(r" minutes*"), "m"),
+    (re.compile(r" hours*"), "h"),
+    (re.compile(r" days*"), "d"),
+    (re.compile(r","), " "),
+]
+
+class ProcfsBackend:
+    """Reads system metrics straight from procfs/sysfs instead of forking shell pipelines.
+
+    Every method returns the exact string produced by the matching
+    DataGatherer *_CMD constant and raises OSError (or ValueError on
+    unparsable content) when the source is unavailable, so callers can
+    fall back to the shell command.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the backend with an empty set of reusable file handles."""
+        self._handles: Dict[str, IO[str]] = {}
+        self._thermal_path: Optional[str] = None
+        self._ip_socket: Optional[socket.socket] = None
+        self._disk_kinds: Dict[str, bool] = {}  # block device name -> is a physical disk
+
+    # --- File helpers ---
+
+    def _read(self, path: str) -> str:
+        """Read a whole procfs/sysfs file, reusing an open handle between calls."""
+        handle = self._handles.get(path)
+        try:
+            if handle is None:
+                handle = open(path, "r")
+                self._handles[path] = handle
+            handle.seek(0)
+            return handle.read()
+        except OSError:
+            self._drop_handle(path)
+            raise
+
+    def _drop_handle(self, path: str) -> None:
+        """Close and forget a cached handle (e.g. after a read error)."""
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Close every cached file handle and socket."""
+        for path in list(self._handles):
+            self._drop_handle(path)
+        if self._ip_socket is not None:
+            self._ip_socket.close()
+            self._ip_socket = None
+
+    # --- CPU ---
+
+    def read_cpu_table(self) -> Dict[str, List[int]]:
+        """Return the jiffy counters of every `cpu*` line in /proc/stat, keyed by label."""
+        table = {}
+        for line in self._read(PROC_STAT_PATH).splitlines():
+            if not line.startswith("cpu"):
+                break  # cpu lines always come first
+            fields = line.split()
+            table[fields[0]] = [int(v) for v in fields[1:]]
+        if "cpu" not in table:
+            raise ValueError("No aggregate cpu line in /proc/stat")
+        return table
+
+    def read_cpu_times(self) -> List[int]:
+        """Return the aggregate `cpu` jiffy counters from /proc/stat."""
+        return self.read_cpu_table()["cpu"]
+
+    @staticmethod
+    def cpu_deltas(prev: List[int], curr: List[int]) -> List[int]:
+        """Return the user..steal jiffies elapsed between two counter rows.
+
+        Old kernels report fewer columns; missing ones count as zero. If any
+        counter went backwards (a CPU brought back online), the row restarted
+        from zero, so the current counters are the deltas.
+        """
+        def pad(row: List[int]) -> List[int]:
+            return list(row[:CPU_FIELD_COUNT]) + [0] * (CPU_FIELD_COUNT - len(row[:CPU_FIELD_COUNT]))
+        prev, curr = pad(prev), pad(curr)
+        if any(c < p for c, p in zip(curr, prev)):
+            return curr
+        return [c - p for c, p in zip(curr, prev)]
+
+    @staticmethod
+    def cpu_busy_percent(deltas: List[int]) -> int:
+        """Return whole-percent usage the way CPU_USAGE_CMD computes it (idle/total truncated to 2 decimals)."""
+        total = sum(deltas)
+        if total <= 0:
+            raise ValueError("No CPU time elapsed between samples")
+        return 100 - deltas[IDLE] * 100 // total
+
+    @staticmethod
+    def format_cpu_percent(usage: int) -> str:
+        """Format whole-percent usage like the bc output of CPU_USAGE_CMD."""
+        return "0%" if usage == 0 else f"{usage}.00%"
+
+    @staticmethod
+    def format_cpu_usage(prev: List[int], curr: List[int]) -> str:
+        """Format usage between two samples the way CPU_USAGE_CMD does (bc, scale=2)."""
+        return ProcfsBackend.format_cpu_percent(ProcfsBackend.cpu_busy_percent(ProcfsBackend.cpu_deltas(prev, curr)))
+
+    # --- Memory ---
+
+    def read_meminfo(self) -> Dict[str, int]:
+        """Return /proc/meminfo as a dict of kB values."""
+        info = {}
+        for line in self._read(PROC_MEMINFO_PATH).splitlines():
+            name, _, rest = line.partition(":")
+            parts = rest.split()
+            if parts:
+                info[name] = int(parts[0])
+        return info
+
+    def mem_used_ratio(self) -> float:
+        """Return used memory as a fraction of the total, matching `free` (used = total - available)."""
+        info = self.read_meminfo()
+        total = info["MemTotal"]
+        if "MemAvailable" in info:
+            used = total - info["MemAvailable"]
+        else:
+            cached = info.get("Cached", 0) + info.get("SReclaimable", 0)
+            used = total - info["MemFree"] - info.get("Buffers", 0) - cached
+        return used / total
+
+    def mem_usage(self) -> str:
+        """Return used memory as a percentage string, like RAM_USAGE_CMD."""
+        return f"{self.mem_used_ratio() * 100:.1f}%"
+
+    # --- Disk ---
+
+    def disk_used_percent(self, path: str = DISK_PATH) -> int:
+        """Return the `df` Use% figure (rounded up) for the filesystem holding `path`."""
+        return self.statvfs_used_percent(os.statvfs(path))
+
+    @staticmethod
+    def statvfs_used_percent(st: os.statvfs_result) -> int:
+        """Return the `df` Use% figure for a statvfs result: used / (used + available to users), rounded up."""
+        used = st.f_blocks - st.f_bfree
+        denominator = used + st.f_bavail
+        if denominator == 0:
+            raise ValueError("No usable blocks")
+        return math.ceil(used * 100 / denominator)
+
+    def disk_usage(self, path: str = DISK_PATH) -> str:
+        """Return the `df` Use% column for the filesystem holding `path`."""
+        return f"{self.disk_used_percent(path)}%"
+
+    # --- Temperature ---
+
+    def _find_thermal_path(self) -> str:
+        """Locate the first thermal zone temperature file."""
+        if self._thermal_path is None:
+            paths = sorted(glob.glob(THERMAL_GLOB))
+            if not paths:
+                raise OSError("No thermal zone found")
+            self._thermal_path = paths[0]
+        return self._thermal_path
+
+    def read_temperature(self) -> float:
+        """Return the CPU temperature in degrees Celsius."""
+        return int(self._read(self._find_thermal_path()).strip()) / 1000
+
+    def temperature(self) -> str:
+        """Return the CPU temperature in Celsius, formatted like TEMP_CMD."""
+        return f"{self.read_temperature():.1f}°C"
+
+    # --- Uptime ---
+
+    def read_uptime_seconds(self) -> float:
+        """Return the system uptime in seconds from /proc/uptime."""
+        return float(self._read(PROC_UPTIME_PATH).split()[0])
+
+    @staticmethod
+    def format_uptime(seconds: float) -> str:
+        """Format seconds like `uptime -p` piped through the UPTIME_CMD sed rewrites."""
+        seconds = int(seconds)
+        parts = []
+        for name, unit, modulo in UPTIME_UNITS:
+            count = seconds // unit
+            if modulo is not None:
+                count %= modulo
+            if count or (name == "minute" and not parts):
+                parts.append(f"{count} {name}{'s' if count != 1 else ''}")
+        text = "up " + ", ".join(parts)
+        for pattern, replacement in UPTIME_REWRITES:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def uptime(self) -> str:
+        """Return the system uptime in human-readable form."""
+        return self.format_uptime(self.read_uptime_seconds())
+
+    # --- Time ---
+
+    @staticmethod
+    def systime() -> str:
+        """Return local time with timezone abbreviation, like SYSTIME_CMD."""
+        return time.strftime("%H:%M %Z")
+
+    # --- Network ---
+
+    def _interface_ipv4(self, name: str) -> Optional[str]:
+        """Return the IPv4 address assigned to an interface, or None."""
+        if self._ip_socket is None:
+            self._ip_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        request = struct.pack("256s", name.encode()[:15])
+        try:
+            result = fcntl.ioctl(self._ip_socket.fileno(), SIOCGIFADDR, request)
+        except OSError:
+            return None  # Interface without an IPv4 address
+        return socket.inet_ntoa(result[20:24])
+
+    def interface_addresses(self) -> List[Tuple[str, str]]:
+        """Return (interface, IPv4) pairs in kernel interface order, excluding loopback."""
+        addresses = []
+        for _, name in socket.if_nameindex():
+            address = self._interface_ipv4(name)
+            if address and not address.startswith(LOOPBACK_PREFIX):
+                addresses.append((name, address))
+        return addresses
+
+    def read_net_dev(self) -> Dict[str, Tuple[int, int]]:
+        """Return {interface: (rx_bytes, tx_bytes)} from /proc/net/dev, excluding loopback."""
+        counters = {}
+        for line in self._read(PROC_NET_DEV_PATH).splitlines()[2:]:  # two header lines
+            name, _, rest = line.partition(":")
+            name = name.strip()
+            fields = rest.split()
+            if name and name != LOOPBACK_INTERFACE and len(fields) >= 9:
+                counters[name] = (int(fields[0]), int(fields[8]))
+        return counters
+
+    def local_ip(self) -> str:
+        """Return the first non-loopback address, like LOCAL_IP_CMD."""
+        addresses = self.interface_addresses()
+        return addresses[0][1] if addresses else ""
+
+    # --- Block devices ---
+
+    def _is_physical_disk(self, name: str) -> bool:
+        """Return True for whole, non-virtual block devices (partitions are skipped)."""
+        known = self._disk_kinds.get(name)
+        if known is None:
+            known = not name.startswith(VIRTUAL_BLOCK_PREFIXES) and \
+                os.path.isdir(os.path.join(SYS_BLOCK_DIR, name.replace("/", "!")))
+            self._disk_kinds[name] = known
+        return known
+
+    def read_diskstats(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """Return raw {disk: (reads, sectors_read, writes, sectors_written)} counters from /proc/diskstats."""
+        counters = {}
+        for line in self._read(PROC_DISKSTATS_PATH).splitlines():
+            fields = line.split()
+            if len(fields) >= 10 and self._is_physical_disk(fields[2]):
+                counters[fields[2]] = (int(fields[3]), int(fields[5]), int(fields[7]), int(fields[9]))
+        return counters
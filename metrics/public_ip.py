@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+import http.client
+import ipaddress
+import logging
+import threading
+import time
+from typing import List, Optional, Sequence
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Plain-text "what is my IP" services, tried in order
+DEFAULT_ENDPOINTS = [
+    "https://ifconfig.me/ip",
+    "https://api.ipify.org",
+    "https://icanhazip.com",
+]
+
+CONNECT_TIMEOUT = 3.0   # seconds to establish the TCP/TLS connection
+READ_TIMEOUT = 3.0      # seconds to wait for the response
+MAX_RESPONSE_BYTES = 64 # an address never needs more than this
+USER_AGENT = "lcdstats"
+
+@dataclass(frozen=True)
+class PublicIPResult:
+    """Last known public IP address and whether it is out of date."""
+    value: str = ""
+    fetched_at: float = 0.0  # wall-clock time of the last successful lookup
+    stale: bool = True
+
+class PublicIPResolver:
+    """Resolves the public IP on a background thread with stale-while-revalidate semantics.
+
+    Lookups use a pure-Python HTTP client with hard connect/read timeouts and
+    walk a list of fallback endpoints. Failed rounds are retried with
+    exponential backoff while the last known address keeps being served,
+    marked stale.
+    """
+    REFRESH_INTERVAL = 300.0  # seconds between successful lookups
+    INITIAL_BACKOFF = 5.0     # seconds before the first retry after a failure
+    MAX_BACKOFF = 600.0       # upper bound for the retry delay
+    JOIN_TIMEOUT = 2.0        # seconds to wait for the thread on stop()
+
+    def __init__(self, endpoints: Sequence[str] = DEFAULT_ENDPOINTS, refresh_interval: float = REFRESH_INTERVAL,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT) -> None:
+        """Initialize the resolver; no lookup happens until start() or resolve_once()."""
+        self.endpoints: List[str] = list(endpoints)
+        self.refresh_interval = refresh_interval
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.backoff = 0.0
+        self._result = PublicIPResult()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        """Return True while the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background lookup thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="PublicIPResolver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, waiting at most JOIN_TIMEOUT seconds."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.JOIN_TIMEOUT)
+            self._thread = None
+
+    # --- Results ---
+
+    def current(self) -> PublicIPResult:
+        """Return the last known address; never blocks."""
+        result = self._result
+        if result.value and not result.stale and time.time() - result.fetched_at > self.refresh_interval:
+            return PublicIPResult(result.value, result.fetched_at, True)
+        return result
+
+    def seed(self, value: str, fetched_at: float) -> None:
+        """Serve a previously known address (e.g. from disk) until a fresh lookup succeeds."""
+        if not self._result.value:
+            self._result = PublicIPResult(value, fetched_at, True)
+
+    # --- Lookup ---
+
+    def _fetch(self, url: str) -> str:
+        """Fetch an address from one endpoint, raising on any failure."""
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = connection_class(parts.hostname, parts.port, timeout=self.connect_timeout)
+        try:
+            conn.connect()
+            conn.sock.settimeout(self.read_timeout)
+            conn.request("GET", parts.path or "/", headers={"User-Agent": USER_AGENT, "Accept": "text/plain"})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise OSError(f"HTTP {response.status}")
+            text = response.read(MAX_RESPONSE_BYTES).decode("ascii", "replace").strip()
+        finally:
+            conn.close()
+        return str(ipaddress.ip_address(text))  # ValueError on anything that is not an address
+
+    def resolve_once(self) -> Optional[str]:
+        """Try every endpoint once; update the result and backoff, and return the address or None."""
+        for url in self.endpoints:
+            try:
+                address = self._fetch(url)
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                logger.debug(f"Public IP lookup via {url} failed: {e}")
+                continue
+            self._result = PublicIPResult(address, time.time(), False)
+            self.backoff = 0.0
+            return address
+
+        current = self._result
+        self._result = PublicIPResult(current.value, current.fetched_at, True)
+        self.backoff = min(self.MAX_BACKOFF, self.backoff * 2 if self.backoff else self.INITIAL_BACKOFF)
+        logger.warning(f"Public IP lookup failed on all endpoints, retrying in {self.backoff:.0f}s")
+        return None
+
+    def _run(self) -> None:
+        """Lookup loop executed on the background thread."""
+        while not self._stop_event.is_set():
+            address = self.resolve_once()
+            self._stop_event.wait(self.refresh_interval if address else self.backoff)
@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+@dataclass(frozen=True)
+class MetricSample:
+    """One reading of a metric: the display string plus its raw numeric value.
+
+    `value` uses the metric's natural unit (fractions for percentages,
+    degrees Celsius, seconds); text-only metrics such as addresses use 0.0.
+    `detail` carries optional breakdowns (per-core usage, per-interface
+    rates...) keyed by name.
+    """
+    text: str
+    value: float = 0.0
+    stale: bool = False
+    detail: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+import logging
+import random
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from metrics.sample import MetricSample
+
+logger = logging.getLogger(__name__)
+
+# Cost classes, cheapest first. Due metrics run in this order so a slow
+# network lookup never delays the cheap procfs reads scheduled alongside it.
+COST_CHEAP = "cheap"      # in-memory procfs/sysfs reads
+COST_IO = "io"            # filesystem or subprocess work
+COST_NETWORK = "network"  # anything that leaves the host
+COST_ORDER = {COST_CHEAP: 0, COST_IO: 1, COST_NETWORK: 2}
+
+FAILURE_BACKOFF_LIMIT = 300.0  # longest delay (seconds) before retrying a metric that keeps failing
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """Declares how a metric is read and how often it needs refreshing."""
+    key: str
+    read: Callable[[], MetricSample]
+    interval: float          # seconds between refreshes
+    cost: str = COST_CHEAP
+    jitter: float = 0.0      # random extra delay (seconds) to spread out refreshes
+
+class MetricScheduler:
+    """Refreshes each registered metric only when its own interval has elapsed."""
+
+    def __init__(self, specs: Iterable[MetricSpec], clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the scheduler; every metric is due immediately."""
+        self.clock = clock
+        self.specs: Dict[str, MetricSpec] = {}
+        self.values: Dict[str, MetricSample] = {}
+        self._next_due: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}  # consecutive failed reads per metric
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: MetricSpec) -> None:
+        """Add (or replace) a metric in the registry and make it due now."""
+        self.specs[spec.key] = spec
+        self._next_due[spec.key] = self.clock()
+
+    def _schedule(self, spec: MetricSpec, now: float) -> None:
+        """Compute the next due time of a metric after a refresh attempt, backing off while it keeps failing."""
+        jitter = random.uniform(0.0, spec.jitter) if spec.jitter > 0 else 0.0
+        failures = self._failures.get(spec.key, 0)
+        interval = spec.interval
+        if failures > 1:
+            interval = min(spec.interval * 2 ** min(failures - 1, 16), max(spec.interval, FAILURE_BACKOFF_LIMIT))
+        self._next_due[spec.key] = now + interval + jitter
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Return the keys of metrics that are due, cheapest first."""
+        now = self.clock() if now is None else now
+        keys = [k for k, t in self._next_due.items() if t <= now]
+        return sorted(keys, key=lambda k: COST_ORDER.get(self.specs[k].cost, len(COST_ORDER)))
+
+    def run_due(self, now: Optional[float] = None) -> Dict[str, MetricSample]:
+        """Refresh every due metric and return the samples that were read.
+
+        A metric whose reader raises keeps its previous value and is retried
+        after its regular interval; if it keeps failing, the delay doubles up
+        to FAILURE_BACKOFF_LIMIT and only the first failure is logged.
+        """
+        updated = {}
+        for key in self.due(now):
+            spec = self.specs[key]
+            try:
+                updated[key] = spec.read()
+            except Exception as e:
+                failures = self._failures.get(key, 0) + 1
+                self._failures[key] = failures
+                if failures == 1:
+                    logger.warning(f"Failed to gather '{key}': {e}")
+                else:
+                    logger.debug(f"Failed to gather '{key}' ({failures} times in a row): {e}")
+            else:
+                if self._failures.pop(key, 0) > 1:
+                    logger.info(f"Gathering '{key}' works again")
+            self._schedule(spec, self.clock())
+        self.values.update(updated)
+        return updated
+
+    def next_due(self, key: str) -> float:
+        """Return the clock time at which a metric is next due."""
+        return self._next_due[key]
+
+    def next_deadline(self) -> float:
+        """Return the clock time of the earliest upcoming refresh."""
+        return min(self._next_due.values(), default=self.clock())
+
+    def due_times(self) -> Dict[str, float]:
+        """Return the next due time of every registered metric."""
+        return dict(self._next_due)
+
+    def seed(self, key: str, value: MetricSample) -> None:
+        """Provide a provisional value (e.g. from disk) without postponing the metric's refresh."""
+        self.values.setdefault(key, value)
+
+    def invalidate(self, key: str) -> None:
+        """Force a metric to be refreshed on the next run."""
+        self._next_due[key] = self.clock()
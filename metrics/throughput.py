@@ -0,0 +1,101 @@
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from metrics.procfs_backend import SECTOR_SIZE, ProcfsBackend
+from metrics.sample import MetricSample
+
+COUNTER_32_LIMIT = 1 << 32
+COUNTER_64_LIMIT = 1 << 64
+RATE_UNITS = ["B", "K", "M", "G"]
+NO_DATA_TEXT = "--"
+
+def counter_delta(prev: int, curr: int) -> int:
+    """Return the increase of a kernel counter, accounting for 32- or 64-bit wraparound."""
+    if curr >= prev:
+        return curr - prev
+    # A counter that was still below 2^32 most likely wrapped at 2^32 (32-bit kernels)
+    limit = COUNTER_32_LIMIT if prev < COUNTER_32_LIMIT else COUNTER_64_LIMIT
+    delta = curr + limit - prev
+    # An implausibly large jump means the counter was reset (e.g. interface re-created)
+    return curr if delta > limit // 2 else delta
+
+def format_rate(bytes_per_second: float) -> str:
+    """Format a byte rate compactly, e.g. 512B, 1.2K, 34M."""
+    value, index = float(bytes_per_second), 0
+    while value >= 1000 and index < len(RATE_UNITS) - 1:
+        value /= 1024
+        index += 1
+    unit = RATE_UNITS[index]
+    return f"{value:.1f}{unit}" if value < 10 and unit != "B" else f"{value:.0f}{unit}"
+
+class RateTracker:
+    """Turns successive counter readings into per-second rates.
+
+    Devices are matched by name; a device only gets rates once it has been
+    seen in two consecutive readings, and devices that disappear are dropped.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the tracker with no previous reading."""
+        self.clock = clock
+        self._prev: Dict[str, Sequence[int]] = {}
+        self._prev_time: Optional[float] = None
+
+    def update(self, counters: Dict[str, Sequence[int]]) -> Dict[str, Tuple[float, ...]]:
+        """Store a reading and return {device: per-counter rates} since the previous one."""
+        now = self.clock()
+        prev, prev_time = self._prev, self._prev_time
+        self._prev, self._prev_time = counters, now
+        if prev_time is None or now <= prev_time:
+            return {}
+        elapsed = now - prev_time
+        return {
+            name: tuple(counter_delta(p, c) / elapsed for p, c in zip(prev[name], values))
+            for name, values in counters.items() if name in prev
+        }
+
+class NetworkThroughput:
+    """Per-interface receive/transmit rates computed from /proc/net/dev deltas."""
+
+    def __init__(self, backend: ProcfsBackend) -> None:
+        """Initialize the provider on top of a ProcfsBackend."""
+        self.backend = backend
+        self.tracker = RateTracker()
+
+    def sample(self) -> MetricSample:
+        """Return total bytes/s (rx + tx), with per-interface rates in `detail`."""
+        rates = self.tracker.update(self.backend.read_net_dev())
+        if not rates:
+            return MetricSample(NO_DATA_TEXT)
+        detail = {}
+        for name, (rx, tx) in rates.items():
+            detail[f"{name}.rx"], detail[f"{name}.tx"] = rx, tx
+        rx_total = sum(r[0] for r in rates.values())
+        tx_total = sum(r[1] for r in rates.values())
+        return MetricSample(f"{format_rate(rx_total)}/{format_rate(tx_total)}",
+                            rx_total + tx_total, detail=MappingProxyType(detail))
+
+class DiskThroughput:
+    """Per-disk read/write throughput and IOPS computed from /proc/diskstats deltas."""
+
+    def __init__(self, backend: ProcfsBackend) -> None:
+        """Initialize the provider on top of a ProcfsBackend."""
+        self.backend = backend
+        self.tracker = RateTracker()
+
+    def sample(self) -> MetricSample:
+        """Return total bytes/s (read + write), with per-disk rates and IOPS in `detail`."""
+        rates = self.tracker.update(self.backend.read_diskstats())
+        if not rates:
+            return MetricSample(NO_DATA_TEXT)
+        detail = {}
+        read_total = write_total = 0.0
+        for name, (reads, sectors_read, writes, sectors_written) in rates.items():
+            read_bps, write_bps = sectors_read * SECTOR_SIZE, sectors_written * SECTOR_SIZE
+            detail[f"{name}.read"], detail[f"{name}.write"] = read_bps, write_bps
+            detail[f"{name}.iops"] = reads + writes
+            read_total += read_bps
+            write_total += write_bps
+        return MetricSample(f"{format_rate(read_total)}/{format_rate(write_total)}",
+                            read_total + write_total, detail=MappingProxyType(detail))
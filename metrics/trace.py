@@ -0,0 +1,145 @@
+import gzip
+import json
+import logging
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics.sample import MetricSample
+
+logger = logging.getLogger(__name__)
+
+# Trace files are gzip-compressed JSON lines. The first line is a header;
+# every following line is [seconds since start, {key: sample}] holding only
+# the samples updated at that instant, each encoded as
+# [text, value] or [text, value, stale, detail].
+VERSION = 1
+
+Record = Tuple[float, Dict[str, MetricSample]]
+
+def encode_sample(sample: MetricSample) -> list:
+    """Encode a sample as a compact list, omitting default fields."""
+    if sample.stale or sample.detail:
+        return [sample.text, sample.value, int(sample.stale), dict(sample.detail)]
+    return [sample.text, sample.value]
+
+def decode_sample(data: list) -> MetricSample:
+    """Rebuild a sample encoded by encode_sample()."""
+    text, value = data[0], data[1]
+    stale = bool(data[2]) if len(data) > 2 else False
+    detail = MappingProxyType(data[3]) if len(data) > 3 else MappingProxyType({})
+    return MetricSample(text, value, stale, detail)
+
+class TraceRecorder:
+    """Appends every batch of updated samples to a trace file."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        """Create (or truncate) the trace file and write its header."""
+        self.path = path
+        self.clock = clock
+        self.start = clock()
+        self.records = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"version": VERSION, "started_at": time.time()}) + "\n")
+
+    def record(self, updated: Dict[str, MetricSample]) -> None:
+        """Write the samples updated at this instant."""
+        if not updated or self._file is None:
+            return
+        offset = round(self.clock() - self.start, 3)
+        line = [offset, {key: encode_sample(s) for key, s in updated.items()}]
+        self._file.write(json.dumps(line, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self.records += 1
+
+    def close(self) -> None:
+        """Flush and close the trace file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            logger.info(f"Recorded {self.records} metric updates to {self.path}")
+
+def load_trace(path: str) -> List[Record]:
+    """Read every record of a trace file, tolerating a truncated tail (e.g. after a crash)."""
+    records: List[Record] = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported trace version {header.get('version')!r} in {path}")
+        try:
+            for line in f:
+                offset, samples = json.loads(line)
+                records.append((float(offset), {k: decode_sample(v) for k, v in samples.items()}))
+        except (EOFError, json.JSONDecodeError) as e:
+            logger.warning(f"Trace {path} is truncated after {len(records)} records: {e}")
+    return records
+
+class ReplayGatherer:
+    """Drop-in replacement for DataGatherer that plays back a recorded trace.
+
+    Samples are released when their recorded offset (divided by `speed`) has
+    elapsed since start(), so every run sees the same values in the same
+    order. With `loop` the trace restarts LOOP_GAP seconds after its last record.
+    """
+    LOOP_GAP = 1.0  # trace seconds between the last record and the restart
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = True,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Load the trace; playback starts on start() or the first refresh."""
+        if speed <= 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}")
+        self.records = load_trace(path)
+        if not self.records:
+            raise ValueError(f"Trace {path} contains no records")
+        self.speed = speed
+        self.loop = loop
+        self.clock = clock
+        self.duration = self.records[-1][0]
+        self.values: Dict[str, MetricSample] = {}
+        self._index = 0
+        self._start: Optional[float] = None
+
+    def start(self) -> None:
+        """Start (or restart) playback from the beginning of the trace."""
+        self._start = self.clock()
+        self._index = 0
+
+    def stop(self) -> None:
+        """Nothing to release; present for DataGatherer compatibility."""
+        pass
+
+    def _position(self) -> float:
+        """Return the playback position in trace seconds."""
+        if self._start is None:
+            self.start()
+        return (self.clock() - self._start) * self.speed
+
+    def refresh_due(self) -> Dict[str, MetricSample]:
+        """Return the samples whose recorded time has been reached since the last call."""
+        position = self._position()
+        updated: Dict[str, MetricSample] = {}
+        while self._index < len(self.records) and self.records[self._index][0] <= position:
+            updated.update(self.records[self._index][1])
+            self._index += 1
+        if self._index == len(self.records) and self.loop:
+            # Shift the start so the trace plays again one period later
+            self._start += (self.duration + self.LOOP_GAP) / self.speed
+            self._index = 0
+        self.values.update(updated)
+        return updated
+
+    def snapshot(self) -> Dict[str, MetricSample]:
+        """Release due samples and return the latest sample of every metric."""
+        self.refresh_due()
+        return self.cached_values()
+
+    def cached_values(self) -> Dict[str, MetricSample]:
+        """Return the latest replayed sample of every metric."""
+        return dict(self.values)
+
+    def next_due(self) -> float:
+        """Return the clock instant at which the next record is released."""
+        if self._start is None:
+            return self.clock()
+        if self._index >= len(self.records):
+            return float("inf")
+        return self._start + self.records[self._index][0] / self.speed
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "LCDSTATS_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lcdstats")
+CACHE_FILE_NAME = "metrics.json"
+MAX_CLOCK_SKEW = 60.0  # seconds an entry may appear to come from the future
+
+def default_cache_path() -> str:
+    """Return the warm cache location, honouring the LCDSTATS_CACHE_DIR environment variable."""
+    return os.path.join(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR), CACHE_FILE_NAME)
+
+class WarmCache:
+    """Small on-disk cache of slow-changing metric values, kept across restarts.
+
+    Entries are stored as {key: {"value": str, "timestamp": float}} and the
+    file is replaced atomically on every save. Loading never raises: a
+    missing, corrupt or foreign file simply yields no entries.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        """Initialize the cache for the given file path."""
+        self.path = path
+
+    def load(self, max_ages: Mapping[str, float]) -> Dict[str, Tuple[str, float]]:
+        """Return {key: (value, timestamp)} for known keys that are younger than their max age."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable warm cache {self.path}: {e}")
+            return {}
+
+        if not isinstance(content, dict) or content.get("version") != self.VERSION:
+            return {}
+        metrics = content.get("metrics")
+        if not isinstance(metrics, dict):
+            return {}
+
+        now = time.time()
+        entries = {}
+        for key, max_age in max_ages.items():
+            entry = metrics.get(key)
+            if not isinstance(entry, dict):
+                continue
+            value, timestamp = entry.get("value"), entry.get("timestamp")
+            if not isinstance(value, str) or not value or not isinstance(timestamp, (int, float)):
+                continue
+            if -MAX_CLOCK_SKEW <= now - timestamp <= max_age:
+                entries[key] = (value, float(timestamp))
+        return entries
+
+    def save(self, entries: Mapping[str, Tuple[str, float]]) -> bool:
+        """Atomically write {key: (value, timestamp)} to disk; return False on failure."""
+        content = {
+            "version": self.VERSION,
+            "metrics": {k: {"value": v, "timestamp": t} for k, (v, t) in entries.items()},
+        }
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(content, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write warm cache {self.path}: {e}")
+            return False
+        return True
@@ -1,4 +1,7 @@
 from PIL import Image, ImageDraw
+import numpy as np
+import time
+from typing import Callable, Optional
 
 from views.screen import Screen
 from input_handler import InputHandler
@@ -7,7 +10,8 @@ from utils.progress_indicator import ProgressIndicator
 class ScreenManager:
     STARTING_SCREEN_INDEX = 0 # The index of the starting screen
 
-    def __init__(self, screens: list[Screen], input_handler: InputHandler) -> None:
+    def __init__(self, screens: list[Screen], input_handler: InputHandler,
+                 clock: Callable[[], float] = time.monotonic) -> None:
         """Initialize the ScreenManager with a list of screens and an input handler."""
         self.screens = screens
         self.input_handler = input_handler
@@ -16,6 +20,11 @@ class ScreenManager:
         self.device_on = True
         self.current_press_duration = 0.0
         self.current_screen = self.screens[self.current_index]
+        self.needs_frame = True # set when the screen or device state changed since the last draw
+        self.on_change: Optional[Callable[[], None]] = None # e.g. wakes the render loop from other threads
+        self.max_frame_interval = float('inf') # the device's Device.max_frame_interval, set by the render loop
+        self.clock = clock
+        self.last_frame_time = clock()
 
         self.progress_indicator = ProgressIndicator()
 
@@ -33,6 +42,20 @@ class ScreenManager:
         self.switch_screen_if_needed()
         self.current_screen.update(delta)
 
+    def _mark_changed(self) -> None:
+        """Request a frame for a state change and notify the render loop."""
+        self.needs_frame = True
+        if self.on_change:
+            self.on_change()
+
+    def next_frame_time(self, now: float) -> float:
+        """Return the instant at which the next frame is needed."""
+        if self.needs_frame or self.current_press_duration > 0:
+            return now # state change, or the progress indicator animating while the button is held
+        # Nothing changes while the device is off, but some devices still need a frame now and then
+        deadline = self.current_screen.next_frame_time(now) if self.device_on else float('inf')
+        return min(deadline, self.last_frame_time + self.max_frame_interval)
+
     def _draw_progress(self, image: Image.Image) -> None:
         """Dibuja el indicador de progreso usando la clase dedicada."""
         self.progress_indicator.draw(
@@ -41,8 +64,20 @@ class ScreenManager:
             max_time=InputHandler.LONG_PRESS_THRESHOLD
         )
 
+    def native_frame(self, byteorder: Optional[str]) -> Optional[np.ndarray]:
+        """Return the current screen's ready-to-send RGB565 frame, or None if it has to be drawn."""
+        if byteorder is None or not self.device_on or self.current_press_duration > 0:
+            return None # no native path, or an overlay (device off, progress indicator) on top
+        frame = self.current_screen.get_native_frame(byteorder)
+        if frame is not None:
+            self.needs_frame = False
+            self.last_frame_time = self.clock()
+        return frame
+
     def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
         """Draw the on the current screen."""
+        self.needs_frame = False
+        self.last_frame_time = self.clock()
         if not self.device_on:
             draw.rectangle((0, 0, self.current_screen.screen_width, self.current_screen.screen_height), fill='black')
             return
@@ -58,6 +93,7 @@ class ScreenManager:
         if self.device_on:
             self.current_index = self.STARTING_SCREEN_INDEX
         self.last_index = -1
+        self._mark_changed()
 
     def handle_button_press(self) -> None:
         """Handle button press event."""
@@ -68,6 +104,7 @@ class ScreenManager:
         else:
             if not self.input_handler.was_long_press():
                 self.current_index = (self.current_index + 1) % len(self.screens)
+        self._mark_changed()
 
     def switch_screen_if_needed(self) -> None:
         """Switch to the next screen if the current index has changed."""
@@ -1,20 +1,31 @@
 import platform
 import time
-from PIL import Image, ImageDraw
 
+from data_gatherer import DataGatherer
 from devices.device import Device
+from metrics.agent import DEFAULT_PORT, MetricsAgent
+from metrics.aggregator import HostAggregator
+from metrics.collector import MetricCollector
+from metrics.exporter import MetricsExporter
+from metrics.history import MetricHistory
+from metrics.trace import ReplayGatherer, TraceRecorder
 from screen_manager import ScreenManager
 from views.screen import Screen
 from views.main_screen import MainScreen
+from views.history_screen import HistoryScreen
+from views.hosts_screen import HostsScreen
 from views.secondary_screen import SecondaryScreen
 from input_handler import InputHandler
+from utils.frame_scheduler import FrameScheduler
+from utils.frame_timing import FrameTimer, NULL_TIMER
+from utils.render_pipeline import RenderPipeline
 
 # --- Screen config ---
 SCREEN_WIDTH = 128
 SCREEN_HEIGHT = 128
 SCREEN_ROTATE = 0
 
-FPS = 30
+FPS = 30 # upper bound; frames are only rendered when the screen or input needs one
 FRAME_DURATION = 1 / FPS
 
 # --- Environment Check ---
@@ -28,14 +39,20 @@ def is_raspberry_pi() -> bool:
 IS_RASPBERRY = is_raspberry_pi()
 
 # --- Device Setup ---
-def setup_device(input_handler_instance: InputHandler, screen_manager_instance: ScreenManager, display_type: str = "auto", esp32_host: str = None) -> Device:
-    """Set up the display device based on the environment."""
+def resolve_display_type(display_type: str) -> str:
+    """Map "auto" to the display type of the current platform."""
     if display_type == "auto":
-        display_type = "raspberry" if IS_RASPBERRY else "window"
+        return "raspberry" if IS_RASPBERRY else "window"
+    return display_type
+
+def setup_device(input_handler_instance: InputHandler, screen_manager_instance: ScreenManager, display_type: str = "auto", esp32_host: str = None,
+                 refresh_interval: float = None) -> Device:
+    """Set up the display device based on the environment."""
+    display_type = resolve_display_type(display_type)
 
     if display_type == "raspberry":
         from devices.ILI9163 import ILI9163
-        return ILI9163()
+        return ILI9163(refresh_interval=refresh_interval)
     elif display_type == "window":
         import tkinter as tk
         from devices.fake_display import FakeDisplay
@@ -47,7 +64,8 @@ def setup_device(input_handler_instance: InputHandler, screen_manager_instance:
         if not esp32_host:
             raise ValueError("ESP32 host address required for ESP32 display mode")
 
-        device = ESP32WiFiDisplay(esp32_host, width=SCREEN_WIDTH, height=SCREEN_HEIGHT)
+        device = ESP32WiFiDisplay(esp32_host, width=SCREEN_WIDTH, height=SCREEN_HEIGHT,
+                                  refresh_interval=refresh_interval)
 
         # Setup callbacks
         def on_request_next(last_screen: str):
@@ -66,43 +84,82 @@ def setup_device(input_handler_instance: InputHandler, screen_manager_instance:
         raise ValueError(f"Unsupported display type: {display_type}")
 
 # --- Main Loop ---
-def main_loop(device: Device, screen_manager: ScreenManager, display_type: str) -> None:
-    """Main loop for the application."""
+def create_pipeline(device: Device, display_type: str, depth: int = RenderPipeline.DEFAULT_DEPTH) -> RenderPipeline:
+    """Create the render/transport pipeline; Tk must be driven from the main thread, so the window stays synchronous."""
+    display_type = resolve_display_type(display_type)
+    return RenderPipeline(
+        device, (SCREEN_WIDTH, SCREEN_HEIGHT), depth,
+        threaded=display_type != "window",
+        update_device=not IS_RASPBERRY or display_type == "window",
+    )
+
+def main_loop(device: Device, screen_manager: ScreenManager, display_type: str, scheduler: FrameScheduler,
+              pipeline: RenderPipeline, timer: FrameTimer = NULL_TIMER) -> None:
+    """Main loop for the application: renders frames and hands them to the pipeline's transport stage."""
     last_frame_time = time.monotonic()
+    device.frame_timer = timer # the device times its own conversion and push
+    screen_manager.max_frame_interval = device.max_frame_interval
+    pipeline.start()
 
     while True:
-        # Limit frame rate
-        now = time.monotonic()
-        elapsed = now - last_frame_time
-        if elapsed < FRAME_DURATION:
-            time.sleep(FRAME_DURATION - elapsed)
-        current_time = time.monotonic()
+        # Sleep until the screen's next deadline, an input event or new data
+        current_time = scheduler.wait(screen_manager.next_frame_time(time.monotonic()))
         delta_time = current_time - last_frame_time
         last_frame_time = current_time
+        frame_start = timer.start()
 
-        # Prepare frame
-        frame = Image.new('RGBA', (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(frame)
-
-        # Update and draw current screen
         screen_manager.update(delta_time)
-        screen_manager.draw(draw, frame)
+        timer.record("update", frame_start)
+
+        # Screen ID for ESP32, applied with the frame it belongs to
+        screen_id = f"screen{screen_manager.current_index + 1}" if display_type == "esp32" else None
 
-        # Update screen ID for ESP32
-        if display_type == "esp32":
-            screen_id = f"screen{screen_manager.current_index + 1}"
-            device.set_screen_id(screen_id)
+        # Precomputed RGB565 frames go straight to devices that accept them (not under the timing overlay)
+        native = None if timer.overlay else screen_manager.native_frame(device.rgb565_byteorder)
+        if native is not None:
+            pipeline.submit(native, screen_id)
+            timer.frame_done(frame_start)
+            continue
 
-        # Render to display
-        if not IS_RASPBERRY:
-            base = Image.new('RGBA', (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 255))
-            final_image = Image.alpha_composite(base, frame)
-            device.display(final_image)
-        else:
-            device.display(frame)
+        # Draw into a pooled buffer, cleared in place; every device composites the RGBA frame onto black itself
+        draw_start = timer.start()
+        frame, draw = pipeline.acquire()
+        screen_manager.draw(draw, frame)
+        timer.draw_overlay(draw, SCREEN_WIDTH)
+        timer.record("draw", draw_start)
+        pipeline.submit(frame, screen_id)
+        timer.frame_done(frame_start)
 
-        if not IS_RASPBERRY or display_type == "window":
-            device.update()
+# --- Agent Mode ---
+def start_exporter(collector: MetricCollector, port: int = None) -> MetricsExporter:
+    """Start the OpenMetrics endpoint on `port`, if one was requested."""
+    if port is None:
+        return None
+    exporter = MetricsExporter(collector, port=port)
+    exporter.start()
+    print(f"OpenMetrics endpoint on port {exporter.address[1]} (/metrics)")
+    return exporter
+
+def run_agent(bind: str, port: int, name: str = None, metrics_port: int = None) -> None:
+    """Run headless, serving metric snapshots to remote displays until interrupted."""
+    collector = MetricCollector(DataGatherer(IS_RASPBERRY), MainScreen.DATA_UPDATE_INTERVAL)
+    agent = MetricsAgent(collector, bind, port, name)
+    exporter = None
+    collector.start()
+    try:
+        exporter = start_exporter(collector, metrics_port)
+        agent.start()
+        host, port = agent.address
+        print(f"Agent '{agent.name}' listening on {host}:{port}", flush=True)
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        agent.stop()
+        if exporter:
+            exporter.stop()
+        collector.stop()
 
 # --- Entry Point ---
 def main() -> None:
@@ -115,8 +172,43 @@ def main() -> None:
                        help='Display type to use')
     parser.add_argument('--esp32-host', type=str,
                        help='ESP32 host IP address for WiFi display')
+    parser.add_argument('--agent', action='store_true',
+                       help='Run headless and serve metric snapshots to remote displays')
+    parser.add_argument('--agent-bind', type=str, default='0.0.0.0',
+                       help='Address the agent listens on')
+    parser.add_argument('--agent-port', type=int, default=DEFAULT_PORT,
+                       help='TCP port the agent listens on (0 picks a free port)')
+    parser.add_argument('--agent-name', type=str,
+                       help='Host name reported by the agent (defaults to the hostname)')
+    parser.add_argument('--hosts', type=str,
+                       help='Comma-separated agents (host[:port]) to show on the hosts screen')
+    parser.add_argument('--metrics-port', type=int,
+                       help='Serve an OpenMetrics endpoint (/metrics) on this port')
+    parser.add_argument('--record-trace', type=str, metavar='PATH',
+                       help='Record every metric update to a trace file')
+    parser.add_argument('--replay-trace', type=str, metavar='PATH',
+                       help='Replay a recorded trace instead of reading live metrics')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                       help='Playback speed multiplier for --replay-trace')
+    parser.add_argument('--frame-timing', action='store_true',
+                       help='Record per-stage frame timings (update, draw, convert, push)')
+    parser.add_argument('--timing-overlay', action='store_true',
+                       help='Show FPS and the slowest stage on screen (implies --frame-timing)')
+    parser.add_argument('--timing-log', type=str, metavar='PATH',
+                       help='Append a JSON line of stage timings to PATH periodically (implies --frame-timing)')
+    parser.add_argument('--timing-interval', type=float, default=FrameTimer.DEFAULT_EXPORT_INTERVAL,
+                       help='Seconds between --timing-log lines')
+    parser.add_argument('--queue-depth', type=int, default=RenderPipeline.DEFAULT_DEPTH,
+                       choices=range(1, RenderPipeline.MAX_DEPTH + 1),
+                       help='Rendered frames that may wait for the display; newer frames replace older ones')
+    parser.add_argument('--refresh-interval', type=float, metavar='SECONDS',
+                       help='Resend an unchanged frame after this many seconds (default: never on the LCD, 15 s on the ESP32)')
     args = parser.parse_args()
 
+    if args.agent:
+        run_agent(args.agent_bind, args.agent_port, args.agent_name, args.metrics_port)
+        return
+
     print(f"Starting LCD Stats Display")
     print(f"Display mode: {args.display}")
     print(f"Is Raspberry: {IS_RASPBERRY}")
@@ -129,18 +221,50 @@ def main() -> None:
 
     input_handler_instance = InputHandler(IS_RASPBERRY, use_gpio=use_gpio)
 
+    # Metrics are gathered on a background thread so the render loop never waits on I/O
+    # A replayed trace feeds identical values on every run, for reproducible benchmarks
+    if args.replay_trace:
+        data_gatherer = ReplayGatherer(args.replay_trace, args.replay_speed)
+        print(f"Replaying {len(data_gatherer.records)} metric updates from {args.replay_trace}")
+    else:
+        data_gatherer = DataGatherer(IS_RASPBERRY)
+    recorder = TraceRecorder(args.record_trace) if args.record_trace else None
+
+    history = MetricHistory()
+    collector = MetricCollector(data_gatherer, MainScreen.DATA_UPDATE_INTERVAL, history, recorder)
+    collector.start()
+    exporter = start_exporter(collector, args.metrics_port)
+
     screens: list[Screen] = [
-        MainScreen(IS_RASPBERRY, SCREEN_WIDTH, SCREEN_HEIGHT),
+        MainScreen(IS_RASPBERRY, SCREEN_WIDTH, SCREEN_HEIGHT, collector),
+        HistoryScreen(IS_RASPBERRY, SCREEN_WIDTH, SCREEN_HEIGHT, history),
         SecondaryScreen(IS_RASPBERRY, SCREEN_WIDTH, SCREEN_HEIGHT)
     ]
 
+    # Remote agents are polled in the background; the screen only reads their latest status
+    aggregator = None
+    if args.hosts:
+        aggregator = HostAggregator([h for h in args.hosts.split(',') if h.strip()])
+        aggregator.start()
+        screens.insert(1, HostsScreen(IS_RASPBERRY, SCREEN_WIDTH, SCREEN_HEIGHT, aggregator))
+
     screen_manager = ScreenManager(screens, input_handler_instance)
 
+    # New snapshots and remote screen changes wake the render loop
+    scheduler = FrameScheduler(FRAME_DURATION, input_handler_instance)
+    collector.listeners.append(lambda snapshot: scheduler.wake())
+    screen_manager.on_change = scheduler.wake
+
+    timer = FrameTimer(args.frame_timing, args.timing_overlay, args.timing_log, args.timing_interval)
+
     device = None
+    pipeline = None
     try:
-        device = setup_device(input_handler_instance, screen_manager, args.display, args.esp32_host)
+        device = setup_device(input_handler_instance, screen_manager, args.display, args.esp32_host,
+                              args.refresh_interval)
+        pipeline = create_pipeline(device, args.display, args.queue_depth)
         print(f"Device setup complete. Starting main loop...")
-        main_loop(device, screen_manager, args.display)
+        main_loop(device, screen_manager, args.display, scheduler, pipeline, timer)
     except KeyboardInterrupt:
         print("\nShutting down...")
     except Exception as e:
@@ -148,6 +272,24 @@ def main() -> None:
         import traceback
         traceback.print_exc()
     finally:
+        if pipeline:
+            pipeline.stop()
+            print(f"Frames: {pipeline.stats().summary()}")
+        transmission = device.transmission_stats() if device else None
+        if transmission:
+            print(f"Display: {transmission.summary()}")
+        if timer.enabled:
+            for stage, summary in timer.report()["stages"].items():
+                print(f"Timing {stage:7} mean {summary['mean_ms']:6.2f} ms  p50 {summary['p50_ms']:6.2f}  "
+                      f"p99 {summary['p99_ms']:6.2f}  max {summary['max_ms']:6.2f}")
+            timer.export()  # flush the last partial window
+        collector.stop()
+        if recorder:
+            recorder.close()
+        if exporter:
+            exporter.stop()
+        if aggregator:
+            aggregator.stop()
         if device:
             device.clear()
             if args.display == "window":
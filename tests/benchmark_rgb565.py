@@ -0,0 +1,50 @@
+"""Compares the shared RGB565 converter with the per-driver pipeline it replaced.
+
+Run from the project root: python -m tests.benchmark_rgb565
+"""
+from PIL import Image
+import numpy as np
+import time
+
+from utils.rgb565 import BIG_ENDIAN, LITTLE_ENDIAN, RGB565Converter
+
+SIZE = (128, 128)
+ITERATIONS = 2000
+
+def legacy_convert(image: Image.Image, byteorder: str) -> bytes:
+    """The conversion ILI9163.display / ESP32WiFiDisplay._convert_to_rgb565 used to do."""
+    if image.mode == 'RGBA':
+        bg = Image.new("RGBA", image.size, (0, 0, 0, 255))
+        image = Image.alpha_composite(bg, image)
+    img = image.convert('RGB').resize(SIZE)
+    arr = np.array(img, dtype=np.uint16)
+    r = (arr[:, :, 0] & 0xF8) << 8
+    g = (arr[:, :, 1] & 0xFC) << 3
+    b = (arr[:, :, 2] & 0xF8) >> 3
+    rgb565 = r | g | b
+    return rgb565.byteswap().tobytes() if byteorder == BIG_ENDIAN else rgb565.tobytes()
+
+def time_per_call(func) -> float:
+    """Returns the mean time of one call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    frames = {
+        'RGBA': Image.fromarray(rng.integers(0, 256, (SIZE[1], SIZE[0], 4), dtype=np.uint8), 'RGBA'),
+        'RGB': Image.fromarray(rng.integers(0, 256, (SIZE[1], SIZE[0], 3), dtype=np.uint8), 'RGB'),
+    }
+    for byteorder in (BIG_ENDIAN, LITTLE_ENDIAN):
+        converter = RGB565Converter(SIZE[0], SIZE[1], byteorder)
+        out = converter.new_buffer()
+        for mode, frame in frames.items():
+            assert converter.convert(frame, out=out).tobytes() == legacy_convert(frame, byteorder)
+            legacy = time_per_call(lambda: legacy_convert(frame, byteorder))
+            shared = time_per_call(lambda: converter.convert(frame, out=out))
+            print(f"{mode:4} {byteorder:6}  legacy {legacy:7.1f} us  shared {shared:7.1f} us  ({legacy / shared:.1f}x)")
+
+if __name__ == "__main__":
+    main()
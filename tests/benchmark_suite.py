@@ -0,0 +1,289 @@
+"""Headless rendering benchmarks: screens driven into a null device, plus RGB565 conversion.
+
+Run from the project root:
+    python -m tests.benchmark_suite                           # writes benchmark_results.json (git-ignored)
+    python -m tests.benchmark_suite --output benchmark_results-before.json
+    python -m tests.benchmark_suite --compare benchmark_results-before.json   # also prints the change per metric
+
+Metric values are scripted and time is simulated, so every run renders the same frames.
+Each run gets its own frame cache in a temporary directory, warmed before
+the measurement, so runs never touch the real cache in ~/.cache/lcdstats.
+Allocation figures come from tracemalloc and cover Python and numpy memory,
+but not Pillow's image buffers. Peak RSS is for the whole process.
+"""
+from PIL import Image
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from devices.device import Device
+from devices.esp32_wifi_display import ESP32WiFiDisplay
+from input_handler import InputHandler
+from metrics.collector import MetricCollector
+from metrics.sample import MetricSample
+from screen_manager import ScreenManager
+from tests.benchmark_rgb565 import legacy_convert
+from utils.gif_cache import GifFrameCache
+from utils.render_pipeline import RenderPipeline
+from utils.rgb565 import BIG_ENDIAN, LITTLE_ENDIAN, RGB565Converter
+from views.main_screen import MainScreen
+from views.secondary_screen import SecondaryScreen
+
+SIZE = (128, 128)
+FRAME_DURATION = 1 / 30  # simulated time between frames
+DATA_EVERY = 30          # frames between metric updates (one per simulated second)
+DEFAULT_FRAMES = 600
+TRACED_FRAMES = 100      # tracemalloc slows rendering, so allocations are measured on a shorter run
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+class NullDevice(Device):
+    """Accepts every frame and discards it; takes native big-endian frames when `native` is set."""
+
+    def __init__(self, native: bool = False) -> None:
+        super().__init__(*SIZE)
+        self.native = native
+        self.frames = 0
+
+    @property
+    def rgb565_byteorder(self) -> Optional[str]:
+        return BIG_ENDIAN if self.native else None
+
+    def display(self, image: Image.Image) -> None:
+        self.frames += 1
+
+    def display_rgb565(self, frame: np.ndarray) -> bool:
+        self.frames += 1
+        return self.native
+
+class ScriptedGatherer:
+    """Stands in for DataGatherer: every refresh returns the next values of a fixed sequence."""
+
+    def __init__(self) -> None:
+        self.step = 0
+
+    def refresh_due(self) -> Dict[str, MetricSample]:
+        self.step += 1
+        cpu, mem = (self.step * 7) % 100, (self.step * 3) % 100
+        return {
+            'cpu': MetricSample(f"{cpu}%", cpu / 100),
+            'mem': MetricSample(f"{mem}%", mem / 100),
+            'disk': MetricSample("42%", 0.42),
+            'temp': MetricSample(f"{40 + self.step % 30}°C", 40.0 + self.step % 30),
+            'local_ip': MetricSample("192.168.0.10"),
+            'public_ip': MetricSample("203.0.113.7"),
+            'uptime': MetricSample(f"{self.step // 60}h {self.step % 60}m", float(self.step)),
+            'time': MetricSample(f"12:{self.step % 60:02d}"),
+        }
+
+    def cached_values(self) -> Dict[str, MetricSample]:
+        return {}
+
+    def next_due(self) -> float:
+        return time.monotonic() + MainScreen.DATA_UPDATE_INTERVAL
+
+class HeldButton(InputHandler):
+    """Input that keeps the button held, sweeping the press duration below the long-press threshold."""
+
+    def __init__(self, held: bool) -> None:
+        super().__init__(is_raspberry=False, use_gpio=False)
+        self.held = held
+        self.calls = 0
+
+    def get_current_press_duration(self) -> float:
+        if not self.held:
+            return 0.0
+        self.calls += 1
+        return 0.3 + (self.calls % 80) * (self.LONG_PRESS_THRESHOLD - 0.4) / 80
+
+def warm_frame_cache(cache_dir: str) -> None:
+    """Builds the GIF screen's frame cache in `cache_dir`, as an earlier start of the app would have."""
+    gif = GifFrameCache(SecondaryScreen.DEFAULT_GIF_PATH, SIZE, cache_dir, resample=SecondaryScreen.RESIZE_METHOD)
+    gif.native_frames(BIG_ENDIAN)
+    gif.close()
+
+def build_scenario(name: str) -> Callable[[str], Callable[[], None]]:
+    """Returns a factory for the per-frame step of a scenario (screens, input and device are fresh per run)."""
+    def factory(cache_dir: str) -> Callable[[], None]:
+        sim_time = [0.0]
+        clock = lambda: sim_time[0]
+        collector = MetricCollector(ScriptedGatherer(), MainScreen.DATA_UPDATE_INTERVAL)
+        if name in ("main", "progress"):
+            screens = [MainScreen(False, SIZE[0], SIZE[1], collector)]
+        else:
+            warm_frame_cache(cache_dir)
+            screens = [SecondaryScreen(False, SIZE[0], SIZE[1], cache_dir, clock=clock)]
+        manager = ScreenManager(screens, HeldButton(held=name == "progress"), clock=clock)
+        device = NullDevice(native=name == "secondary_native")
+        pipeline = RenderPipeline(device, SIZE, threaded=False)
+        frame_count = [0]
+
+        def step() -> None:
+            if frame_count[0] % DATA_EVERY == 0:
+                collector.collect_once()
+            frame_count[0] += 1
+            sim_time[0] += FRAME_DURATION
+            manager.update(FRAME_DURATION)
+            native = manager.native_frame(device.rgb565_byteorder)
+            if native is not None:
+                pipeline.submit(native)
+                return
+            frame, draw = pipeline.acquire()
+            manager.draw(draw, frame)
+            pipeline.submit(frame)
+        return step
+    return factory
+
+SCENARIOS = {
+    "main": build_scenario("main"),                          # MainScreen, new data once a second
+    "progress": build_scenario("progress"),                  # MainScreen with the long-press indicator
+    "secondary": build_scenario("secondary"),                # GIF screen, drawn as RGBA
+    "secondary_native": build_scenario("secondary_native"),  # GIF screen, cached RGB565 frames
+}
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_scenario(factory: Callable[[str], Callable[[], None]], frames: int) -> Dict[str, float]:
+    """Times `frames` frames of a scenario, then measures allocations on a separate traced run."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        step = factory(cache_dir)
+        step()  # warm caches (glyphs, static layers, sprites) outside the measurement
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame_start = time.perf_counter()
+            step()
+            latencies.append(time.perf_counter() - frame_start)
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        step = factory(cache_dir)
+        step()
+        tracemalloc.start()
+        peaks = []
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in range(TRACED_FRAMES):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            step()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+    return {
+        "frames": frames,
+        "fps": frames / elapsed,
+        "latency_ms_p50": percentile(latencies, 0.50) * 1000,
+        "latency_ms_p90": percentile(latencies, 0.90) * 1000,
+        "latency_ms_p99": percentile(latencies, 0.99) * 1000,
+        "latency_ms_max": latencies[-1] * 1000,
+        "alloc_bytes_per_frame": sum(peaks) / len(peaks),
+        "alloc_bytes_per_frame_max": max(peaks),
+        "retained_bytes_per_frame": retained / TRACED_FRAMES,
+    }
+
+def esp32_converter(byteorder: str) -> ESP32WiFiDisplay:
+    """An ESP32WiFiDisplay with only the state _convert_to_rgb565 needs (no connection is made)."""
+    display = ESP32WiFiDisplay.__new__(ESP32WiFiDisplay)
+    Device.__init__(display, *SIZE)
+    display.device_endianness = byteorder
+    display._converter = None
+    display._frame_buffer = None
+    return display
+
+def time_call(func: Callable[[], object], iterations: int) -> float:
+    """Mean time of one call in microseconds."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def run_conversions(iterations: int) -> Dict[str, float]:
+    """Times the RGB565 conversion each driver performs per frame, and the pipeline they used to share."""
+    rng = np.random.default_rng(0)
+    rgba = Image.fromarray(rng.integers(0, 256, (SIZE[1], SIZE[0], 4), dtype=np.uint8), 'RGBA')
+
+    # ILI9163.display (the driver needs SPI/GPIO, so its conversion call is reproduced here)
+    ili = RGB565Converter(SIZE[0], SIZE[1], BIG_ENDIAN)
+    back_buffer = ili.new_buffer()
+    esp32 = esp32_converter(LITTLE_ENDIAN)
+    return {
+        "ili9163_display_us": time_call(lambda: ili.convert(rgba, out=back_buffer), iterations),
+        "esp32_convert_us": time_call(lambda: esp32._convert_to_rgb565(rgba), iterations),
+        "legacy_convert_us": time_call(lambda: legacy_convert(rgba, BIG_ENDIAN), iterations),
+    }
+
+def git_revision() -> Optional[str]:
+    """Current commit, if the tree is a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: Dict, previous: Dict) -> None:
+    """Prints every numeric metric next to its value in an earlier results file."""
+    print(f"\nChange since {previous.get('revision') or 'previous run'}:")
+    sections = [(f"scenarios.{name}", values, previous.get("scenarios", {}).get(name, {}))
+                for name, values in results["scenarios"].items()]
+    sections.append(("conversions", results["conversions"], previous.get("conversions", {})))
+    for section, values, old_values in sections:
+        for key, value in values.items():
+            old = old_values.get(key)
+            if isinstance(old, (int, float)) and old:
+                print(f"  {section}.{key}: {old:.3f} -> {value:.3f} ({(value - old) / old * 100:+.1f}%)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless rendering benchmarks")
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help='Frames rendered per scenario')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable; default: all)')
+    parser.add_argument('--output', type=str, default=DEFAULT_OUTPUT, help='Where to write the JSON results')
+    parser.add_argument('--compare', type=str, metavar='PATH', help='Earlier results to compare against')
+    args = parser.parse_args()
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scenarios": {},
+    }
+    for name in args.scenario or SCENARIOS:
+        stats = run_scenario(SCENARIOS[name], args.frames)
+        results["scenarios"][name] = stats
+        print(f"{name:17} {stats['fps']:8.1f} fps  p50 {stats['latency_ms_p50']:6.2f} ms  "
+              f"p99 {stats['latency_ms_p99']:6.2f} ms  {stats['alloc_bytes_per_frame'] / 1024:7.1f} KiB/frame")
+
+    results["conversions"] = run_conversions(max(100, args.frames))
+    for key, value in results["conversions"].items():
+        print(f"{key:22} {value:8.1f} us")
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results["peak_rss_kb"] = peak_rss / 1024 if sys.platform == "darwin" else peak_rss
+    print(f"peak RSS {results['peak_rss_kb'] / 1024:.1f} MiB")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import pytest
+
+class FakeClock:
+    """A monotonic clock the test moves by hand through `now`."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    """A fresh FakeClock starting at 0."""
+    return FakeClock()
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from metrics.aggregator import HostAggregator, parse_address
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def start_agent(name):
+    """Launch `stats.py --agent` on a free local port and return (process, 'host:port')."""
+    process = subprocess.Popen(
+        [sys.executable, "stats.py", "--agent", "--agent-bind", "127.0.0.1", "--agent-port", "0", "--agent-name", name],
+        cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    for line in process.stdout:
+        if "listening on" in line:
+            return process, line.rsplit(" ", 1)[1].strip()
+    raise RuntimeError(f"Agent {name} exited before listening")
+
+def stop_agents(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait(timeout=5)
+
+def silent_server():
+    """A listener that accepts connections but never answers, like a hung host."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    return server, f"127.0.0.1:{server.getsockname()[1]}"
+
+def test_parse_address():
+    assert parse_address("node1") == ("node1", 7007)
+    assert parse_address("10.0.0.5:9000") == ("10.0.0.5", 9000)
+    assert parse_address("[::1]:9000") == ("::1", 9000)
+    assert parse_address("[::1]") == ("::1", 7007)
+
+def test_polls_several_agents():
+    agents = [start_agent(f"node{i}") for i in range(3)]
+    aggregator = HostAggregator([address for _, address in agents], timeout=2.0)
+    try:
+        statuses = aggregator.poll_all()
+        assert [s.name for s in statuses] == ["node0", "node1", "node2"]
+        assert all(s.online and "cpu" in s.samples for s in statuses)
+    finally:
+        aggregator.stop()
+        stop_agents([p for p, _ in agents])
+
+def test_connections_are_reused():
+    process, address = start_agent("pooled")
+    aggregator = HostAggregator([address], timeout=2.0)
+    try:
+        aggregator.poll_all()
+        connection = aggregator._pool[parse_address(address)]
+        sock = connection._sock
+        assert aggregator.poll_all()[0].online
+        assert connection._sock is sock
+    finally:
+        aggregator.stop()
+        stop_agents([process])
+
+def test_slow_host_does_not_delay_others():
+    process, address = start_agent("fast")
+    server, hung = silent_server()
+    aggregator = HostAggregator([hung, address], timeout=0.5)
+    try:
+        started = time.monotonic()
+        futures = aggregator.poll_once()
+        futures[1].result(timeout=2.0)
+        fast_done = time.monotonic() - started
+        slow, fast = aggregator.statuses()
+        assert fast.online and fast.name == "fast"
+        assert fast_done < 0.5
+        # The hung host is still being polled, so only the fast one is polled again
+        assert len(aggregator.poll_once()) == 1
+
+        futures[0].result(timeout=2.0)
+        slow = aggregator.statuses()[0]
+        assert not slow.online and slow.error
+    finally:
+        aggregator.stop()
+        server.close()
+        stop_agents([process])
+
+def test_host_going_offline_keeps_stale_values():
+    process, address = start_agent("flaky")
+    aggregator = HostAggregator([address], timeout=0.5)
+    try:
+        assert aggregator.poll_all()[0].online
+        stop_agents([process])
+        status = aggregator.poll_all()[0]
+        assert not status.online
+        assert status.name == "flaky"
+        assert status.samples["cpu"].stale
+    finally:
+        aggregator.stop()
+
+def test_stop_releases_queued_polls_and_later_polls_are_ignored():
+    servers = [silent_server() for _ in range(2)]
+    try:
+        aggregator = HostAggregator([address for _, address in servers], timeout=0.5)
+        aggregator._executor.shutdown()
+        aggregator._executor = ThreadPoolExecutor(max_workers=1)  # the second host's poll has to queue
+        running, queued = aggregator.poll_once()
+        aggregator.stop()
+        assert queued.cancelled()
+        assert aggregator.addresses[1] not in aggregator._in_flight
+        assert aggregator.poll_once() == []  # no RuntimeError from the shut-down pool
+        wait([running])
+        assert not aggregator._in_flight
+    finally:
+        for server, _ in servers:
+            server.close()
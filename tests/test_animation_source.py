@@ -0,0 +1,56 @@
+from PIL import Image
+import os
+import tempfile
+import time
+
+from utils.animation_source import AnimationSource
+
+SIZE = (16, 16)
+FRAME_COUNT = 8
+
+def make_animation(directory: str, extension: str) -> str:
+    """Writes an animation whose frames differ in color, with durations 40, 80, 40, 80... ms."""
+    frames = [Image.new('RGBA', (8, 8), (i * 30, 255 - i * 30, 60, 255)) for i in range(FRAME_COUNT)]
+    path = os.path.join(directory, f"anim.{extension}")
+    durations = [40 if i % 2 == 0 else 80 for i in range(FRAME_COUNT)]
+    options = {"lossless": True} if extension == "webp" else {}
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations, loop=0, **options)
+    return path
+
+def test_formats_share_one_interface():
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in ("gif", "png", "webp"):
+            source = AnimationSource(make_animation(tmp, extension), SIZE, prefetch=0)
+            assert len(source) == FRAME_COUNT
+            assert source.durations[:2] == [0.04, 0.08]
+            for index in (3, 1, 7):  # random access, including backwards
+                frame = source.frame(index)
+                assert frame.size == SIZE and frame.mode == 'RGBA'
+                assert frame.getpixel((0, 0))[:2] == (index * 30, 255 - index * 30)
+            source.close()
+
+def test_cache_stays_within_memory_budget():
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_bytes = SIZE[0] * SIZE[1] * 4
+        source = AnimationSource(make_animation(tmp, "png"), SIZE, memory_budget=3 * frame_bytes, prefetch=0)
+        for index in range(FRAME_COUNT):
+            source.frame(index)
+        assert source.capacity == 3
+        assert source.cached() == [5, 6, 7]
+        source.frame(5)
+        assert source.cached() == [6, 7, 5]
+        assert (source.hits, source.misses) == (1, FRAME_COUNT)
+        source.close()
+
+def test_prefetch_decodes_ahead_of_playback():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = AnimationSource(make_animation(tmp, "gif"), SIZE, prefetch=2)
+        source.frame(FRAME_COUNT - 1)
+        deadline = time.monotonic() + 2.0
+        while len(source.cached()) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert set(source.cached()) == {FRAME_COUNT - 1, 0, 1}  # wraps around to the start
+        source.frame(0)
+        assert source.hits == 1
+        source.close()
+        assert not source.running
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from metrics.collector import MetricCollector, MetricsSnapshot
+from metrics.history import MetricHistory
+from metrics.sample import MetricSample
+
+class ScriptedGatherer:
+    """Stands in for DataGatherer: serves warm values, then one batch of samples per refresh."""
+
+    def __init__(self, warm: Dict[str, MetricSample], batches: List[Dict[str, MetricSample]]) -> None:
+        self.warm = warm
+        self.batches = list(batches)
+        self.refreshed = threading.Event()
+        self.started = self.stopped = False
+
+    def cached_values(self) -> Dict[str, MetricSample]:
+        return dict(self.warm)
+
+    def refresh_due(self) -> Dict[str, MetricSample]:
+        self.refreshed.set()
+        return self.batches.pop(0) if self.batches else {}
+
+    def next_due(self) -> float:
+        return time.monotonic() + 0.01
+
+    def start(self) -> None:
+        self.started = True
+
+    def stop(self) -> None:
+        self.stopped = True
+
+def test_constructor_publishes_warm_values():
+    gatherer = ScriptedGatherer({'public_ip': MetricSample("203.0.113.7", stale=True)}, [])
+    collector = MetricCollector(gatherer)
+    assert collector.latest.generation == 1
+    assert collector.latest.data == {'public_ip': "203.0.113.7"}
+    assert collector.latest.samples['public_ip'].stale
+    assert MetricCollector(ScriptedGatherer({}, [])).latest.generation == 0  # nothing to warm
+
+def test_collect_once_publishes_a_new_immutable_snapshot():
+    gatherer = ScriptedGatherer({'disk': MetricSample("42%", 0.42)}, [{'cpu': MetricSample("15.00%", 0.15)}, {}])
+    collector = MetricCollector(gatherer)
+    warm = collector.latest
+    snapshot = collector.collect_once()
+    assert snapshot is collector.latest and snapshot is not warm
+    assert snapshot.generation == warm.generation + 1
+    assert snapshot.data == {'disk': "42%", 'cpu': "15.00%"}
+    assert warm.data == {'disk': "42%"}  # earlier snapshots never change
+    try:
+        snapshot.samples['cpu'] = MetricSample("99.00%", 0.99)
+        assert False, "snapshot samples must be read-only"
+    except TypeError:
+        pass
+    assert collector.collect_once() is snapshot  # nothing was due
+
+def test_listeners_and_history_see_every_publish():
+    history = MetricHistory(capacity=10, keys=("cpu",), sample_interval=0.0)
+    batches = [{'cpu': MetricSample("10.00%", 0.10)}, {'cpu': MetricSample("20.00%", 0.20)}]
+    collector = MetricCollector(ScriptedGatherer({}, batches), history=history)
+    seen: List[MetricsSnapshot] = []
+    collector.listeners.append(seen.append)
+    collector.collect_once()
+    collector.collect_once()
+    assert [s.generation for s in seen] == [1, 2]
+    assert np.allclose(history.series('cpu', 2), [0.10, 0.20])
+
+def test_stop_joins_the_thread():
+    gatherer = ScriptedGatherer({}, [{'cpu': MetricSample("10.00%", 0.10)}])
+    collector = MetricCollector(gatherer)
+    collector.start()
+    assert collector.running and gatherer.started
+    assert gatherer.refreshed.wait(1.0)
+    thread = collector._thread
+    collector.stop()
+    assert not collector.running and not thread.is_alive()
+    assert gatherer.stopped
+    assert collector.latest.data == {'cpu': "10.00%"}
+
+def test_stop_leaves_the_gatherer_to_a_thread_still_reading():
+    class BlockingGatherer(ScriptedGatherer):
+        def __init__(self) -> None:
+            super().__init__({}, [])
+            self.release = threading.Event()
+
+        def refresh_due(self) -> Dict[str, MetricSample]:
+            self.refreshed.set()
+            self.release.wait(5.0)
+            return {}
+
+    gatherer = BlockingGatherer()
+    collector = MetricCollector(gatherer)
+    collector.JOIN_TIMEOUT = 0.05
+    collector.start()
+    assert gatherer.refreshed.wait(1.0)
+    thread = collector._thread
+    collector.stop()
+    assert thread.is_alive() and not gatherer.stopped  # never torn down under a read in progress
+    gatherer.release.set()
+    thread.join(1.0)
+    assert not thread.is_alive() and gatherer.stopped
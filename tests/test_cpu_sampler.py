@@ -0,0 +1,54 @@
+from typing import Dict, List
+
+from metrics.cpu_sampler import CpuSampler
+from metrics.procfs_backend import ProcfsBackend
+
+class ScriptedBackend(ProcfsBackend):
+    """Serves a fixed sequence of /proc/stat cpu tables."""
+
+    def __init__(self, tables: List[Dict[str, List[int]]]) -> None:
+        super().__init__()
+        self.tables = list(tables)
+
+    def read_cpu_table(self) -> Dict[str, List[int]]:
+        return self.tables.pop(0)
+
+#               user nice system idle iowait irq softirq steal guest guest_nice
+BOOT = [1000, 0, 500, 8000, 300, 0, 200, 0, 0, 0]
+
+def advance(row: List[int], *deltas: int) -> List[int]:
+    return [value + delta for value, delta in zip(row, list(deltas) + [0] * len(row))]
+
+def test_usage_comes_from_deltas_and_text_agrees_with_value():
+    # 1405 busy and 8595 idle jiffies: the shell formula truncates idle to 85%, so 15% busy
+    second = advance(BOOT, 1000, 5, 300, 8595, 50, 0, 50, 0)
+    sampler = CpuSampler(ScriptedBackend([{"cpu": BOOT, "cpu0": BOOT}, {"cpu": second, "cpu0": second}]))
+    first = sampler.sample()  # average since boot
+    assert first.text == "20.00%" and first.total == 0.20
+    usage = sampler.sample()
+    assert usage.text == "15.00%" and usage.total == 0.15
+    assert usage.iowait == 50 / 10000
+    assert abs(usage.per_core[0] - 0.1405) < 1e-9
+
+def test_guest_time_is_not_counted_twice():
+    second = advance(BOOT, 500, 0, 0, 500, 0, 0, 0, 0, 400, 0)  # guest is already part of user
+    sampler = CpuSampler(ScriptedBackend([{"cpu": BOOT}, {"cpu": second}]))
+    sampler.sample()
+    assert sampler.sample().text == "50.00%"
+
+def test_counter_reset_reports_usage_since_the_reset():
+    reset = [30, 0, 10, 60, 0, 0, 0, 0, 0, 0]  # counters restarted below the previous sample
+    sampler = CpuSampler(ScriptedBackend([{"cpu": BOOT}, {"cpu": reset}]))
+    sampler.sample()
+    usage = sampler.sample()
+    assert usage.text == "40.00%" and usage.total == 0.40
+
+def test_short_rows_are_padded_and_idle_intervals_keep_the_last_value():
+    old_kernel = [100, 0, 100, 800]  # user nice system idle only
+    later = [200, 0, 100, 1700]
+    sampler = CpuSampler(ScriptedBackend([{"cpu": old_kernel}, {"cpu": later}, {"cpu": later}]))
+    sampler.sample()
+    usage = sampler.sample()
+    assert usage.text == "10.00%" and usage.steal == 0.0
+    assert sampler.sample() is usage  # no jiffies elapsed
+    assert ProcfsBackend.cpu_deltas([1, 2], [3, 4, 5]) == [2, 2, 5, 0, 0, 0, 0, 0]
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+from data_gatherer import DataGatherer
+from metrics.cpu_sampler import CpuSampler
+from metrics.procfs_backend import ProcfsBackend
+from metrics.sample import MetricSample
+from metrics.scheduler import MetricScheduler
+from metrics.throughput import DiskThroughput, NetworkThroughput, RateTracker
+
+class ScriptedBackend(ProcfsBackend):
+    """Serves counters that grow by a fixed step on every read, without touching procfs."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def _next(self) -> int:
+        self.reads += 1
+        return self.reads
+
+    def read_cpu_table(self) -> Dict[str, List[int]]:
+        n = self._next()
+        row = [100 * n, 0, 50 * n, 850 * n, 0, 0, 0, 0, 0, 0]  # 15% busy between any two reads
+        return {"cpu": row, "cpu0": row}
+
+    def mem_used_ratio(self) -> float:
+        return 0.4 + self._next() / 1000
+
+    def disk_used_percent(self, path: str = "/") -> int:
+        return 40 + self._next()
+
+    def read_temperature(self) -> float:
+        return 50.0 + self._next() / 4
+
+    def read_uptime_seconds(self) -> float:
+        return 90000.0 + 60 * self._next()
+
+    def local_ip(self) -> str:
+        return f"192.168.1.{self._next()}"
+
+    def read_net_dev(self) -> Dict[str, Tuple[int, int]]:
+        n = self._next()
+        return {"eth0": (1000 * n, 500 * n)}
+
+    def read_diskstats(self) -> Dict[str, Tuple[int, int, int, int]]:
+        n = self._next()
+        return {"mmcblk0": (n, 8 * n, n, 4 * n)}
+
+class CountingGatherer(DataGatherer):
+    """A DataGatherer on a ScriptedBackend that counts how often each metric reader runs."""
+
+    def __init__(self, clock: Callable[[], float], cache_path: str) -> None:
+        self.read_counts = Counter()
+        super().__init__(is_raspberry=True, cache_path=cache_path)
+        self.backend.close()
+        self.backend = ScriptedBackend()
+        self.cpu_sampler = CpuSampler(self.backend)
+        self.net_throughput = NetworkThroughput(self.backend)
+        self.net_throughput.tracker = RateTracker(clock)
+        self.disk_throughput = DiskThroughput(self.backend)
+        self.disk_throughput.tracker = RateTracker(clock)
+        self.public_ip_resolver.seed("203.0.113.7", time.time())
+        self.scheduler = MetricScheduler(self._metric_specs(), clock)
+
+    def _readers(self) -> Dict[str, Callable[[], MetricSample]]:
+        def counted(key: str, read: Callable[[], MetricSample]) -> Callable[[], MetricSample]:
+            def wrapper() -> MetricSample:
+                self.read_counts[key] += 1
+                return read()
+            return wrapper
+        return {key: counted(key, read) for key, read in super()._readers().items()}
+
+def test_snapshot_reads_every_due_metric_exactly_once(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        gatherer = CountingGatherer(fake_clock, os.path.join(tmp, "metrics.json"))
+        snapshot = gatherer.snapshot()
+        assert set(snapshot) == set(DataGatherer.METRIC_SCHEDULE)
+        assert gatherer.read_counts == Counter(list(DataGatherer.METRIC_SCHEDULE))
+        assert snapshot['public_ip'].text == "203.0.113.7"
+
+def test_metrics_that_are_not_due_come_from_the_cache(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        gatherer = CountingGatherer(fake_clock, os.path.join(tmp, "metrics.json"))
+        first = gatherer.snapshot()
+        gatherer.read_counts.clear()
+        fake_clock.now = 1.0
+        updated = gatherer.refresh_due()
+        assert set(updated) == {'cpu', 'time'} == set(gatherer.read_counts)
+        second = gatherer.cached_values()
+        for key in set(first) - set(updated):
+            assert second[key] is first[key]
+        assert second['cpu'] is updated['cpu']
+
+        fake_clock.now = 2.0
+        gatherer.read_counts.clear()
+        gatherer.snapshot()
+        assert set(gatherer.read_counts) == {'cpu', 'time', 'mem', 'temp', 'net', 'diskio'}
+        assert max(gatherer.read_counts.values()) == 1
+
+def test_values_agree_with_their_text(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        gatherer = CountingGatherer(fake_clock, os.path.join(tmp, "metrics.json"))
+        gatherer.snapshot()
+        fake_clock.now = 2.0
+        samples = gatherer.snapshot()
+        assert samples['cpu'].text == "15.00%" and samples['cpu'].value == 0.15
+        for key, precision in (('cpu', 0.0), ('mem', 0.0005), ('disk', 0.0), ('temp', 0.05)):
+            sample = samples[key]
+            assert abs(gatherer.parse_metric_value(key, sample.text) - sample.value) <= precision + 1e-9
+        assert samples['uptime'].text == ProcfsBackend.format_uptime(samples['uptime'].value)
+        for key in ('net', 'diskio'):
+            rates = {name: rate for name, rate in samples[key].detail.items() if not name.endswith('.iops')}
+            assert samples[key].value > 0 and abs(sum(rates.values()) - samples[key].value) < 1e-6
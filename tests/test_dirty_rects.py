@@ -0,0 +1,34 @@
+import numpy as np
+
+from utils.dirty_rects import find_dirty_rects, transfer_cost
+
+def apply(panel: np.ndarray, frame: np.ndarray, rects) -> None:
+    for x0, y0, x1, y1 in rects:
+        panel[y0:y1 + 1, x0:x1 + 1] = frame[y0:y1 + 1, x0:x1 + 1]
+
+def test_identical_frames_have_no_rects():
+    frame = np.zeros((128, 128), dtype='>u2')
+    assert find_dirty_rects(frame, frame.copy()) == []
+
+def test_nearby_bands_merge_and_distant_ones_do_not():
+    previous = np.zeros((128, 128), dtype='>u2')
+    current = previous.copy()
+    current[10:14, 20:30] = 0xFFFF   # two lines of text a few rows apart
+    current[18:22, 25:60] = 0xF800
+    current[100:104, 5:9] = 0x07E0   # far below
+    rects = find_dirty_rects(previous, current, merge_gap=6)
+    assert rects == [(20, 10, 59, 21), (5, 100, 8, 103)]
+    assert transfer_cost(rects) < transfer_cost([(0, 0, 127, 127)])
+
+def test_rects_reproduce_random_changes():
+    rng = np.random.default_rng(1)
+    previous = rng.integers(0, 65536, (128, 128)).astype('>u2')
+    for _ in range(20):
+        current = previous.copy()
+        for _ in range(rng.integers(1, 6)):
+            y, x = rng.integers(0, 120, 2)
+            current[y:y + rng.integers(1, 8), x:x + rng.integers(1, 8)] = rng.integers(0, 65536)
+        panel = previous.copy()
+        apply(panel, current, find_dirty_rects(previous, current))
+        assert np.array_equal(panel, current)
+        previous = current
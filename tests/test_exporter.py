@@ -0,0 +1,66 @@
+import urllib.error
+import urllib.request
+
+from data_gatherer import DataGatherer
+from metrics.collector import MetricCollector
+from metrics.exporter import CONTENT_TYPE, MetricsExporter, escape_label, format_value
+from metrics.history import MetricHistory
+
+def make_collector():
+    collector = MetricCollector(DataGatherer(is_raspberry=False), history=MetricHistory())
+    collector.collect_once()
+    return collector
+
+def scrape(exporter, path="/metrics"):
+    with urllib.request.urlopen(f"http://127.0.0.1:{exporter.address[1]}{path}", timeout=2) as response:
+        return response.headers["Content-Type"], response.read().decode()
+
+def test_format_helpers():
+    assert format_value(float("nan")) == "NaN"
+    assert format_value(float("inf")) == "+Inf"
+    assert format_value(0.5) == "0.5"
+    assert escape_label('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
+
+def test_exposition_body():
+    exporter = MetricsExporter(make_collector(), "127.0.0.1", 0)
+    exporter.start()
+    try:
+        content_type, body = scrape(exporter)
+        assert content_type == CONTENT_TYPE
+        assert body.endswith("# EOF\n")
+        assert "# TYPE lcdstats_cpu_usage_ratio gauge" in body
+        assert 'lcdstats_network_receive_bytes_per_second{interface="eth0"}' in body
+        assert 'lcdstats_history_max{metric="cpu",window="600s"}' in body
+        assert "lcdstats_host_info{" in body
+    finally:
+        exporter.stop()
+
+def test_unknown_path_is_404():
+    exporter = MetricsExporter(make_collector(), "127.0.0.1", 0)
+    exporter.start()
+    try:
+        scrape(exporter, "/")
+        assert False, "expected HTTP 404"
+    except urllib.error.HTTPError as e:
+        assert e.code == 404
+    finally:
+        exporter.stop()
+
+def test_scrapes_never_sample_and_reuse_the_body():
+    collector = make_collector()
+    calls = []
+    refresh_due = collector.data_gatherer.refresh_due
+    collector.data_gatherer.refresh_due = lambda: calls.append(1) or refresh_due()
+    exporter = MetricsExporter(collector, "127.0.0.1", 0)
+    exporter.start()
+    try:
+        first = exporter.body()
+        for _ in range(5):
+            scrape(exporter)
+        assert exporter.body() is first
+        assert calls == []
+
+        collector._publish({})
+        assert exporter.body() is not first
+    finally:
+        exporter.stop()
@@ -0,0 +1,92 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from devices.esp32_wifi_display import ESP32WiFiDisplay, KEEPALIVE_INTERVAL
+from input_handler import InputHandler
+from screen_manager import ScreenManager
+from utils.frame_dedup import FrameDeduplicator
+from views.screen import Screen
+
+class LoopbackESP32(ESP32WiFiDisplay):
+    """An ESP32 display that is "connected" without a socket and records every frame it sends."""
+
+    def __init__(self, **kwargs) -> None:
+        self.sent_at = []
+        super().__init__("127.0.0.1", **kwargs)
+
+    def _connect(self) -> bool:
+        self.connected = self.handshake_done = True
+        self.device_endianness = "little"
+        return True
+
+    def _send_display_data(self, data, screen_id: str) -> bool:
+        self.sent_at.append(self._dedup.clock())
+        return True
+
+def frame(value: int) -> np.ndarray:
+    return np.full((128, 128), value, dtype='>u2')
+
+def test_identical_frames_are_skipped_until_one_changes():
+    dedup = FrameDeduplicator()
+    buffer = frame(0x1234)
+    assert not dedup.is_duplicate(buffer)
+    dedup.mark_sent(buffer)
+    buffer[5, 7] = 0  # the deduplicator keeps its own copy, so reusing the buffer is safe
+    assert not dedup.is_duplicate(buffer)
+    dedup.mark_sent(buffer)
+    assert dedup.is_duplicate(buffer.copy())
+    stats = dedup.stats()
+    assert (stats.sent, stats.skipped, stats.forced) == (2, 1, 0)
+
+def test_refresh_interval_forces_an_unchanged_frame_through(fake_clock):
+    clock = fake_clock
+    dedup = FrameDeduplicator(refresh_interval=5.0, clock=clock)
+    dedup.mark_sent(frame(1))
+    clock.now = 4.9
+    assert dedup.is_duplicate(frame(1))
+    clock.now = 5.0
+    assert not dedup.is_duplicate(frame(1))
+    dedup.mark_sent(frame(1))
+    assert dedup.is_duplicate(frame(1))
+    assert dedup.stats().forced == 1
+
+def test_invalidate_and_format_changes_resend():
+    dedup = FrameDeduplicator()
+    dedup.mark_sent(frame(1))
+    assert not dedup.is_duplicate(frame(1).astype('<u2'))
+    dedup.invalidate()
+    assert not dedup.is_duplicate(frame(1))
+    assert "0 unchanged skipped" in dedup.stats().summary()
+
+def test_esp32_resends_a_static_frame_before_the_firmware_times_out(fake_clock):
+    firmware_timeout = 30.0  # CONNECTION_TIMEOUT in esp32_display_server/config.h
+    for refresh_interval in (None, 60.0, 5.0):
+        display = LoopbackESP32(refresh_interval=refresh_interval)
+        clock = fake_clock
+        clock.now = 0.0
+        display._dedup.clock = clock
+        static = frame(0x1234).astype('<u2')
+        while clock.now < 3 * firmware_timeout:
+            assert display.display_rgb565(static)
+            clock.now += 1.0
+        gaps = [b - a for a, b in zip(display.sent_at, display.sent_at[1:])]
+        assert display.sent_at[0] == 0.0 and gaps
+        assert max(gaps) <= min(refresh_interval or KEEPALIVE_INTERVAL, KEEPALIVE_INTERVAL) < firmware_timeout
+
+def test_esp32_keeps_getting_frames_while_the_display_is_off(fake_clock):
+    firmware_timeout = 30.0
+    clock = fake_clock
+    display = LoopbackESP32()
+    display._dedup.clock = clock
+    manager = ScreenManager([Screen(False, 128, 128)], InputHandler(is_raspberry=False, use_gpio=False), clock=clock)
+    manager.max_frame_interval = display.max_frame_interval
+    manager.toggle_device_state()
+    image = Image.new('RGBA', (128, 128))
+    while clock.now < 3 * firmware_timeout:
+        clock.now = max(clock.now, manager.next_frame_time(clock.now))  # the render loop sleeps until the deadline
+        manager.draw(ImageDraw.Draw(image), image)
+        display.display(image)
+        clock.now += 0.1
+    gaps = [b - a for a, b in zip(display.sent_at, display.sent_at[1:])]
+    assert not manager.device_on and display.sent_at[0] <= KEEPALIVE_INTERVAL and gaps
+    assert max(gaps) <= 1.5 * KEEPALIVE_INTERVAL < firmware_timeout
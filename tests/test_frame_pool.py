@@ -0,0 +1,30 @@
+from utils.frame_pool import FramePool
+
+def test_buffers_are_reused_round_robin():
+    pool = FramePool((16, 8), count=2)
+    first, draw = pool.acquire()
+    second, _ = pool.acquire()
+    third, third_draw = pool.acquire()
+    assert first is not second
+    assert third is first and third_draw is draw
+
+def test_acquired_frames_are_cleared_in_place():
+    pool = FramePool((16, 8), count=1)
+    frame, draw = pool.acquire()
+    draw.rectangle((0, 0, 15, 7), fill=(255, 0, 0, 255))
+    again, _ = pool.acquire()
+    assert again is frame
+    assert again.getbbox() is None
+    assert again.getpixel((3, 3)) == (0, 0, 0, 0)
+
+def test_held_buffers_are_skipped_until_released():
+    pool = FramePool((16, 8), count=3)
+    first, _ = pool.acquire()
+    pool.hold(first)
+    second, _ = pool.acquire()
+    third, _ = pool.acquire()
+    fourth, _ = pool.acquire()
+    assert fourth is second  # the held first buffer is passed over
+    pool.release(first)
+    assert pool.acquire()[0] is third
+    assert pool.acquire()[0] is first
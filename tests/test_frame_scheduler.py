@@ -0,0 +1,43 @@
+import threading
+import time
+
+from utils.frame_scheduler import FrameScheduler
+
+def test_continuous_frames_are_paced_without_drift():
+    scheduler = FrameScheduler(0.02)
+    start = time.monotonic()
+    for _ in range(25):
+        scheduler.wait(time.monotonic())
+        time.sleep(0.01)  # frame work shorter than the interval must not add up
+    elapsed = time.monotonic() - start
+    assert 0.45 <= elapsed < 0.6
+
+def test_late_frame_does_not_cause_a_burst():
+    scheduler = FrameScheduler(0.02)
+    scheduler.wait(time.monotonic())
+    time.sleep(0.1)  # a frame that ran five intervals long
+    first = scheduler.wait(time.monotonic())
+    second = scheduler.wait(time.monotonic())
+    assert second - first >= 0.019
+
+def test_sleeps_until_deadline():
+    scheduler = FrameScheduler(0.01)
+    scheduler.wait(time.monotonic())
+    deadline = time.monotonic() + 0.15
+    assert scheduler.wait(deadline) >= deadline
+
+def test_wake_ends_an_idle_wait():
+    scheduler = FrameScheduler(0.01)
+    scheduler.wait(time.monotonic())
+    threading.Timer(0.05, scheduler.wake).start()
+    start = time.monotonic()
+    scheduler.wait(float("inf"))
+    assert time.monotonic() - start < 0.5
+    assert scheduler.idle_time > 0.0
+
+def test_wake_respects_frame_interval():
+    scheduler = FrameScheduler(0.1)
+    first = scheduler.wait(time.monotonic())
+    scheduler.wake()
+    second = scheduler.wait(float("inf"))
+    assert second - first >= 0.099
@@ -0,0 +1,51 @@
+from PIL import Image, ImageDraw
+import json
+import os
+import tempfile
+
+from utils.frame_timing import FrameTimer, StageHistogram
+
+def test_histogram_percentiles_use_bucket_edges():
+    histogram = StageHistogram()
+    for _ in range(90):
+        histogram.record(0.001)
+    for _ in range(10):
+        histogram.record(0.1)
+    assert 0.001 <= histogram.percentile(0.5) < 0.0015
+    assert 0.1 <= histogram.percentile(0.99) <= 0.1 + 1e-12  # capped at the largest sample
+    assert histogram.summary()["count"] == 100
+
+def test_disabled_timer_records_nothing():
+    timer = FrameTimer()
+    start = timer.start()
+    timer.record("draw", start)
+    timer.frame_done(start)
+    assert start == 0.0 and timer.frames == 0
+    assert all(h.count == 0 for h in timer.histograms.values())
+
+def test_stages_are_exported_as_jsonl_windows(fake_clock):
+    clock = fake_clock
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "timing.jsonl")
+        timer = FrameTimer(export_path=path, export_interval=1.0, clock=clock)
+        for _ in range(40):
+            start = timer.start()
+            clock.now += 0.002
+            timer.record("draw", start)
+            clock.now += 0.03
+            timer.record("push", start + 0.002)
+            timer.frame_done(start)
+        assert timer.slowest_stage()[0] == "push"
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 1
+        stages = lines[0]["stages"]
+        assert stages["draw"]["count"] == stages["frame"]["count"] == lines[0]["frames"]
+        assert 1.9 < stages["draw"]["mean_ms"] < 2.1
+        assert timer.frames < 40  # a new window started after the export
+
+def test_overlay_draws_a_strip_at_the_top():
+    timer = FrameTimer(overlay=True)
+    image = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
+    timer.draw_overlay(ImageDraw.Draw(image), 128)
+    assert image.getbbox() == (0, 0, 128, FrameTimer.OVERLAY_HEIGHT)
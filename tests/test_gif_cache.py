@@ -0,0 +1,77 @@
+from PIL import Image
+import json
+import numpy as np
+import os
+import tempfile
+
+from utils.gif_cache import GifFrameCache
+from utils.rgb565 import BIG_ENDIAN, LITTLE_ENDIAN, RGB565Converter
+
+SIZE = (24, 16)
+
+def make_gif(directory: str) -> str:
+    """Writes a small three-frame GIF with a transparent background and varying durations."""
+    frames = []
+    for i in range(3):
+        frame = Image.new('RGBA', (12, 8), (0, 0, 0, 0))
+        frame.paste((80 * i, 255, 40, 255), (i * 3, 2, i * 3 + 4, 6))
+        frames.append(frame)
+    path = os.path.join(directory, "anim.gif")
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=[50, 100, 150], loop=0, disposal=2)
+    return path
+
+def test_native_frames_match_converted_images():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = GifFrameCache(make_gif(tmp), SIZE, cache_dir=os.path.join(tmp, "cache"))
+        assert cache.durations == [0.05, 0.1, 0.15]
+        for byteorder in (LITTLE_ENDIAN, BIG_ENDIAN):
+            converter = RGB565Converter(SIZE[0], SIZE[1], byteorder)
+            frames = cache.native_frames(byteorder)
+            assert frames.shape == (3, SIZE[1], SIZE[0])
+            for index, frame in enumerate(frames):
+                assert np.array_equal(converter.convert(cache.image(index)), frame)
+
+def test_warm_cache_is_memory_mapped_without_decoding():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cache_dir = make_gif(tmp), os.path.join(tmp, "cache")
+        expected = GifFrameCache(path, SIZE, cache_dir=cache_dir).native_frames(BIG_ENDIAN).copy()
+
+        warm = GifFrameCache(path, SIZE, cache_dir=cache_dir)
+        frames = warm.native_frames(BIG_ENDIAN)
+        assert isinstance(frames, np.memmap)
+        assert warm._source is None  # nothing was decoded
+        assert warm.durations == [0.05, 0.1, 0.15]
+        assert np.array_equal(frames, expected)
+
+def test_cache_is_keyed_by_content_and_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cache_dir = make_gif(tmp), os.path.join(tmp, "cache")
+        GifFrameCache(path, SIZE, cache_dir=cache_dir).native_frames(LITTLE_ENDIAN)
+        GifFrameCache(path, (12, 8), cache_dir=cache_dir).native_frames(LITTLE_ENDIAN)
+        Image.new('RGBA', (12, 8), (255, 0, 0, 255)).save(path)  # same name, new content
+        changed = GifFrameCache(path, SIZE, cache_dir=cache_dir)
+        assert changed.durations == [0.1]
+        assert len([name for name in os.listdir(cache_dir) if name.endswith(".rgb565")]) == 2
+        assert changed.native_frames(LITTLE_ENDIAN).shape == (1, SIZE[1], SIZE[0])
+
+def test_cache_is_keyed_by_resample_filter():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cache_dir = make_gif(tmp), os.path.join(tmp, "cache")
+        nearest = GifFrameCache(path, SIZE, cache_dir=cache_dir).native_frames(LITTLE_ENDIAN).copy()
+        bilinear = GifFrameCache(path, SIZE, cache_dir=cache_dir, resample=Image.BILINEAR)
+        assert not np.array_equal(bilinear.native_frames(LITTLE_ENDIAN), nearest)
+        uncached = GifFrameCache(path, SIZE, cache_dir=os.path.join(tmp, "other"), resample=Image.BILINEAR)
+        assert np.array_equal(bilinear.native_frames(LITTLE_ENDIAN), uncached.native_frames(LITTLE_ENDIAN))
+
+def test_corrupt_index_is_rebuilt():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, cache_dir = make_gif(tmp), os.path.join(tmp, "cache")
+        index_path = GifFrameCache(path, SIZE, cache_dir=cache_dir)._cache_path(".json")
+        for corrupt in ('{"durations": ["slow", 0.1]}', '{"durations": [null]}', '{"durations": 0.1}',
+                        '[0.05, 0.1]', '{"durations": [', ''):
+            with open(index_path, "w", encoding="utf-8") as f:
+                f.write(corrupt)
+            cache = GifFrameCache(path, SIZE, cache_dir=cache_dir)
+            assert cache.durations == [0.05, 0.1, 0.15]
+            with open(index_path, "r", encoding="utf-8") as f:
+                assert json.load(f) == {"durations": [0.05, 0.1, 0.15]}
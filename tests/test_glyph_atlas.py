@@ -0,0 +1,34 @@
+from PIL import Image, ImageDraw
+
+from utils.glyph_atlas import get_atlas
+
+TEXT_SAMPLES = ["12.34%", "63.7°C", "1d 3h 20m", "22:50 GMT+2", "192.168.0.235", "--", "HOSTS 3/4"]
+ICON_SAMPLES = [chr(63339), chr(62776), chr(63426), chr(62171), chr(61931), chr(63382), chr(62034), chr(61463)]
+
+def render_both(atlas, text, color):
+    expected = Image.new("RGBA", (140, 30), (0, 0, 0, 0))
+    ImageDraw.Draw(expected).text((3, 4), text, font=atlas.font, fill=color)
+    actual = Image.new("RGBA", (140, 30), (0, 0, 0, 0))
+    atlas.draw_text(ImageDraw.Draw(actual), (3, 4), text, color)
+    return expected, actual
+
+def test_matches_freetype_rendering():
+    for path, size, samples in [("fonts/PixelOperator.ttf", 16, TEXT_SAMPLES),
+                                ("fonts/lineawesome-webfont.ttf", 18, ICON_SAMPLES)]:
+        atlas = get_atlas(path, size)
+        for text in samples:
+            for color in [(255, 255, 255, 255), (200, 100, 50, 60)]:
+                expected, actual = render_both(atlas, text, color)
+                assert expected.tobytes() == actual.tobytes(), f"{path}: {text!r}"
+
+def test_glyphs_are_rasterized_once():
+    atlas = get_atlas("fonts/PixelOperator.ttf", 16)
+    atlas.render("10:10")
+    glyph = atlas.glyph("1")
+    atlas.render("11.11%")
+    assert atlas.glyph("1") is glyph
+    assert get_atlas("fonts/PixelOperator.ttf", 16) is atlas
+
+def test_empty_text():
+    offset, mask = get_atlas("fonts/PixelOperator.ttf", 16).render("")
+    assert mask.getbbox() is None
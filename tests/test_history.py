@@ -0,0 +1,43 @@
+import numpy as np
+
+from metrics.history import RingBuffer
+
+def filled(capacity: int, count: int) -> RingBuffer:
+    buffer = RingBuffer(capacity)
+    for value in range(count):
+        buffer.append(value)
+    return buffer
+
+def test_latest_before_and_after_wraparound():
+    buffer = filled(5, 3)
+    assert buffer.latest(3).tolist() == [0, 1, 2]
+    for value in range(3, 12):
+        buffer.append(value)
+    assert buffer.count == 5
+    assert buffer.latest(5).tolist() == [7, 8, 9, 10, 11]
+    assert buffer.latest(2).tolist() == [10, 11]
+    assert buffer.last() == 11.0
+    buffer.append(12)  # write index now in the middle of the array
+    assert buffer.latest(4).tolist() == [9, 10, 11, 12]
+
+def test_latest_pads_with_nan_when_fewer_samples_are_stored():
+    result = filled(5, 2).latest(4)
+    assert np.isnan(result[:2]).all() and result[2:].tolist() == [0, 1]
+    empty = RingBuffer(5)
+    assert np.isnan(empty.latest(3)).all() and np.isnan(empty.last())
+    assert filled(5, 2).latest(0).size == 0
+
+def test_latest_beyond_capacity_like_the_history_screen():
+    buffer = filled(600, 1000)  # HistoryScreen asks for 640 points from 600 slots
+    result = buffer.latest(640)
+    assert np.isnan(result[:40]).all()
+    assert result[40:].tolist() == list(range(400, 1000))
+
+    partial = filled(600, 10).latest(640)
+    assert np.isnan(partial[:630]).all() and partial[630:].tolist() == list(range(10))
+
+def test_latest_fills_a_preallocated_array():
+    buffer = filled(4, 6)
+    out = np.full(6, -1.0, dtype=np.float32)
+    assert buffer.latest(6, out) is out
+    assert np.isnan(out[:2]).all() and out[2:].tolist() == [2, 3, 4, 5]
@@ -0,0 +1,86 @@
+import time
+from typing import Dict, List
+
+from PIL import Image, ImageDraw
+
+from metrics.collector import MetricCollector
+from metrics.sample import MetricSample
+from views.main_screen import MainScreen
+
+SIZE = (128, 128)
+
+BASE = {
+    'cpu': MetricSample("15.00%", 0.15), 'mem': MetricSample("41.2%", 0.412),
+    'disk': MetricSample("42%", 0.42), 'temp': MetricSample("55.5°C", 55.5),
+    'local_ip': MetricSample("192.168.0.10"), 'public_ip': MetricSample("203.0.113.7", stale=True),
+    'uptime': MetricSample("1d 3h 20m", 98400.0), 'time': MetricSample("12:34 GMT+2"),
+}
+
+class ScriptedGatherer:
+    """Stands in for DataGatherer: serves one batch of samples per refresh."""
+
+    def __init__(self, batches: List[Dict[str, MetricSample]]) -> None:
+        self.batches = list(batches)
+
+    def cached_values(self) -> Dict[str, MetricSample]:
+        return {}
+
+    def refresh_due(self) -> Dict[str, MetricSample]:
+        return self.batches.pop(0) if self.batches else {}
+
+    def next_due(self) -> float:
+        return time.monotonic() + MainScreen.DATA_UPDATE_INTERVAL
+
+def make_screen(*batches: Dict[str, MetricSample]) -> MainScreen:
+    return MainScreen(False, SIZE[0], SIZE[1], MetricCollector(ScriptedGatherer(list(batches))))
+
+def render(screen: MainScreen) -> Image.Image:
+    image = Image.new('RGBA', SIZE, (0, 0, 0, 0))
+    screen.draw(ImageDraw.Draw(image), image)
+    return image
+
+def uncached_render(screen: MainScreen) -> Image.Image:
+    """Draws the screen's current data straight with the fonts, without any of its caches."""
+    image = Image.new('RGBA', SIZE, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    colors = screen._calculate_colors()
+    for icon, config in screen.ICON_CONFIG.items():
+        color = colors.get(icon, config.color)
+        if config.has_effects:
+            shadow = tuple(p + o for p, o in zip(config.position, screen.TEXT_SHADOW_OFFSET))
+            draw.text(shadow, screen.ICON_CODES[icon], font=screen.icon_font, fill=(*color[:3], 60))
+        draw.text(config.position, screen.ICON_CODES[icon], font=screen.icon_font, fill=color)
+    for y in screen.LINE_Y_POSITIONS:
+        draw.line([(0, y), (SIZE[0], y)], fill=screen.DEFAULT_COLOR)
+    for key, pos in screen.TEXT_POSITIONS.items():
+        color = colors.get(key, screen.STALE_COLOR if key in screen.stale else screen.DEFAULT_COLOR)
+        draw.text(pos, screen.data[key], font=screen.font, fill=color)
+    return image
+
+def test_unchanged_generation_reuses_the_composed_frame():
+    screen = make_screen(BASE)
+    screen.update(screen.DATA_UPDATE_INTERVAL)
+    render(screen)
+    frame = screen._frame
+    screen.update(0.1)  # no new snapshot
+    render(screen)
+    assert screen._frame is frame
+
+def test_changing_one_field_re_renders_only_its_sprite():
+    screen = make_screen(BASE, {'cpu': MetricSample("16.00%", 0.16)})
+    screen.update(screen.DATA_UPDATE_INTERVAL)
+    render(screen)
+    sprites = dict(screen._sprites)
+    frame = screen._frame
+    screen.update(screen.DATA_UPDATE_INTERVAL)
+    render(screen)
+    assert screen._frame is not frame
+    changed = {field for field, sprite in screen._sprites.items() if sprite is not sprites[field]}
+    assert changed == {'cpu'}
+
+def test_cached_frames_match_an_uncached_draw():
+    screen = make_screen(BASE, {'cpu': MetricSample("98.00%", 0.98), 'temp': MetricSample("81.0°C", 81.0)},
+                         {'public_ip': MetricSample("203.0.113.8"), 'mem': MetricSample("5.0%", 0.05)})
+    for _ in range(3):
+        screen.update(screen.DATA_UPDATE_INTERVAL)
+        assert render(screen).tobytes() == uncached_render(screen).tobytes()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from typing import Dict
+
+from data_gatherer import DataGatherer
+from metrics.procfs_backend import (PROC_MEMINFO_PATH, PROC_STAT_PATH, PROC_UPTIME_PATH, ProcfsBackend)
+from metrics.sample import MetricSample
+
+class FixtureBackend(ProcfsBackend):
+    """Reads procfs/sysfs content from a dict instead of the filesystem."""
+
+    def __init__(self, files: Dict[str, str]) -> None:
+        super().__init__()
+        self.files = files
+        self._thermal_path = "thermal_zone0/temp"
+
+    def _read(self, path: str) -> str:
+        if path not in self.files:
+            raise OSError(f"No such file: {path}")
+        return self.files[path]
+
+def statvfs(blocks: int, bfree: int, bavail: int) -> os.statvfs_result:
+    return os.statvfs_result((4096, 4096, blocks, bfree, bavail, 0, 0, 0, 0, 255))
+
+# Expected strings are what the DataGatherer *_CMD pipelines print for the same input
+UPTIME_CASES = [
+    ("59.99 100.0", "0m"),                        # up 0 minutes
+    ("60.00 100.0", "1m"),                        # up 1 minute
+    ("3600.00 100.0", "1h"),                      # up 1 hour
+    ("98400.50 100.0", "1d  3h  20m"),            # up 1 day, 3 hours, 20 minutes
+    ("1296300.00 100.0", "2 weeks  1d  5m"),      # up 2 weeks, 1 day, 5 minutes
+    ("31536000.00 100.0", "1 year  1d"),          # procps keeps the 365th day next to 52 weeks % 52
+    ("32767260.00 100.0", "1 year  2 weeks  1d  6h  1m"),
+]
+
+STAT_BEFORE = "cpu  1000 0 500 8000 300 0 200 0 0 0\ncpu0 1000 0 500 8000 300 0 200 0 0 0\nintr 1\n"
+CPU_CASES = [
+    ("cpu  2000 5 800 16595 350 0 250 0 0 0\n", "15.00%"),   # idle/total = .8595 -> .85
+    ("cpu  1000 0 500 9000 300 0 200 0 0 0\n", "0%"),        # bc prints a bare 0
+    ("cpu  1500 0 500 8000 300 0 200 0 0 0\n", "100.00%"),
+    ("cpu  1001 0 500 8999 300 0 200 0 0 0\n", "1.00%"),     # .999 truncates to .99
+]
+
+MEMINFO = "MemTotal:        3884400 kB\nMemFree:          912000 kB\nMemAvailable:    2812248 kB\nBuffers:           61000 kB\n"
+MEMINFO_NO_AVAILABLE = "MemTotal:        1000000 kB\nMemFree:          500000 kB\nBuffers:           50000 kB\nCached:           100000 kB\nSReclaimable:      25000 kB\n"
+
+DISK_CASES = [
+    # blocks, free, available to users -> df Use%
+    ((1000, 400, 350), "64%"),   # 600 / 950 = 63.2 -> rounded up
+    ((1000, 1000, 950), "0%"),
+    ((1000, 0, 0), "100%"),
+    ((7700000, 6237000, 5840000), "21%"),
+]
+
+def test_uptime_matches_uptime_p_through_sed():
+    for content, expected in UPTIME_CASES:
+        assert FixtureBackend({PROC_UPTIME_PATH: content}).uptime() == expected, content
+
+def test_cpu_usage_matches_the_bc_pipeline():
+    before = FixtureBackend({PROC_STAT_PATH: STAT_BEFORE}).read_cpu_times()
+    for content, expected in CPU_CASES:
+        after = FixtureBackend({PROC_STAT_PATH: content}).read_cpu_times()
+        assert ProcfsBackend.format_cpu_usage(before, after) == expected, content
+
+def test_memory_and_temperature_match_free_and_awk():
+    assert FixtureBackend({PROC_MEMINFO_PATH: MEMINFO}).mem_usage() == "27.6%"
+    assert FixtureBackend({PROC_MEMINFO_PATH: MEMINFO_NO_AVAILABLE}).mem_usage() == "32.5%"
+    assert FixtureBackend({"thermal_zone0/temp": "48312\n"}).temperature() == "48.3°C"
+    assert FixtureBackend({"thermal_zone0/temp": "48350\n"}).temperature() == "48.4°C"
+
+def test_disk_usage_matches_df():
+    for values, expected in DISK_CASES:
+        assert f"{ProcfsBackend.statvfs_used_percent(statvfs(*values))}%" == expected, values
+
+def test_failed_native_reader_is_not_retried_every_cycle():
+    with tempfile.TemporaryDirectory() as tmp:
+        gatherer = DataGatherer(is_raspberry=True, cache_path=os.path.join(tmp, "metrics.json"))
+        calls = []
+
+        def no_thermal_zone() -> MetricSample:
+            calls.append(1)
+            raise OSError("No thermal zone found")
+
+        for _ in range(3):
+            sample = gatherer._sample('temp', "echo 48.3°C", no_thermal_zone)
+            assert sample.text == "48.3°C" and sample.value == 48.3
+        assert len(calls) == 1  # the shell command serves the metric until the retry interval is over
+        gatherer.stop()
@@ -0,0 +1,24 @@
+from PIL import Image, ImageChops
+
+from utils.progress_indicator import ProgressIndicator
+
+def test_sprites_are_reused_and_drawn_only_in_the_corner():
+    indicator = ProgressIndicator()
+    background = Image.new('RGBA', (128, 128), (10, 20, 30, 255))
+    image = background.copy()
+    indicator.draw(image, 1.5, 3.0)
+    indicator.draw(image, 1.501, 3.0)  # same progress step
+    assert len(indicator._sprites) == 1
+    left, top, right, bottom = ImageChops.difference(image, background).convert("RGB").getbbox()
+    corner = 128 - 2 * 12 - 10  # outer radius 12, margin 10
+    assert left >= corner and top >= corner and right <= 128 - 10 + 1 and bottom <= 128 - 10 + 1
+
+def test_config_change_invalidates_sprites():
+    indicator = ProgressIndicator()
+    first = Image.new('RGBA', (128, 128), (0, 0, 0, 255))
+    indicator.draw(first, 1.5, 3.0)
+    indicator.config['end_color'] = (0, 0, 255)
+    second = Image.new('RGBA', (128, 128), (0, 0, 0, 255))
+    indicator.draw(second, 1.5, 3.0)
+    assert len(indicator._sprites) == 1
+    assert first.tobytes() != second.tobytes()
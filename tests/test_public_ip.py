@@ -0,0 +1,109 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics.public_ip import PublicIPResolver
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the public "what is my IP" services."""
+    routes = {
+        "/ip": (200, b"203.0.113.7\n", 0.0),
+        "/other": (200, b"198.51.100.9", 0.0),
+        "/broken": (500, b"oops", 0.0),
+        "/garbage": (200, b"<html>not an ip</html>", 0.0),
+        "/slow": (200, b"203.0.113.8", 2.0),
+    }
+
+    def do_GET(self):
+        status, body, delay = self.routes.get(self.path, (404, b"", 0.0))
+        time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def make_resolver(base, *paths, **kwargs):
+    kwargs.setdefault("connect_timeout", 0.5)
+    kwargs.setdefault("read_timeout", 0.5)
+    return PublicIPResolver([base + p for p in paths], **kwargs)
+
+def test_fresh_lookup():
+    server, base = start_server()
+    try:
+        resolver = make_resolver(base, "/ip")
+        assert resolver.resolve_once() == "203.0.113.7"
+        result = resolver.current()
+        assert result.value == "203.0.113.7" and not result.stale
+    finally:
+        server.shutdown()
+
+def test_falls_back_to_next_endpoint():
+    server, base = start_server()
+    try:
+        resolver = make_resolver(base, "/broken", "/garbage", "/missing", "/other")
+        assert resolver.resolve_once() == "198.51.100.9"
+    finally:
+        server.shutdown()
+
+def test_read_timeout_is_enforced():
+    server, base = start_server()
+    try:
+        resolver = make_resolver(base, "/slow", "/ip", read_timeout=0.3)
+        started = time.monotonic()
+        assert resolver.resolve_once() == "203.0.113.7"
+        assert time.monotonic() - started < 1.5
+    finally:
+        server.shutdown()
+
+def test_serves_stale_value_and_backs_off():
+    server, base = start_server()
+    try:
+        resolver = make_resolver(base, "/ip")
+        resolver.resolve_once()
+        resolver.endpoints = [base + "/broken"]
+        assert resolver.resolve_once() is None
+        result = resolver.current()
+        assert result.value == "203.0.113.7" and result.stale
+        first = resolver.backoff
+        resolver.resolve_once()
+        assert resolver.backoff == min(resolver.MAX_BACKOFF, first * 2)
+        resolver.endpoints = [base + "/ip"]
+        resolver.resolve_once()
+        assert resolver.backoff == 0.0 and not resolver.current().stale
+    finally:
+        server.shutdown()
+
+def test_unreachable_host_does_not_block():
+    server, base = start_server()
+    server.shutdown()
+    server.server_close()  # nothing listens on the port any more
+    resolver = make_resolver(base, "/ip")
+    resolver.seed("192.0.2.1", time.time() - 3600)
+    started = time.monotonic()
+    assert resolver.resolve_once() is None
+    assert time.monotonic() - started < 1.5
+    assert resolver.current().value == "192.0.2.1" and resolver.current().stale
+
+def test_background_thread_publishes_result():
+    server, base = start_server()
+    try:
+        resolver = make_resolver(base, "/ip")
+        assert resolver.current().value == ""
+        resolver.start()
+        deadline = time.monotonic() + 2.0
+        while not resolver.current().value and time.monotonic() < deadline:
+            time.sleep(0.01)
+        resolver.stop()
+        assert resolver.current().value == "203.0.113.7"
+        assert not resolver.running
+    finally:
+        server.shutdown()
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import numpy as np
+
+from devices.device import Device
+from utils.render_pipeline import RenderPipeline
+
+class SlowDevice(Device):
+    """Records pushed frames; each push takes `delay` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__(8, 8)
+        self.delay = delay
+        self.shown = []
+        self.corrupted = 0
+        self.threads = set()
+
+    def display(self, image) -> None:
+        self.threads.add(threading.current_thread().name)
+        before = image.getpixel((0, 0))
+        time.sleep(self.delay)
+        if image.getpixel((0, 0)) != before:
+            self.corrupted += 1  # the buffer was reused while being sent
+        self.shown.append(before[0])
+
+    def display_rgb565(self, frame: np.ndarray) -> bool:
+        self.shown.append(int(frame[0, 0]))
+        return True
+
+def render(pipeline: RenderPipeline, value: int) -> None:
+    frame, draw = pipeline.acquire()
+    draw.rectangle((0, 0, 7, 7), fill=(value, 0, 0, 255))
+    pipeline.submit(frame)
+
+def wait_until(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+def test_slow_device_never_blocks_rendering():
+    device = SlowDevice(0.05)
+    pipeline = RenderPipeline(device, (8, 8), depth=1)
+    pipeline.start()
+    start = time.monotonic()
+    for value in range(1, 41):
+        render(pipeline, value)
+    assert time.monotonic() - start < 0.05  # 40 frames rendered in less than one push
+    wait_until(lambda: device.shown and device.shown[-1] == 40)
+    pipeline.stop()
+
+    stats = pipeline.stats()
+    assert stats.rendered == 40
+    assert stats.sent == len(device.shown) and stats.sent + stats.dropped == 40
+    assert device.shown[-1] == 40  # the newest frame always gets through
+    assert device.corrupted == 0
+    assert device.threads == {"RenderPipeline"}
+
+def test_depth_two_keeps_the_two_newest_frames():
+    device = SlowDevice(0.1)
+    pipeline = RenderPipeline(device, (8, 8), depth=2)
+    pipeline.start()
+    render(pipeline, 1)
+    wait_until(lambda: pipeline.stats().rendered == 1 and not pipeline._queue)  # 1 is being sent
+    for value in range(2, 7):
+        render(pipeline, value)
+    wait_until(lambda: len(device.shown) == 3)
+    pipeline.stop()
+    assert device.shown == [1, 5, 6]
+    assert pipeline.stats().dropped == 3
+    assert device.corrupted == 0
+
+def test_unthreaded_pipeline_sends_inline():
+    device = SlowDevice(0.0)
+    pipeline = RenderPipeline(device, (8, 8), threaded=False)
+    pipeline.start()
+    render(pipeline, 7)
+    pipeline.submit(np.full((8, 8), 0x1234, dtype=np.uint16))
+    assert device.shown == [7, 0x1234]
+    assert device.threads == {threading.current_thread().name}
+    assert not pipeline.running and pipeline.stats().sent == 2
@@ -0,0 +1,33 @@
+from PIL import Image
+import numpy as np
+
+from utils.rgb565 import BIG_ENDIAN, LITTLE_ENDIAN, RGB565Converter
+
+def reference(image: Image.Image, size) -> np.ndarray:
+    """RGB565 words the drivers produced before the shared converter."""
+    if image.mode == 'RGBA':
+        image = Image.alpha_composite(Image.new("RGBA", image.size, (0, 0, 0, 255)), image)
+    arr = np.array(image.convert('RGB').resize(size), dtype=np.uint16)
+    return ((arr[:, :, 0] & 0xF8) << 8) | ((arr[:, :, 1] & 0xFC) << 3) | (arr[:, :, 2] >> 3)
+
+def test_alpha_is_composited_onto_black_exactly():
+    alpha, value = np.meshgrid(np.arange(256), np.arange(256))
+    image = Image.fromarray(np.stack([value, 255 - value, value, alpha], axis=-1).astype(np.uint8), 'RGBA')
+    converted = RGB565Converter(256, 256).convert(image)
+    assert np.array_equal(converted, reference(image, (256, 256)))
+
+def test_byte_orders_and_output_buffer():
+    rng = np.random.default_rng(1)
+    image = Image.fromarray(rng.integers(0, 256, (32, 48, 3), dtype=np.uint8), 'RGB')
+    expected = reference(image, (48, 32))
+    for byteorder, dtype in ((LITTLE_ENDIAN, '<u2'), (BIG_ENDIAN, '>u2')):
+        converter = RGB565Converter(48, 32, byteorder)
+        out = converter.new_buffer()
+        assert converter.convert(image, out=out) is out
+        assert out.tobytes() == expected.astype(dtype).tobytes()
+
+def test_resizes_when_sizes_differ():
+    rng = np.random.default_rng(2)
+    image = Image.fromarray(rng.integers(0, 256, (40, 40, 4), dtype=np.uint8), 'RGBA')
+    converted = RGB565Converter(64, 32).convert(image)
+    assert np.array_equal(converted, reference(image, (64, 32)))
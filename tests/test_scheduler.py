@@ -0,0 +1,76 @@
+from metrics.sample import MetricSample
+from metrics.scheduler import COST_CHEAP, COST_IO, COST_NETWORK, FAILURE_BACKOFF_LIMIT, MetricScheduler, MetricSpec
+
+def counter(key: str, reads: list):
+    def read() -> MetricSample:
+        reads.append(key)
+        return MetricSample(f"{key}{len(reads)}")
+    return read
+
+def test_metrics_refresh_on_their_own_interval_cheapest_first(fake_clock):
+    clock, reads = fake_clock, []
+    scheduler = MetricScheduler([
+        MetricSpec('ip', counter('ip', reads), 5.0, COST_NETWORK),
+        MetricSpec('disk', counter('disk', reads), 2.0, COST_IO),
+        MetricSpec('cpu', counter('cpu', reads), 1.0, COST_CHEAP),
+    ], clock=clock)
+    assert list(scheduler.run_due()) == ['cpu', 'disk', 'ip']  # all due at start, by cost
+    for _ in range(10):
+        clock.now += 1.0
+        scheduler.run_due()
+    assert reads.count('cpu') == 11 and reads.count('disk') == 6 and reads.count('ip') == 3
+    clock.now += 0.5
+    assert scheduler.due() == []
+
+def test_next_deadline_is_the_earliest_due_time(fake_clock):
+    clock = fake_clock
+    scheduler = MetricScheduler([
+        MetricSpec('slow', counter('slow', []), 30.0),
+        MetricSpec('fast', counter('fast', []), 2.0),
+    ], clock=clock)
+    assert scheduler.next_deadline() == 0.0
+    scheduler.run_due()
+    assert scheduler.next_deadline() == 2.0
+    clock.now = 2.0
+    scheduler.run_due()
+    assert scheduler.next_deadline() == 4.0
+    scheduler.invalidate('slow')
+    assert scheduler.next_deadline() == 2.0
+    assert MetricScheduler([], clock=clock).next_deadline() == clock.now
+
+def test_jitter_stays_within_bounds(fake_clock):
+    clock = fake_clock
+    scheduler = MetricScheduler([MetricSpec('disk', counter('disk', []), 30.0, COST_IO, jitter=5.0)], clock=clock)
+    delays = set()
+    for _ in range(200):
+        scheduler.invalidate('disk')
+        scheduler.run_due()
+        delay = scheduler.next_due('disk') - clock.now
+        assert 30.0 <= delay <= 35.0
+        delays.add(round(delay, 3))
+    assert len(delays) > 10  # actually spread out
+
+def test_failed_read_keeps_the_last_value_and_backs_off(fake_clock):
+    clock = fake_clock
+    results = [MetricSample("48.3°C", 48.3)]
+
+    def read() -> MetricSample:
+        if not results:
+            raise OSError("sensor gone")
+        return results.pop(0)
+
+    scheduler = MetricScheduler([MetricSpec('temp', read, 2.0)], clock=clock)
+    scheduler.run_due()
+    delays = []
+    for _ in range(12):
+        clock.now = scheduler.next_due('temp')
+        assert scheduler.run_due() == {}
+        assert scheduler.values['temp'].text == "48.3°C"
+        delays.append(scheduler.next_due('temp') - clock.now)
+    assert delays[:5] == [2.0, 4.0, 8.0, 16.0, 32.0]
+    assert max(delays) == FAILURE_BACKOFF_LIMIT
+
+    results.append(MetricSample("50.0°C", 50.0))
+    clock.now = scheduler.next_due('temp')
+    assert scheduler.run_due()['temp'].text == "50.0°C"
+    assert scheduler.next_due('temp') - clock.now == 2.0  # back to the regular interval
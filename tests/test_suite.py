@@ -2,7 +2,7 @@ import time
 import sys
 from pathlib import Path
 from PIL import Image
-from lcdstats.ILI9163 import ILI9163
+from devices.ILI9163 import ILI9163
 
 disp = ILI9163()
 
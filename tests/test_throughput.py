@@ -0,0 +1,45 @@
+from metrics.throughput import COUNTER_32_LIMIT, COUNTER_64_LIMIT, RateTracker, counter_delta
+
+COUNTER_CASES = [
+    # (previous, current, expected delta, case)
+    (1_000, 1_500, 500, "plain increase"),
+    (7, 7, 0, "no traffic"),
+    (COUNTER_32_LIMIT - 100, 50, 150, "32-bit wrap"),
+    (COUNTER_32_LIMIT - 1, 0, 1, "32-bit wrap to zero"),
+    (COUNTER_64_LIMIT - 100, 50, 150, "64-bit wrap"),
+    (COUNTER_32_LIMIT + 10, COUNTER_32_LIMIT + 5_000, 4_990, "64-bit counter above 2^32"),
+    (5_000_000, 1_000, 1_000, "32-bit range reset (driver reload)"),
+    (10 ** 12, 500, 500, "64-bit range reset (reboot of the interface)"),
+]
+
+def test_counter_delta_table():
+    for prev, curr, expected, case in COUNTER_CASES:
+        assert counter_delta(prev, curr) == expected, case
+
+def test_first_sample_has_no_rate(fake_clock):
+    tracker = RateTracker(clock=fake_clock)
+    assert tracker.update({"eth0": (1_000, 2_000)}) == {}
+
+def test_rates_across_wraparound_and_reset(fake_clock):
+    clock = fake_clock
+    tracker = RateTracker(clock=clock)
+    tracker.update({"eth0": (COUNTER_32_LIMIT - 1_000, 5_000)})
+    clock.now += 2.0
+    assert tracker.update({"eth0": (1_000, 9_000)}) == {"eth0": (1_000.0, 2_000.0)}
+    clock.now += 2.0
+    assert tracker.update({"eth0": (400, 9_000)}) == {"eth0": (200.0, 0.0)}  # counters reset to 400
+
+def test_interfaces_that_appear_or_disappear(fake_clock):
+    clock = fake_clock
+    tracker = RateTracker(clock=clock)
+    tracker.update({"eth0": (0, 0), "wlan0": (0, 0)})
+    clock.now += 1.0
+    assert tracker.update({"eth0": (100, 10), "usb0": (5_000, 5_000)}) == {"eth0": (100.0, 10.0)}
+    clock.now += 1.0
+    rates = tracker.update({"eth0": (300, 10), "usb0": (5_500, 5_000), "wlan0": (10, 10)})
+    assert rates == {"eth0": (200.0, 0.0), "usb0": (500.0, 0.0)}  # wlan0 restarts from scratch
+
+def test_no_rate_when_the_clock_did_not_advance(fake_clock):
+    tracker = RateTracker(clock=fake_clock)
+    tracker.update({"eth0": (0, 0)})
+    assert tracker.update({"eth0": (100, 100)}) == {}
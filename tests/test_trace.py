@@ -0,0 +1,69 @@
+import gzip
+import os
+import tempfile
+from types import MappingProxyType
+
+from metrics.sample import MetricSample
+from metrics.trace import ReplayGatherer, TraceRecorder, load_trace
+
+def write_trace(path, clock):
+    """Records three updates one second apart; leaves the clock where the recording started."""
+    start = clock.now
+    recorder = TraceRecorder(path, clock)
+    recorder.record({"cpu": MetricSample("10.0%", 0.1), "ip": MetricSample("10.0.0.2", stale=True)})
+    clock.now += 1.0
+    recorder.record({"cpu": MetricSample("20.0%", 0.2, detail=MappingProxyType({"cpu0": 0.2}))})
+    clock.now += 1.0
+    recorder.record({})  # nothing updated: not recorded
+    recorder.record({"cpu": MetricSample("30.0%", 0.3)})
+    recorder.close()
+    clock.now = start
+    return recorder
+
+def test_round_trip(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl.gz")
+        assert write_trace(path, fake_clock).records == 3
+        records = load_trace(path)
+        assert [offset for offset, _ in records] == [0.0, 1.0, 2.0]
+        assert records[0][1]["ip"] == MetricSample("10.0.0.2", stale=True)
+        assert records[1][1]["cpu"].detail == {"cpu0": 0.2}
+
+def test_replay_is_deterministic_and_accelerated(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl.gz")
+        clock = fake_clock
+        write_trace(path, clock)
+        replay = ReplayGatherer(path, speed=2.0, loop=False, clock=clock)
+        replay.start()
+        assert replay.refresh_due().keys() == {"cpu", "ip"}
+        assert replay.next_due() == clock.now + 0.5
+
+        clock.now += 0.4
+        assert replay.refresh_due() == {}
+        clock.now += 0.6  # one trace second later at 2x, plus the next record
+        assert replay.refresh_due()["cpu"].text == "30.0%"
+        assert replay.cached_values()["ip"].text == "10.0.0.2"
+        assert replay.next_due() == float("inf")
+
+def test_replay_loops(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl.gz")
+        clock = fake_clock
+        write_trace(path, clock)
+        replay = ReplayGatherer(path, clock=clock)
+        replay.start()
+        clock.now += 2.0
+        replay.refresh_due()
+        clock.now += ReplayGatherer.LOOP_GAP
+        assert replay.refresh_due()["cpu"].text == "10.0%"
+
+def test_truncated_trace_keeps_complete_records(fake_clock):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl.gz")
+        write_trace(path, fake_clock)
+        with open(path, "rb") as f:
+            data = gzip.decompress(f.read())
+        with gzip.open(path, "wb") as f:
+            f.write(data[:-5])  # cut the last record in half
+        assert len(load_trace(path)) == 2
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import time
+
+from metrics.warm_cache import MAX_CLOCK_SKEW, WarmCache
+
+MAX_AGES = {'public_ip': 3600, 'disk': 60}
+
+def write(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def test_round_trip_replaces_the_file_through_a_temporary_one():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "nested", "metrics.json")
+        cache = WarmCache(path)
+        now = time.time()
+        assert cache.save({'public_ip': ("203.0.113.7", now), 'disk': ("42%", now - 10)})
+        first_inode = os.stat(path).st_ino
+        assert cache.load(MAX_AGES) == {'public_ip': ("203.0.113.7", now), 'disk': ("42%", now - 10)}
+
+        assert cache.save({'disk': ("43%", now)})
+        assert os.stat(path).st_ino != first_inode  # renamed over, never rewritten in place
+        assert os.listdir(os.path.dirname(path)) == ["metrics.json"]  # no temporary file left behind
+        assert cache.load(MAX_AGES) == {'disk': ("43%", now)}
+
+def test_missing_and_invalid_files_yield_no_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "metrics.json")
+        cache = WarmCache(path)
+        assert cache.load(MAX_AGES) == {}
+        for content in ('{"version": 1, "metrics": {', '', '\x00\xff', '[1, 2]', 'null'):
+            write(path, content)
+            assert cache.load(MAX_AGES) == {}
+
+def test_wrong_version_or_schema_is_ignored():
+    now = time.time()
+    good_entry = {"value": "42%", "timestamp": now}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "metrics.json")
+        cache = WarmCache(path)
+        for content in (
+            {"version": 2, "metrics": {"disk": good_entry}},
+            {"metrics": {"disk": good_entry}},
+            {"version": 1, "metrics": [good_entry]},
+            {"version": 1, "metrics": {"disk": "42%"}},
+            {"version": 1, "metrics": {"disk": {"value": 42, "timestamp": now}}},
+            {"version": 1, "metrics": {"disk": {"value": "", "timestamp": now}}},
+            {"version": 1, "metrics": {"disk": {"value": "42%", "timestamp": "yesterday"}}},
+        ):
+            write(path, json.dumps(content))
+            assert cache.load(MAX_AGES) == {}
+        write(path, json.dumps({"version": 1, "metrics": {"disk": good_entry, "unknown": good_entry}}))
+        assert list(cache.load(MAX_AGES)) == ["disk"]
+
+def test_expired_and_future_entries_are_dropped():
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = WarmCache(os.path.join(tmp, "metrics.json"))
+        cache.save({
+            'public_ip': ("203.0.113.7", now - 3 * 3600),   # older than its hour
+            'disk': ("42%", now + MAX_CLOCK_SKEW + 600),    # written by a clock far ahead
+        })
+        assert cache.load(MAX_AGES) == {}
+        cache.save({'disk': ("42%", now + MAX_CLOCK_SKEW / 2)})  # small skew is tolerated
+        assert cache.load(MAX_AGES) == {'disk': ("42%", now + MAX_CLOCK_SKEW / 2)}
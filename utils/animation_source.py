@@ -0,0 +1,147 @@
+from PIL import Image
+from collections import OrderedDict
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_FRAME_DURATION_MS = 100
+
+def read_durations(path: str) -> List[float]:
+    """Returns the duration in seconds of every frame of an image file (GIF, APNG, WebP or still)."""
+    durations = []
+    with Image.open(path) as image:
+        for index in range(getattr(image, "n_frames", 1)):
+            image.seek(index)
+            if image.format == "WEBP":
+                image.load()  # WebP only reports a frame's duration once it is decoded
+            durations.append(image.info.get('duration', DEFAULT_FRAME_DURATION_MS) / 1000)
+    return durations
+
+class AnimationSource:
+    """Lazily decoded frames of an animated image, kept in a bounded LRU cache.
+
+    Works with any format Pillow can seek through (GIF, APNG, animated
+    WebP). Frames are decoded on first request, converted to RGBA at the
+    target size, and kept while they fit in `memory_budget` bytes; a worker
+    thread decodes the next `prefetch` frames ahead of playback. Requests
+    for frames that are not cached yet are decoded on the caller's thread.
+    """
+    DEFAULT_MEMORY_BUDGET = 2 * 1024 * 1024  # bytes of decoded RGBA frames
+    DEFAULT_PREFETCH = 4                     # frames decoded ahead of the last requested one
+    JOIN_TIMEOUT = 2.0                       # seconds to wait for the thread on stop()
+
+    def __init__(self, path: str, size: Tuple[int, int], resample: int = Image.NEAREST,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, prefetch: int = DEFAULT_PREFETCH,
+                 durations: Optional[Sequence[float]] = None) -> None:
+        """Opens the file; pass known `durations` to skip scanning the frames for them."""
+        self.path = path
+        self.size = size
+        self.resample = resample
+        self.durations: List[float] = list(durations) if durations is not None else read_durations(path)
+        self.capacity = max(1, memory_budget // (size[0] * size[1] * 4))
+        self.prefetch = max(0, min(prefetch, self.capacity - 1, len(self.durations) - 1))
+        self.hits = 0
+        self.misses = 0
+        self._image: Optional[Image.Image] = None
+        self._decode_lock = threading.Lock() # the Pillow image can only seek on one thread at a time
+        self._cache: "OrderedDict[int, Image.Image]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._prefetch_from = 0
+        self._prefetch_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        """Returns the number of frames."""
+        return len(self.durations)
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        """Return True while the prefetch thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the prefetch thread (no-op if already running or prefetch is disabled)."""
+        if self.running or not self.prefetch:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="AnimationSource", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the prefetch thread, waiting at most JOIN_TIMEOUT seconds."""
+        self._stop_event.set()
+        self._prefetch_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.JOIN_TIMEOUT)
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop prefetching and release the file and the cached frames."""
+        self.stop()
+        with self._decode_lock:
+            if self._image is not None:
+                self._image.close()
+                self._image = None
+        with self._cache_lock:
+            self._cache.clear()
+
+    # --- Frames ---
+
+    def frame(self, index: int) -> Image.Image:
+        """Returns frame `index` as an RGBA image at the target size and prefetches the ones after it."""
+        with self._cache_lock:
+            frame = self._cache.get(index)
+            if frame is not None:
+                self._cache.move_to_end(index)
+                self.hits += 1
+        if frame is None:
+            self.misses += 1
+            frame = self._load(index)
+        if self.prefetch:
+            self._prefetch_from = (index + 1) % len(self.durations)
+            self._prefetch_event.set()
+            self.start()
+        return frame
+
+    def cached(self) -> List[int]:
+        """Returns the indices of the cached frames, least recently used first."""
+        with self._cache_lock:
+            return list(self._cache)
+
+    def _decode(self, index: int) -> Image.Image:
+        """Decodes one frame; the caller holds the decode lock."""
+        if self._image is not None and index < self._image.tell():
+            # Going backwards replays the file from the start anyway; a fresh handle avoids
+            # Pillow's APNG reader rejecting its own rewind
+            self._image.close()
+            self._image = None
+        if self._image is None:
+            self._image = Image.open(self.path)
+        self._image.seek(index)
+        return self._image.convert("RGBA").resize(self.size, self.resample)
+
+    def _load(self, index: int) -> Image.Image:
+        """Returns a frame from the cache or decodes and caches it, evicting least recently used frames."""
+        with self._decode_lock:
+            with self._cache_lock:
+                frame = self._cache.get(index)
+            if frame is None:
+                frame = self._decode(index)
+                with self._cache_lock:
+                    self._cache[index] = frame
+                    while len(self._cache) > self.capacity:
+                        self._cache.popitem(last=False)
+        return frame
+
+    def _run(self) -> None:
+        """Prefetch loop: decodes the frames after the last requested one until a newer request arrives."""
+        while not self._stop_event.is_set():
+            self._prefetch_event.wait()
+            self._prefetch_event.clear()
+            start = self._prefetch_from
+            for offset in range(self.prefetch):
+                if self._stop_event.is_set() or self._prefetch_event.is_set():
+                    break
+                self._load((start + offset) % len(self.durations))
@@ -0,0 +1,31 @@
+import numpy as np
+from typing import List, Sequence, Tuple
+
+Rect = Tuple[int, int, int, int] # x0, y0, x1, y1, inclusive like the CASET/PASET window
+
+DEFAULT_MERGE_GAP = 6        # unchanged rows bridged between two changed bands instead of opening a new rectangle
+RECT_OVERHEAD_BYTES = 1536   # per-rectangle command cost (window setup transactions) in equivalent pixel bytes
+
+def find_dirty_rects(previous: np.ndarray, current: np.ndarray, merge_gap: int = DEFAULT_MERGE_GAP) -> List[Rect]:
+    """Bounding rectangles of the pixels that differ between two frames, one per band of changed rows.
+
+    Bands separated by at most `merge_gap` unchanged rows are merged, so a
+    column of text lines becomes one rectangle rather than one per line.
+    Returns an empty list when the frames are identical.
+    """
+    changed = previous != current
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not rows.size:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) > merge_gap + 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]]))
+    rects = []
+    for y0, y1 in zip(starts, ends):
+        columns = np.flatnonzero(changed[y0:y1 + 1].any(axis=0))
+        rects.append((int(columns[0]), int(y0), int(columns[-1]), int(y1)))
+    return rects
+
+def transfer_cost(rects: Sequence[Rect], bytes_per_pixel: int = 2, rect_overhead: int = RECT_OVERHEAD_BYTES) -> int:
+    """Estimated cost of sending the rectangles, in bytes including the per-rectangle overhead."""
+    return sum((x1 - x0 + 1) * (y1 - y0 + 1) * bytes_per_pixel + rect_overhead for x0, y0, x1, y1 in rects)
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+import numpy as np
+import time
+from typing import Callable, Optional
+
+@dataclass(frozen=True)
+class DedupStats:
+    """Transmission counters of a device that skips unchanged frames."""
+    sent: int     # frames pushed to the display
+    skipped: int  # frames identical to the last one sent
+    forced: int   # unchanged frames sent anyway because a refresh was due
+
+    def summary(self) -> str:
+        """One-line human-readable report."""
+        total = self.sent + self.skipped
+        ratio = self.skipped / total * 100 if total else 0.0
+        return f"{self.sent} sent ({self.forced} forced refreshes), {self.skipped} unchanged skipped ({ratio:.0f}%)"
+
+class FrameDeduplicator:
+    """Remembers the last RGB565 frame a device sent, so identical frames can be skipped.
+
+    Frames are compared word for word against a private copy of the last
+    one sent, which is cheaper than hashing at these sizes and cannot
+    collide. With `refresh_interval` set, an unchanged frame is still sent
+    once that many seconds have passed since the last push, so a panel
+    that glitched or a display that rebooted catches up on its own.
+    """
+
+    def __init__(self, refresh_interval: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """Creates the deduplicator; None or 0 for `refresh_interval` disables forced refreshes."""
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._last: Optional[np.ndarray] = None
+        self._last_sent_at = 0.0
+        self._sent = 0
+        self._skipped = 0
+        self._forced = 0
+
+    def is_duplicate(self, frame: np.ndarray) -> bool:
+        """Returns True (and counts a skip) if `frame` matches the last frame sent and no refresh is due."""
+        last = self._last
+        if last is None or last.shape != frame.shape or last.dtype != frame.dtype:
+            return False
+        if not np.array_equal(last, frame):
+            return False
+        if self.refresh_interval and self.clock() - self._last_sent_at >= self.refresh_interval:
+            self._forced += 1
+            return False
+        self._skipped += 1
+        return True
+
+    def mark_sent(self, frame: np.ndarray) -> None:
+        """Records `frame` as the one now shown on the display."""
+        if self._last is None or self._last.shape != frame.shape or self._last.dtype != frame.dtype:
+            self._last = np.empty_like(frame)
+        np.copyto(self._last, frame)
+        self._last_sent_at = self.clock()
+        self._sent += 1
+
+    def invalidate(self) -> None:
+        """Forgets the last frame, e.g. after a reconnect, so the next one is always sent."""
+        self._last = None
+
+    def stats(self) -> DedupStats:
+        """Returns the sent/skipped counters."""
+        return DedupStats(sent=self._sent, skipped=self._skipped, forced=self._forced)
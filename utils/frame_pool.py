@@ -0,0 +1,53 @@
+from PIL import Image, ImageDraw
+import threading
+from typing import List, Set, Tuple
+
+Color = Tuple[int, int, int, int] # RGBA color type
+
+class FramePool:
+    """A fixed set of preallocated frame buffers, each with its ImageDraw, reused round-robin.
+
+    Buffers are cleared in place when handed out, so the render loop does
+    not allocate images in steady state. A buffer stays valid until the pool
+    wraps around to it again, i.e. for `count - 1` further acquisitions,
+    unless it is held: held buffers (e.g. frames queued for another thread)
+    are skipped until released, so the pool needs one more buffer than the
+    most frames ever held at once.
+    """
+    DEFAULT_COUNT = 2
+    CLEAR_COLOR: Color = (0, 0, 0, 0)
+
+    def __init__(self, size: Tuple[int, int], count: int = DEFAULT_COUNT, mode: str = 'RGBA') -> None:
+        """Allocates `count` frames of the given size and mode up front."""
+        if count <= 0:
+            raise ValueError(f"Frame pool needs at least one buffer, got {count}")
+        self.size = size
+        self.frames: List[Image.Image] = [Image.new(mode, size, self.CLEAR_COLOR) for _ in range(count)]
+        self.draws: List[ImageDraw.ImageDraw] = [ImageDraw.Draw(frame) for frame in self.frames]
+        self._box = (0, 0, size[0], size[1])
+        self._index = -1
+        self._held: Set[int] = set() # ids of frames in use elsewhere
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[Image.Image, ImageDraw.ImageDraw]:
+        """Returns the next frame that is not held, cleared to transparent black, and its cached ImageDraw."""
+        with self._lock:
+            for _ in range(len(self.frames)):
+                self._index = (self._index + 1) % len(self.frames)
+                if id(self.frames[self._index]) not in self._held:
+                    break
+            else:
+                raise RuntimeError(f"All {len(self.frames)} frame buffers are held")
+        frame = self.frames[self._index]
+        frame.paste(self.CLEAR_COLOR, self._box)  # fills the existing buffer, no new image
+        return frame, self.draws[self._index]
+
+    def hold(self, frame: Image.Image) -> None:
+        """Keeps `frame` from being handed out again until it is released; safe from any thread."""
+        with self._lock:
+            self._held.add(id(frame))
+
+    def release(self, frame: Image.Image) -> None:
+        """Returns a held frame to the rotation; safe from any thread."""
+        with self._lock:
+            self._held.discard(id(frame))
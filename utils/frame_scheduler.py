@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from input_handler import InputHandler
+
+class FrameScheduler:
+    """Sleeps the render loop until the next frame deadline, an input event or a wake-up.
+
+    Screens report when they next need a frame; the scheduler never starts
+    frames closer together than `min_interval`. Slots are paced from the
+    previous deadline rather than from when a frame finished, so a long frame
+    does not shift every later one, and a loop that fell behind resumes
+    from now instead of bursting to catch up.
+    """
+    WAKE_CHECK_INTERVAL = 0.05  # seconds between wake-up checks while waiting on input
+    MAX_SLEEP = 1.0             # longest single sleep, so far-off (or infinite) deadlines stay interruptible
+
+    def __init__(self, min_interval: float, input_handler: Optional[InputHandler] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initializes the scheduler with the shortest allowed time between frames."""
+        self.min_interval = min_interval
+        self.input_handler = input_handler
+        self.clock = clock
+        self.frames = 0
+        self.idle_time = 0.0  # total seconds spent waiting
+        self._next_slot = clock()
+        self._wake = threading.Event()
+
+    def wake(self) -> None:
+        """Ends the current wait early (e.g. a new snapshot was published); safe from any thread."""
+        self._wake.set()
+
+    def _sleep(self, timeout: float) -> bool:
+        """Waits up to `timeout` seconds; returns True if input or a wake-up arrived."""
+        if self.input_handler is None:
+            return self._wake.wait(timeout)
+        if self.input_handler.wait_for_input(min(timeout, self.WAKE_CHECK_INTERVAL)):
+            return True
+        return self._wake.is_set()
+
+    def wait(self, deadline: float) -> float:
+        """Blocks until `deadline` or an event, never before the next frame slot, and returns the frame start time."""
+        slot = max(deadline, self._next_slot)
+        started_waiting = self.clock()
+        interrupted = False
+        while True:
+            remaining = slot - self.clock()
+            if remaining <= 0:
+                break
+            if self._sleep(min(remaining, self.MAX_SLEEP)):
+                # Events are served at the earliest allowed slot instead of the screen's deadline
+                self._wake.clear()
+                interrupted = True
+                slot = self._next_slot
+
+        now = self.clock()
+        self.idle_time += now - started_waiting
+        self.frames += 1
+        # Deadlines keep their slot so pacing does not drift; events restart it from now
+        base = now if interrupted else slot
+        self._next_slot = max(base + self.min_interval, now)
+        return now
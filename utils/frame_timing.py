@@ -0,0 +1,162 @@
+from PIL import ImageDraw
+from bisect import bisect_left
+import json
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.glyph_atlas import get_atlas
+
+logger = logging.getLogger(__name__)
+
+Color = Tuple[int, int, int, int] # RGBA color type
+
+# Upper bucket edges in seconds: 50 us to ~2 s, each 1.5x the previous; the last bucket is open-ended
+BUCKET_EDGES: Tuple[float, ...] = tuple(50e-6 * 1.5 ** i for i in range(27))
+
+STAGES = ("update", "draw", "convert", "push", "frame")
+
+class StageHistogram:
+    """Fixed-bucket histogram of one stage's durations; recording never allocates."""
+
+    def __init__(self) -> None:
+        """Initializes an empty histogram."""
+        self.counts: List[int] = [0] * (len(BUCKET_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Adds one duration."""
+        self.counts[bisect_left(BUCKET_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper edge of the bucket holding the given fraction of samples (capped at the max)."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                edge = BUCKET_EDGES[index] if index < len(BUCKET_EDGES) else self.max
+                return min(edge, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count and mean/p50/p90/p99/max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p90_ms": self.percentile(0.90) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+class FrameTimer:
+    """Per-stage frame timing: histograms, an optional debug overlay and periodic JSONL export.
+
+    Call sites bracket a stage with `start = timer.start()` and
+    `timer.record(stage, start)`. A disabled timer returns immediately from
+    both, so the instrumentation can stay in place at no measurable cost.
+    Stages may be recorded from different threads (e.g. the transport
+    thread pushes frames); counts are best-effort under contention.
+    """
+    FPS_WINDOW = 1.0            # seconds between FPS estimates
+    DEFAULT_EXPORT_INTERVAL = 10.0
+    OVERLAY_COLOR: Color = (255, 255, 0, 255)
+    OVERLAY_BACKGROUND: Color = (0, 0, 0, 255)
+    OVERLAY_HEIGHT = 14
+
+    def __init__(self, enabled: bool = False, overlay: bool = False, export_path: Optional[str] = None,
+                 export_interval: float = DEFAULT_EXPORT_INTERVAL, clock: Callable[[], float] = time.perf_counter) -> None:
+        """Creates the timer; overlay or export imply enabled."""
+        self.enabled = enabled or overlay or export_path is not None
+        self.overlay = overlay
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.clock = clock
+        self.histograms: Dict[str, StageHistogram] = {stage: StageHistogram() for stage in STAGES}
+        self.frames = 0
+        self.fps = 0.0
+        now = clock()
+        self._window_start = now  # current export window
+        self._fps_start = now
+        self._fps_frames = 0
+        self._atlas = None
+
+    # --- Recording ---
+
+    def start(self) -> float:
+        """Returns the start instant of a stage (0.0 when disabled)."""
+        return self.clock() if self.enabled else 0.0
+
+    def record(self, stage: str, start: float) -> None:
+        """Records the time since `start` for a stage."""
+        if self.enabled:
+            self.histograms[stage].record(self.clock() - start)
+
+    def frame_done(self, start: float) -> None:
+        """Records a whole frame, updates the FPS estimate and exports when the interval is over."""
+        if not self.enabled:
+            return
+        now = self.clock()
+        self.histograms["frame"].record(now - start)
+        self.frames += 1
+        self._fps_frames += 1
+        if now - self._fps_start >= self.FPS_WINDOW:
+            self.fps = self._fps_frames / (now - self._fps_start)
+            self._fps_start, self._fps_frames = now, 0
+        if self.export_path and now - self._window_start >= self.export_interval:
+            self.export(now)
+
+    # --- Reporting ---
+
+    def slowest_stage(self) -> Tuple[str, float]:
+        """Returns the stage with the highest mean duration in the current window and that mean in seconds."""
+        means = [(h.total / h.count, stage) for stage, h in self.histograms.items() if h.count and stage != "frame"]
+        if not means:
+            return "", 0.0
+        mean, stage = max(means)
+        return stage, mean
+
+    def report(self) -> Dict:
+        """Summary of the current window."""
+        return {
+            "timestamp": time.time(),
+            "frames": self.frames,
+            "fps": round(self.fps, 2),
+            "stages": {stage: h.summary() for stage, h in self.histograms.items() if h.count},
+        }
+
+    def export(self, now: Optional[float] = None) -> None:
+        """Appends the current window as one JSON line and starts a new window."""
+        if not self.export_path:
+            return
+        try:
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.report()) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write frame timing to {self.export_path}: {e}")
+        self.histograms = {stage: StageHistogram() for stage in STAGES}
+        self.frames = 0
+        self._window_start = self.clock() if now is None else now
+
+    def draw_overlay(self, draw: ImageDraw.ImageDraw, width: int) -> None:
+        """Draws FPS and the slowest stage in a strip at the top of the frame."""
+        if not self.overlay:
+            return
+        if self._atlas is None:
+            self._atlas = get_atlas('fonts/PixelOperator.ttf', 16)
+        stage, mean = self.slowest_stage()
+        text = f"{self.fps:4.1f} fps {stage} {mean * 1000:.1f}ms" if stage else f"{self.fps:4.1f} fps"
+        draw.rectangle((0, 0, width - 1, self.OVERLAY_HEIGHT - 1), fill=self.OVERLAY_BACKGROUND)
+        self._atlas.draw_text(draw, (1, -1), text, self.OVERLAY_COLOR)
+
+# Shared disabled timer, the default for devices and loops that are not instrumented
+NULL_TIMER = FrameTimer()
@@ -0,0 +1,161 @@
+from PIL import Image
+import hashlib
+import json
+import logging
+import numpy as np
+import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from metrics.warm_cache import CACHE_DIR_ENV, DEFAULT_CACHE_DIR
+from utils.animation_source import AnimationSource, read_durations
+from utils.rgb565 import BIG_ENDIAN, LITTLE_ENDIAN, RGB565Converter
+
+logger = logging.getLogger(__name__)
+
+FRAMES_SUBDIR = "frames"
+
+def default_frame_cache_dir() -> str:
+    """Return the frame cache directory, next to the warm cache (honours LCDSTATS_CACHE_DIR)."""
+    return os.path.join(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR), FRAMES_SUBDIR)
+
+class GifFrameCache:
+    """The frames of an animation at a target size, as PIL images and as device-native RGB565.
+
+    Any format AnimationSource reads works (GIF, APNG, animated WebP). The
+    first run decodes the animation and writes, keyed by the file's SHA-1,
+    the target size and the resample filter, a small index (frame durations)
+    plus one raw RGB565 file per byte order, with every frame already
+    composited onto black.
+    Later runs read the index and memory-map the RGB565 file, so no frame
+    is decoded unless a PIL image is actually asked for; those come from a
+    memory-bounded AnimationSource. Cache failures are logged and fall back
+    to converting in memory.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, size: Tuple[int, int], cache_dir: Optional[str] = None,
+                 resample: int = Image.NEAREST, memory_budget: int = AnimationSource.DEFAULT_MEMORY_BUDGET) -> None:
+        """Loads the frame durations, from the cache index if present or else from the file."""
+        self.path = path
+        self.size = size
+        self.cache_dir = cache_dir or default_frame_cache_dir()
+        self.resample = resample
+        self.memory_budget = memory_budget
+        self._source: Optional[AnimationSource] = None
+        self._native: Dict[str, np.ndarray] = {}
+        self._key = self._cache_key()
+        self.durations: List[float] = self._load_index() or self._build_index()
+
+    def _cache_key(self) -> str:
+        """Returns the cache file prefix: content hash, target size, resample filter and format version."""
+        digest = hashlib.sha1()
+        with open(self.path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        return f"{digest.hexdigest()}-{self.size[0]}x{self.size[1]}-r{int(self.resample)}-v{self.VERSION}"
+
+    def _cache_path(self, suffix: str) -> str:
+        """Returns the path of one of this GIF's cache files."""
+        return os.path.join(self.cache_dir, f"{self._key}{suffix}")
+
+    def _write_atomic(self, path: str, data) -> None:
+        """Writes bytes to `path` through a temporary file, so readers never see a partial file."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".frames-", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _load_index(self) -> Optional[List[float]]:
+        """Returns the cached frame durations, or None if there is no usable index."""
+        try:
+            with open(self._cache_path(".json"), "r", encoding="utf-8") as f:
+                durations = json.load(f).get("durations")
+            if not isinstance(durations, list) or not durations:
+                raise ValueError("no frame durations")
+            return [float(d) for d in durations]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable frame index for {self.path}: {e}")
+            return None
+
+    def _build_index(self) -> List[float]:
+        """Reads the frame durations from the file and stores them in the cache index."""
+        durations = read_durations(self.path)
+        try:
+            self._write_atomic(self._cache_path(".json"), json.dumps({"durations": durations}).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Could not write frame index for {self.path}: {e}")
+        return durations
+
+    def __len__(self) -> int:
+        """Returns the number of frames."""
+        return len(self.durations)
+
+    @property
+    def source(self) -> AnimationSource:
+        """The lazily decoding frame source, opened on first use."""
+        if self._source is None:
+            self._source = AnimationSource(self.path, self.size, self.resample, self.memory_budget,
+                                           durations=self.durations)
+        return self._source
+
+    def image(self, index: int) -> Image.Image:
+        """Returns frame `index` as an RGBA image at the target size."""
+        return self.source.frame(index)
+
+    def close(self) -> None:
+        """Stops the frame source, if one was opened."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def native_frames(self, byteorder: str) -> np.ndarray:
+        """Returns all frames as a (count, height, width) RGB565 array in `byteorder`, memory-mapped when cached."""
+        frames = self._native.get(byteorder)
+        if frames is None:
+            frames = self._map_native(byteorder)
+            if frames is None:
+                frames = self._build_native(byteorder)
+            self._native[byteorder] = frames
+        return frames
+
+    def _native_dtype(self, byteorder: str) -> np.dtype:
+        """Returns the word dtype of a byte order."""
+        return np.dtype('>u2' if byteorder == BIG_ENDIAN else '<u2')
+
+    def _map_native(self, byteorder: str) -> Optional[np.ndarray]:
+        """Memory-maps the cached RGB565 frames of a byte order, or returns None if missing or the wrong size."""
+        path = self._cache_path(f"-{byteorder}.rgb565")
+        shape = (len(self.durations), self.size[1], self.size[0])
+        dtype = self._native_dtype(byteorder)
+        try:
+            if os.path.getsize(path) != int(np.prod(shape)) * dtype.itemsize:
+                logger.warning(f"Ignoring frame cache {path} with unexpected size")
+                return None
+            return np.memmap(path, dtype=dtype, mode='r', shape=shape)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable frame cache {path}: {e}")
+            return None
+
+    def _build_native(self, byteorder: str) -> np.ndarray:
+        """Converts every frame to RGB565 and stores the result in the cache."""
+        if byteorder not in (LITTLE_ENDIAN, BIG_ENDIAN):
+            raise ValueError(f"Unsupported byte order: {byteorder}")
+        converter = RGB565Converter(self.size[0], self.size[1], byteorder)
+        frames = np.empty((len(self.durations), self.size[1], self.size[0]), dtype=self._native_dtype(byteorder))
+        for index in range(len(self.durations)):
+            converter.convert(self.image(index), out=frames[index])
+        try:
+            self._write_atomic(self._cache_path(f"-{byteorder}.rgb565"), frames.tobytes())
+        except OSError as e:
+            logger.warning(f"Could not write frame cache for {self.path}: {e}")
+        return frames
@@ -0,0 +1,94 @@
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from typing import Dict, NamedTuple, Tuple
+
+Color = Tuple[int, int, int, int] # RGBA color type
+
+class Glyph(NamedTuple):
+    """A rasterized character: coverage mask, bounding box offset and pen advance."""
+    mask: np.ndarray        # uint8 coverage, shape (height, width)
+    offset: Tuple[int, int] # top-left of the mask relative to the pen position
+    advance: float
+
+class TextMask(NamedTuple):
+    """A composed string: 'L' coverage mask and its offset from the text position."""
+    offset: Tuple[int, int]
+    mask: Image.Image
+
+class GlyphAtlas:
+    """Caches rasterized glyphs of one font and composes strings from them.
+
+    Each character goes through FreeType once; strings are then built by
+    copying cached glyph masks, so drawing text costs a few memory copies.
+    Masks are color-independent: the fill color is applied when blitting.
+    Only single-line text is supported.
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont) -> None:
+        """Initializes an empty atlas for `font`."""
+        self.font = font
+        self._glyphs: Dict[str, Glyph] = {}
+        self._kerning: Dict[Tuple[str, str], float] = {}
+
+    def glyph(self, char: str) -> Glyph:
+        """Returns the cached glyph of a character, rasterizing it on first use."""
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            left, top, right, bottom = self.font.getbbox(char)
+            image = Image.new('L', (max(0, right - left), max(0, bottom - top)), 0)
+            if image.width and image.height:
+                ImageDraw.Draw(image).text((-left, -top), char, font=self.font, fill=255)
+            glyph = Glyph(np.asarray(image), (left, top), self.font.getlength(char))
+            self._glyphs[char] = glyph
+        return glyph
+
+    def _kern(self, prev: str, char: str) -> float:
+        """Returns the kerning adjustment between two characters (cached per pair)."""
+        pair = (prev, char)
+        kern = self._kerning.get(pair)
+        if kern is None:
+            kern = self.font.getlength(prev + char) - self.glyph(prev).advance - self.glyph(char).advance
+            self._kerning[pair] = kern
+        return kern
+
+    def render(self, text: str) -> TextMask:
+        """Composes the coverage mask of a string from cached glyphs."""
+        placed = []
+        pen, prev = 0.0, None
+        for char in text:
+            glyph = self.glyph(char)
+            if prev is not None:
+                pen += self._kern(prev, char)
+            placed.append((int(pen) + glyph.offset[0], glyph.offset[1], glyph.mask))
+            pen += glyph.advance
+            prev = char
+
+        placed = [p for p in placed if p[2].size]
+        if not placed:
+            return TextMask((0, 0), Image.new('L', (1, 1), 0))
+        left = min(x for x, _, _ in placed)
+        top = min(y for _, y, _ in placed)
+        right = max(x + m.shape[1] for x, _, m in placed)
+        bottom = max(y + m.shape[0] for _, y, m in placed)
+
+        # Overlapping glyphs keep the strongest coverage, as FreeType does
+        canvas = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for x, y, mask in placed:
+            region = canvas[y - top:y - top + mask.shape[0], x - left:x - left + mask.shape[1]]
+            np.maximum(region, mask, out=region)
+        return TextMask((left, top), Image.fromarray(canvas, 'L'))
+
+    def draw_text(self, draw: ImageDraw.ImageDraw, pos: Tuple[int, int], text: str, color: Color) -> None:
+        """Drop-in for `draw.text(pos, text, font=font, fill=color)` using cached glyphs."""
+        offset, mask = self.render(text)
+        draw.bitmap((pos[0] + offset[0], pos[1] + offset[1]), mask, fill=color)
+
+_atlases: Dict[Tuple[str, int], GlyphAtlas] = {}
+
+def get_atlas(path: str, size: int) -> GlyphAtlas:
+    """Returns the shared atlas of a font file at a given size, loading the font on first use."""
+    key = (path, size)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(ImageFont.truetype(path, size))
+    return atlas
@@ -1,5 +1,5 @@
 from PIL import Image, ImageDraw
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 class ProgressIndicator:
     """A class to draw a circular progress indicator with a glow effect and dynamic border color."""
@@ -11,6 +11,7 @@ class ProgressIndicator:
     _GLOW_ALPHA_BASE = 60
     _BORDER_ALPHA = 200
     _FINAL_ARC_ALPHA = 255
+    _PROGRESS_STEPS = 100 # distinct sprites over a full press
 
     def __init__(self, config: Optional[dict] = None) -> None:
         """Initialize the ProgressIndicator with default or custom configuration."""
@@ -26,29 +27,46 @@ class ProgressIndicator:
             'dynamic_border': True,
             **(config or {})
         }
+        self._sprites: Dict[int, Image.Image] = {} # progress step -> pre-rendered indicator
+        self._sprites_key: Optional[Tuple] = None  # config the sprites were rendered with
 
     def draw(self, base_image: Image.Image, elapsed_time: float, max_time: float) -> None:
         """Draw the progress indicator on the base image."""
         if not self._MIN_DRAW_TIME < elapsed_time < max_time:
             return
 
-        progress = elapsed_time / max_time
         cfg = self.config
         w, h = base_image.size
+        radius = max(cfg['outer_radius'], cfg['inner_radius'])
 
         # Indicator position: bottom-right corner
         x = w - cfg['outer_radius'] - cfg['margin']
         y = h - cfg['outer_radius'] - cfg['margin']
 
-        # Create transparent overlay
-        overlay = Image.new("RGBA", base_image.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
-
-        self._draw_background(draw, x, y)
-        self._draw_progress(draw, x, y, progress)
-        self._draw_border(draw, x, y, progress)
-
-        base_image.alpha_composite(overlay)
+        # Only the indicator's bounding box is composited
+        step = round(elapsed_time / max_time * self._PROGRESS_STEPS)
+        base_image.alpha_composite(self._sprite(step), dest=(x - radius, y - radius))
+
+    def _sprite(self, step: int) -> Image.Image:
+        """Return the indicator at a progress step, rendering it on first use; config changes drop the cache."""
+        key = tuple(sorted(self.config.items()))
+        if key != self._sprites_key:
+            self._sprites.clear()
+            self._sprites_key = key
+
+        sprite = self._sprites.get(step)
+        if sprite is None:
+            cfg = self.config
+            radius = max(cfg['outer_radius'], cfg['inner_radius'])
+            sprite = Image.new("RGBA", (2 * radius + 1, 2 * radius + 1), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(sprite)
+            progress = step / self._PROGRESS_STEPS
+
+            self._draw_background(draw, radius, radius)
+            self._draw_progress(draw, radius, radius, progress)
+            self._draw_border(draw, radius, radius, progress)
+            self._sprites[step] = sprite
+        return sprite
 
     def _draw_background(self, draw: ImageDraw.ImageDraw, x: int, y: int) -> None:
         """Draw the background circle"""
@@ -0,0 +1,198 @@
+from PIL import Image, ImageDraw
+from collections import deque
+from dataclasses import dataclass
+import logging
+import numpy as np
+import threading
+import time
+from typing import Callable, Deque, NamedTuple, Optional, Tuple, Union
+
+from devices.device import Device
+from utils.frame_pool import FramePool
+
+logger = logging.getLogger(__name__)
+
+Frame = Union[Image.Image, np.ndarray] # RGBA image, or a native RGB565 frame for Device.display_rgb565
+
+class PendingFrame(NamedTuple):
+    """A rendered frame waiting for the transport stage."""
+    frame: Frame
+    screen_id: Optional[str]
+    rendered_at: float
+
+@dataclass(frozen=True)
+class PipelineStats:
+    """Throughput and loss counters of both pipeline stages."""
+    rendered: int          # frames submitted by the render stage
+    sent: int              # frames the transport stage pushed to the device
+    dropped: int           # frames replaced by a newer one before they were sent
+    failed: int            # frames the device rejected or raised on
+    render_fps: float
+    transport_fps: float
+    mean_send_time: float  # seconds per device push
+    mean_latency: float    # seconds from submit to the end of the push
+
+    def summary(self) -> str:
+        """One-line human-readable report."""
+        return (f"render {self.render_fps:.1f} fps ({self.rendered} frames) | "
+                f"transport {self.transport_fps:.1f} fps ({self.sent} sent, {self.dropped} dropped, "
+                f"{self.failed} failed, {self.mean_send_time * 1000:.1f} ms/push, "
+                f"{self.mean_latency * 1000:.1f} ms latency)")
+
+class RenderPipeline:
+    """Decouples rendering from pushing frames to the device.
+
+    The render loop draws into pooled buffers and submits them; a transport
+    thread sends them to the device. At most `depth` frames wait in the
+    queue: submitting to a full queue replaces the oldest unsent frame
+    instead of blocking, so a slow SPI transfer or a stalled ESP32 never
+    holds up input polling or screen updates. With `threaded=False` frames
+    are sent inline, for devices that must be driven from the main thread
+    (Tk).
+    """
+    DEFAULT_DEPTH = 1
+    MAX_DEPTH = 2
+    JOIN_TIMEOUT = 2.0  # seconds to wait for the thread on stop()
+
+    def __init__(self, device: Device, size: Tuple[int, int], depth: int = DEFAULT_DEPTH, threaded: bool = True,
+                 update_device: bool = False, clock: Callable[[], float] = time.monotonic) -> None:
+        """Creates the pipeline and its frame pool; call start() before submitting when threaded."""
+        if not 1 <= depth <= self.MAX_DEPTH:
+            raise ValueError(f"Queue depth must be between 1 and {self.MAX_DEPTH}, got {depth}")
+        self.device = device
+        self.depth = depth
+        self.threaded = threaded
+        self.update_device = update_device # call device.update() after every push
+        self.clock = clock
+        # Queued frames plus the one being sent are held; one more is being drawn
+        self.frame_pool = FramePool(size, count=depth + 2 if threaded else FramePool.DEFAULT_COUNT)
+
+        self._queue: Deque[PendingFrame] = deque()
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._started_at = clock()
+        self._rendered = 0
+        self._sent = 0
+        self._dropped = 0
+        self._failed = 0
+        self._send_time = 0.0
+        self._latency = 0.0
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        """Return True while the transport thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the transport thread (no-op if already running or not threaded)."""
+        if self.running or not self.threaded:
+            return
+        self._stop_event.clear()
+        self._started_at = self.clock()
+        self._thread = threading.Thread(target=self._run, name="RenderPipeline", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the transport thread, waiting at most JOIN_TIMEOUT seconds; unsent frames are discarded."""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self.JOIN_TIMEOUT)
+            self._thread = None
+        with self._condition:
+            while self._queue:
+                self._release(self._queue.popleft().frame)
+
+    # --- Render stage ---
+
+    def acquire(self) -> Tuple[Image.Image, ImageDraw.ImageDraw]:
+        """Returns a cleared frame buffer that is not queued or being sent, and its ImageDraw."""
+        return self.frame_pool.acquire()
+
+    def submit(self, frame: Frame, screen_id: Optional[str] = None) -> bool:
+        """Hands a frame to the transport stage without blocking; returns False if it replaced an unsent one."""
+        pending = PendingFrame(frame, screen_id, self.clock())
+        self._rendered += 1
+        if not self.threaded:
+            self._send(pending)
+            return True
+
+        if isinstance(frame, Image.Image):
+            self.frame_pool.hold(frame)
+        replaced = None
+        with self._condition:
+            if len(self._queue) >= self.depth:
+                replaced = self._queue.popleft()
+                self._dropped += 1
+            self._queue.append(pending)
+            self._condition.notify()
+        if replaced is not None:
+            self._release(replaced.frame)
+        return replaced is None
+
+    # --- Transport stage ---
+
+    def _release(self, frame: Frame) -> None:
+        """Returns a pooled buffer once it is sent or dropped."""
+        if isinstance(frame, Image.Image):
+            self.frame_pool.release(frame)
+
+    def _send(self, pending: PendingFrame) -> None:
+        """Pushes one frame to the device and accounts for it."""
+        started = self.clock()
+        try:
+            if pending.screen_id is not None:
+                self.device.set_screen_id(pending.screen_id)
+            if isinstance(pending.frame, np.ndarray):
+                accepted = self.device.display_rgb565(pending.frame)
+            else:
+                self.device.display(pending.frame)
+                accepted = True
+            if self.update_device:
+                self.device.update()
+        except Exception as e:
+            logger.error(f"Frame push failed: {e}")
+            accepted = False
+        finished = self.clock()
+        if accepted:
+            self._sent += 1
+            self._send_time += finished - started
+            self._latency += finished - pending.rendered_at
+        else:
+            self._failed += 1
+
+    def _run(self) -> None:
+        """Transport loop: sends the oldest queued frame whenever there is one."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._stop_event.is_set():
+                    self._condition.wait()
+                if self._stop_event.is_set():
+                    return
+                pending = self._queue.popleft()
+            try:
+                self._send(pending)
+            finally:
+                self._release(pending.frame)
+
+    # --- Reporting ---
+
+    def stats(self) -> PipelineStats:
+        """Returns the counters of both stages since start()."""
+        elapsed = max(self.clock() - self._started_at, 1e-9)
+        sent = self._sent
+        return PipelineStats(
+            rendered=self._rendered,
+            sent=sent,
+            dropped=self._dropped,
+            failed=self._failed,
+            render_fps=self._rendered / elapsed,
+            transport_fps=sent / elapsed,
+            mean_send_time=self._send_time / sent if sent else 0.0,
+            mean_latency=self._latency / sent if sent else 0.0,
+        )
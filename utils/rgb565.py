@@ -0,0 +1,105 @@
+from PIL import Image
+import numpy as np
+import sys
+from typing import Dict, Optional, Tuple
+
+LITTLE_ENDIAN = "little"
+BIG_ENDIAN = "big"
+
+def _premultiply_table() -> np.ndarray:
+    """Returns table[alpha, value]: a channel value composited onto opaque black.
+
+    Uses the same fixed-point arithmetic as PIL's alpha_composite, so the
+    output is identical to alpha_composite(black, image).
+    """
+    alpha = np.arange(256, dtype=np.uint32)[:, None]
+    value = np.arange(256, dtype=np.uint32)[None, :]
+    x = 128 * (value * alpha + 128)  # coef1 = alpha << 7, plus rounding
+    return (((((x >> 8) + x) >> 8) >> 7)).astype(np.uint8)
+
+_VALUES = np.arange(256, dtype=np.uint16)
+_CHANNEL_TABLES = (           # 8-bit channel value -> its bits in an RGB565 word
+    (_VALUES & 0xF8) << 8,    # red
+    (_VALUES & 0xFC) << 3,    # green
+    _VALUES >> 3,             # blue
+)
+_tables: Dict[str, Tuple[np.ndarray, ...]] = {}
+
+def _lookup_tables(byteorder: str) -> Tuple[np.ndarray, ...]:
+    """Returns (and caches) the per-channel tables of a byte order, indexed by (alpha << 8 | value)."""
+    tables = _tables.get(byteorder)
+    if tables is None:
+        premultiplied = _premultiply_table().ravel()
+        tables = tuple(table[premultiplied] for table in _CHANNEL_TABLES)
+        if byteorder != sys.byteorder:
+            # Swapping the table entries makes the output words land in memory in the target order
+            tables = tuple(table.byteswap() for table in tables)
+        _tables[byteorder] = tables = tuple(np.ascontiguousarray(t, dtype=np.uint16) for t in tables)
+    return tables
+
+class RGB565Converter:
+    """Converts PIL images to RGB565 words in a single vectorized pass.
+
+    RGBA input is composited onto black through (alpha, value) lookup
+    tables, bit-exact with PIL's alpha_composite; RGB input is packed with
+    shifts and masks. Output is written into a caller-provided (height,
+    width) buffer in the requested byte order, so it can be sent as is.
+    Work buffers are allocated once per converter.
+    """
+
+    def __init__(self, width: int, height: int, byteorder: str = LITTLE_ENDIAN) -> None:
+        """Prepares a converter for frames of the given size and output byte order."""
+        if byteorder not in (LITTLE_ENDIAN, BIG_ENDIAN):
+            raise ValueError(f"Unsupported byte order: {byteorder}")
+        self.size = (width, height)
+        self.byteorder = byteorder
+        self._index = np.empty((height, width), dtype=np.uint16)
+        self._scratch = np.empty((height, width), dtype=np.uint16)
+
+    def new_buffer(self) -> np.ndarray:
+        """Returns a zeroed output buffer whose dtype reflects the byte order (e.g. '>u2')."""
+        dtype = np.dtype('<u2' if self.byteorder == LITTLE_ENDIAN else '>u2')
+        return np.zeros((self.size[1], self.size[0]), dtype=dtype)
+
+    def convert(self, image: Image.Image, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Converts `image` into `out` (allocated if omitted) and returns it."""
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB')
+        if image.size != self.size:
+            # Slow path: flatten before scaling, as the devices always did
+            if image.mode == 'RGBA':
+                image = Image.alpha_composite(Image.new('RGBA', image.size, (0, 0, 0, 255)), image).convert('RGB')
+            image = image.resize(self.size)
+        if out is None:
+            out = self.new_buffer()
+        # Raw words, already in the target byte order once written
+        words = out.view(np.uint16)
+        pixels = np.asarray(image)  # the only copy of the frame
+
+        if image.mode == 'RGBA':
+            tables = _lookup_tables(self.byteorder)
+            alpha_high = self._index
+            np.left_shift(pixels[:, :, 3], 8, out=alpha_high, dtype=np.uint16)
+            for channel, table in enumerate(tables):
+                target = words if channel == 0 else self._scratch
+                np.bitwise_or(alpha_high, pixels[:, :, channel], out=target)
+                np.take(table, target, out=target, mode='clip')
+                if channel:
+                    np.bitwise_or(words, target, out=words)
+        else:
+            # Opaque input: plain shifts and masks beat table lookups
+            scratch = self._scratch
+            np.left_shift(pixels[:, :, 0], 8, out=words, dtype=np.uint16)
+            np.bitwise_and(words, 0xF800, out=words)
+            np.left_shift(pixels[:, :, 1], 3, out=scratch, dtype=np.uint16)
+            np.bitwise_and(scratch, 0x07E0, out=scratch)
+            np.bitwise_or(words, scratch, out=words)
+            np.right_shift(pixels[:, :, 2], 3, out=scratch, dtype=np.uint16)
+            np.bitwise_or(words, scratch, out=words)
+            if self.byteorder != sys.byteorder:
+                words.byteswap(inplace=True)
+        return out
+
+def to_rgb565(image: Image.Image, byteorder: str = LITTLE_ENDIAN) -> np.ndarray:
+    """Converts an image at its own size in one call (allocates; prefer RGB565Converter in loops)."""
+    return RGB565Converter(image.width, image.height, byteorder).convert(image)
@@ -0,0 +1,93 @@
+from PIL import Image, ImageDraw
+import numpy as np
+from typing import Dict, Tuple
+
+from metrics.history import MetricHistory
+from utils.glyph_atlas import get_atlas
+from views.screen import Screen
+
+Color = Tuple[int, int, int, int] # RGBA color type
+
+class HistoryScreen(Screen):
+    """Screen showing sparklines of the recent metric history."""
+    WINDOW_SECONDS = 600  # time span covered by each sparkline
+    ROW_HEIGHT = 32
+    LABEL_HEIGHT = 15     # pixels reserved for the label above each sparkline
+    LABEL_X, VALUE_X = 2, 70
+    DEFAULT_COLOR: Color = (255, 255, 255, 255)
+    BASELINE_COLOR: Color = (60, 60, 60, 255)
+
+    MIN_TEMP, MAX_TEMP = 40.0, 80.0 # degrees Celsius mapped to the sparkline range
+
+    # key -> (label, color)
+    ROWS: Dict[str, Tuple[str, Color]] = {
+        "cpu": ("CPU", (255, 170, 60, 255)),
+        "mem": ("MEM", (90, 200, 255, 255)),
+        "disk": ("DISK", (170, 255, 120, 255)),
+        "temp": ("TEMP", (255, 100, 100, 255)),
+    }
+
+    def __init__(self, is_raspberry: bool, screen_width: int, screen_height: int, history: MetricHistory) -> None:
+        """Initializes the history screen on top of a MetricHistory."""
+        super().__init__(is_raspberry, screen_width, screen_height)
+        self.history = history
+        self.atlas = get_atlas('fonts/PixelOperator.ttf', 16)
+
+        # Each column aggregates `bucket` samples; buffers are allocated once here
+        samples = max(1, int(self.WINDOW_SECONDS / history.sample_interval))
+        self.bucket = max(1, -(-samples // screen_width))  # ceil division
+        self.graph_height = self.ROW_HEIGHT - self.LABEL_HEIGHT - 1
+        self._series = np.empty(screen_width * self.bucket, dtype=np.float32)
+        self._rows = np.arange(self.graph_height, 0, -1, dtype=np.float32)[:, None]
+        self._mask = np.zeros((self.graph_height, screen_width), dtype=np.uint8)
+        self._mask_image = Image.frombuffer('L', (screen_width, self.graph_height), self._mask, 'raw', 'L', 0, 1)  # shares _mask's memory
+        self._drawn_generation = -1
+
+    def next_frame_time(self, now: float) -> float:
+        """Asks for a frame whenever a new history sample was recorded."""
+        if self.history.generation != self._drawn_generation:
+            return now
+        return now + self.history.sample_interval
+
+    def _normalize(self, key: str, values: np.ndarray) -> np.ndarray:
+        """Scales samples of a metric to [0, 1] in place."""
+        if key == "temp":
+            values -= self.MIN_TEMP
+            values /= self.MAX_TEMP - self.MIN_TEMP
+        np.clip(values, 0.0, 1.0, out=values)
+        return values
+
+    def _sparkline_mask(self, key: str) -> Image.Image:
+        """Renders a metric's sparkline as an 'L' mask, one column per time bucket."""
+        series = self.history.series(key, len(self._series), self._series)
+        peaks = np.fmax.reduce(series.reshape(self.screen_width, self.bucket), axis=1)
+        heights = self._normalize(key, peaks) * self.graph_height
+        np.nan_to_num(heights, copy=False, nan=-1.0)  # no data: empty column
+
+        # A pixel is lit when its row (counted from the bottom) is below the column height
+        np.less_equal(self._rows, heights[None, :] + 0.5, out=self._mask, casting='unsafe')
+        self._mask *= 255
+        return self._mask_image
+
+    def _format_value(self, key: str) -> str:
+        """Formats the most recent sample of a metric."""
+        value = self.history.buffers[key].last()
+        if np.isnan(value):
+            return "--"
+        return f"{value:.1f}°C" if key == "temp" else f"{value * 100:.0f}%"
+
+    def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
+        """Draws one labelled sparkline per metric."""
+        draw.rectangle((0, 0, self.screen_width, self.screen_height), outline=0, fill=0)
+        self._drawn_generation = self.history.generation
+
+        for row, (key, (label, color)) in enumerate(self.ROWS.items()):
+            top = row * self.ROW_HEIGHT
+            self.atlas.draw_text(draw, (self.LABEL_X, top), label, self.DEFAULT_COLOR)
+            self.atlas.draw_text(draw, (self.VALUE_X, top), self._format_value(key), color)
+
+            graph_top = top + self.LABEL_HEIGHT
+            baseline = graph_top + self.graph_height
+            draw.line([(0, baseline), (self.screen_width, baseline)], fill=self.BASELINE_COLOR)
+            box = (0, graph_top, self.screen_width, baseline)
+            image.paste(color, box, self._sparkline_mask(key))
@@ -0,0 +1,90 @@
+from PIL import Image, ImageDraw
+from typing import Dict, List, Tuple
+
+from metrics.aggregator import HostAggregator, HostStatus
+from utils.glyph_atlas import get_atlas
+from views.main_screen import MainScreen
+from views.screen import Screen
+
+Color = Tuple[int, int, int, int] # RGBA color type
+
+class HostsScreen(Screen):
+    """Screen summarizing the metrics of remote hosts, one row per host, paging through large fleets."""
+    PAGE_INTERVAL = 5.0 # seconds each page of hosts stays on screen
+    HEADER_HEIGHT = 18
+    ROW_HEIGHT = 16
+    NAME_X, CPU_X, TEMP_X = 2, 66, 98
+    DEFAULT_COLOR: Color = (255, 255, 255, 255)
+    OFFLINE_COLOR: Color = (150, 150, 150, 255)
+    HEADER_LINE_COLOR: Color = (60, 60, 60, 255)
+    OFFLINE_TEXT = "off"
+
+    def __init__(self, is_raspberry: bool, screen_width: int, screen_height: int, aggregator: HostAggregator) -> None:
+        """Initializes the hosts screen on top of a HostAggregator."""
+        super().__init__(is_raspberry, screen_width, screen_height)
+        self.aggregator = aggregator
+        self.atlas = get_atlas('fonts/PixelOperator.ttf', 16)
+        self.rows_per_page = max(1, (screen_height - self.HEADER_HEIGHT) // self.ROW_HEIGHT)
+        self.page = 0
+        self.page_elapsed = 0.0
+        self._names: Dict[str, str] = {} # host name -> name truncated to its column
+
+    @property
+    def page_count(self) -> int:
+        """Returns the number of pages needed to show every host."""
+        return max(1, -(-len(self.aggregator.addresses) // self.rows_per_page))  # ceil division
+
+    def update(self, delta: float) -> None:
+        """Advances to the next page of hosts every PAGE_INTERVAL seconds."""
+        self.page_elapsed += delta
+        if self.page_elapsed >= self.PAGE_INTERVAL:
+            self.page_elapsed = 0.0
+            self.page = (self.page + 1) % self.page_count
+
+    def next_frame_time(self, now: float) -> float:
+        """Asks for a frame every poll interval, or earlier when the page flips."""
+        deadline = now + self.aggregator.interval
+        if self.page_count > 1:
+            deadline = min(deadline, now + self.PAGE_INTERVAL - self.page_elapsed)
+        return deadline
+
+    def _fit_name(self, name: str) -> str:
+        """Truncates a host name to the width of its column (cached per name)."""
+        fitted = self._names.get(name)
+        if fitted is None:
+            width = self.CPU_X - self.NAME_X - 4
+            fitted = name
+            while fitted and self.atlas.font.getlength(fitted) > width:
+                fitted = fitted[:-1]
+            self._names[name] = fitted
+        return fitted
+
+    def _draw_row(self, draw: ImageDraw.ImageDraw, y: int, status: HostStatus) -> None:
+        """Draws the name, CPU usage and temperature of one host."""
+        name_color = self.DEFAULT_COLOR if status.online else self.OFFLINE_COLOR
+        self.atlas.draw_text(draw, (self.NAME_X, y), self._fit_name(status.name), name_color)
+
+        cpu, temp = status.samples.get("cpu"), status.samples.get("temp")
+        if not status.online or cpu is None:
+            self.atlas.draw_text(draw, (self.CPU_X, y), self.OFFLINE_TEXT if not status.online else "--", self.OFFLINE_COLOR)
+        else:
+            self.atlas.draw_text(draw, (self.CPU_X, y), f"{cpu.value * 100:.0f}%", MainScreen._color_by_percent(cpu.value))
+        if status.online and temp is not None:
+            self.atlas.draw_text(draw, (self.TEMP_X, y), f"{temp.value:.0f}°", self.DEFAULT_COLOR)
+
+    def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
+        """Draws a header with the number of reachable hosts and the current page of host rows."""
+        draw.rectangle((0, 0, self.screen_width, self.screen_height), outline=0, fill=0)
+        statuses: List[HostStatus] = self.aggregator.statuses()
+        online = sum(1 for s in statuses if s.online)
+        self.page %= self.page_count
+
+        header = f"HOSTS {online}/{len(statuses)}"
+        if self.page_count > 1:
+            header += f"  {self.page + 1}/{self.page_count}"
+        self.atlas.draw_text(draw, (self.NAME_X, 0), header, self.DEFAULT_COLOR)
+        draw.line([(0, self.HEADER_HEIGHT - 2), (self.screen_width, self.HEADER_HEIGHT - 2)], fill=self.HEADER_LINE_COLOR)
+
+        start = self.page * self.rows_per_page
+        for row, status in enumerate(statuses[start:start + self.rows_per_page]):
+            self._draw_row(draw, self.HEADER_HEIGHT + row * self.ROW_HEIGHT, status)
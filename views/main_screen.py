@@ -1,7 +1,9 @@
-from PIL import ImageFont, Image, ImageDraw
+from PIL import Image, ImageDraw
 from dataclasses import dataclass
 from typing import Dict, Tuple, Optional
 from data_gatherer import DataGatherer
+from metrics.collector import MetricCollector
+from utils.glyph_atlas import GlyphAtlas, get_atlas
 from views.screen import Screen
 
 Color = Tuple[int, int, int, int] # RGBA color type
@@ -13,15 +15,25 @@ class IconConfig:
     color: Optional[Color]
     has_effects: bool = True
 
+@dataclass(frozen=True)
+class TextSprite:
+    """Rasterized text: an 'L' coverage mask and its offset from the text position."""
+    text: str
+    offset: Tuple[int, int]
+    mask: Image.Image
+
 class MainScreen(Screen):
     """Main screen class for displaying system information."""
     DATA_UPDATE_INTERVAL = 1.0 # seconds
+    PLACEHOLDER_TEXT = "--" # shown until the first snapshot arrives
     DEFAULT_COLOR: Color = (255, 255, 255, 255)
+    STALE_COLOR: Color = (150, 150, 150, 255) # for values that could not be refreshed yet
     TEXT_SHADOW_OFFSET = (1, 1)
     EFFECT_ALPHA = 100
 
     MIN_TEMP, IDLE_TEMP, MAX_TEMP = 40.0, 50.0, 80.0 # degrees Celsius
     LINE_Y_POSITIONS = [43, 85] # Y positions for horizontal lines
+    DYNAMIC_FIELDS = ("temp", "mem", "disk", "cpu") # icons and values whose color follows the data
 
     ICON_CONFIG: Dict[str, IconConfig] = {
         "temp": IconConfig((2, 3), None),
@@ -47,39 +59,72 @@ class MainScreen(Screen):
         "uptime": chr(62034), "time": chr(61463)
     }
 
-    def __init__(self, is_raspberry: bool, screen_width: int, screen_height: int) -> None:
-        """Initializes the main screen with the given parameters."""
+    def __init__(self, is_raspberry: bool, screen_width: int, screen_height: int,
+                 collector: Optional[MetricCollector] = None) -> None:
+        """Initializes the main screen with the given parameters.
+
+        Metrics are read from `collector`; when none is given a private one is
+        created, and it is polled synchronously unless its thread is started.
+        """
         super().__init__(is_raspberry, screen_width, screen_height)
-        self.data_gatherer = DataGatherer(is_raspberry)
-        self.font = self._load_font('fonts/PixelOperator.ttf', 16)
-        self.icon_font = self._load_font('fonts/lineawesome-webfont.ttf', 18)
-        self.last_data_update = 0.0
-        self.data, self.data_values = {}, {}
+        self.collector = collector or MetricCollector(DataGatherer(is_raspberry), self.DATA_UPDATE_INTERVAL)
+        self.text_atlas = self._load_atlas('fonts/PixelOperator.ttf', 16)
+        self.icon_atlas = self._load_atlas('fonts/lineawesome-webfont.ttf', 18)
+        self.font, self.icon_font = self.text_atlas.font, self.icon_atlas.font
+        self.last_data_update = self.DATA_UPDATE_INTERVAL  # collect on the first update if polled synchronously
+        self.data = {k: self.PLACEHOLDER_TEXT for k in self.TEXT_POSITIONS}
+        self.data_values = {k: 0.0 for k in ['cpu', 'mem', 'disk', 'temp']}
+        self.stale = set()
+        self.data_generation = 0
+
+        # Render caches: the static layer is drawn once, field sprites when their text changes,
+        # and the composed frame whenever a new snapshot arrives
+        self._static_layer: Optional[Image.Image] = None
+        self._sprites: Dict[str, TextSprite] = {}
+        self._frame: Optional[Image.Image] = None
+        self._frame_generation = -1
         self.refresh_data()
 
-    def _load_font(self, path: str, size: int) -> ImageFont.FreeTypeFont:
-        """Loads a font from the specified path."""
-        return ImageFont.truetype(path, size)
+    @property
+    def data_gatherer(self) -> DataGatherer:
+        """Returns the data gatherer feeding this screen's collector."""
+        return self.collector.data_gatherer
+
+    def _load_atlas(self, path: str, size: int) -> GlyphAtlas:
+        """Loads a font from the specified path, with its shared glyph cache."""
+        return get_atlas(path, size)
 
     def refresh_data(self) -> None:
-        """Refreshes the data from the data gatherer."""
-        g = self.data_gatherer
-        self.data = {
-            "public_ip": g.get_public_ip(), "local_ip": g.get_local_ip(),
-            "cpu": g.get_cpu_usage(), "mem": g.get_mem_usage(),
-            "disk": g.get_disk_usage(), "temp": g.get_temperature(),
-            "uptime": g.get_uptime(), "time": g.get_systime()
-        }
-        self.data_values = {k: g.get_metric_value(k) for k in ['cpu', 'mem', 'disk', 'temp']}
+        """Refreshes the data from the latest collector snapshot."""
+        snapshot = self.collector.latest
+        if snapshot.generation == self.data_generation:
+            return
+        self.data_generation = snapshot.generation
+        for key, sample in snapshot.samples.items():
+            self.data[key] = sample.text
+            self.data_values[key] = sample.value
+        self.stale = {key for key, sample in snapshot.samples.items() if sample.stale}
 
     def update(self, delta: float) -> None:
-        """Updates the screen with new data if the interval has passed."""
-        self.last_data_update += delta
-        if self.last_data_update >= self.DATA_UPDATE_INTERVAL:
-            self.last_data_update = 0.0
-            self.refresh_data()
+        """Picks up new snapshots; collects synchronously only when the collector is not running."""
+        if not self.collector.running:
+            self.last_data_update += delta
+            if self.last_data_update >= self.DATA_UPDATE_INTERVAL:
+                self.last_data_update = 0.0
+                self.collector.collect_once()
+        self.refresh_data()
+
+    def next_frame_time(self, now: float) -> float:
+        """Asks for a frame when a new snapshot is available, otherwise at the next data refresh."""
+        if self.collector.latest.generation != self._frame_generation:
+            return now
+        if not self.collector.running:
+            return now + max(0.0, self.DATA_UPDATE_INTERVAL - self.last_data_update)
+        # New snapshots wake the render loop; this is only a fallback
+        return now + self.DATA_UPDATE_INTERVAL
 
     def _calculate_colors(self) -> Dict[str, Color]:
+        """Calculates the colors of the dynamic fields from their values."""
         return {
             "temp": self._color_by_temp(self.data_values["temp"]),
             "mem": self._color_by_percent(self.data_values["mem"]),
@@ -114,22 +159,59 @@ class MainScreen(Screen):
         return ((r + 255) // 2, (g + 255) // 2, 127, 255)
 
     def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
-        """Draws the main screen with icons and text."""
-        draw.rectangle((0, 0, self.screen_width, self.screen_height), outline=0, fill=0)
-        colors = self._calculate_colors()
-
+        """Draws the main screen, reusing the previous frame when no data changed."""
+        if self._frame is None or self._frame_generation != self.data_generation:
+            self._compose_frame()
+        image.paste(self._frame)
+
+    def _build_static_layer(self) -> Image.Image:
+        """Renders the background, the fixed-color icons and the divider lines once."""
+        layer = Image.new('RGBA', (self.screen_width, self.screen_height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(layer)
         for icon, config in self.ICON_CONFIG.items():
-            color = colors.get(icon, config.color or self.DEFAULT_COLOR)
-            self._draw_icon(draw, icon, config.position, color, config.has_effects)
+            if icon not in self.DYNAMIC_FIELDS:
+                self._draw_icon(draw, icon, config.position, config.color or self.DEFAULT_COLOR, config.has_effects)
 
         for y in self.LINE_Y_POSITIONS:
             draw.line([(0, y), (self.screen_width, y)], fill=self.DEFAULT_COLOR)
+        return layer
+
+    def _text_sprite(self, field: str, atlas: GlyphAtlas, text: str) -> TextSprite:
+        """Returns the composed mask of a field's text, re-rendering it only when the text changed."""
+        sprite = self._sprites.get(field)
+        if sprite is None or sprite.text != text:
+            offset, mask = atlas.render(text)
+            sprite = TextSprite(text, offset, mask)
+            self._sprites[field] = sprite
+        return sprite
+
+    def _paste_sprite(self, image: Image.Image, pos: Tuple[int, int], sprite: TextSprite, color: Color) -> None:
+        """Fills a sprite's mask with a color at the given text position."""
+        x, y = pos[0] + sprite.offset[0], pos[1] + sprite.offset[1]
+        image.paste(color, (x, y, x + sprite.mask.width, y + sprite.mask.height), sprite.mask)
+
+    def _compose_frame(self) -> None:
+        """Rebuilds the cached frame from the static layer and the per-field sprites."""
+        if self._static_layer is None:
+            self._static_layer = self._build_static_layer()
+        frame = self._frame = self._static_layer.copy()
+        colors = self._calculate_colors()
 
-        for k in ['temp', 'mem', 'disk', 'cpu']:
-            draw.text(self.TEXT_POSITIONS[k], self.data[k], font=self.font, fill=colors[k])
-
-        for k in ['local_ip', 'public_ip', 'uptime', 'time']:
-            draw.text(self.TEXT_POSITIONS[k], self.data[k], font=self.font, fill=self.DEFAULT_COLOR)
+        for icon in self.DYNAMIC_FIELDS:
+            config, color = self.ICON_CONFIG[icon], colors[icon]
+            sprite = self._text_sprite(f"icon:{icon}", self.icon_atlas, self.ICON_CODES[icon])
+            if config.has_effects:
+                shadow = tuple(p + o for p, o in zip(config.position, self.TEXT_SHADOW_OFFSET))
+                self._paste_sprite(frame, shadow, sprite, (*color[:3], 60))
+            self._paste_sprite(frame, config.position, sprite, color)
+
+        for k, pos in self.TEXT_POSITIONS.items():
+            if k in colors:
+                color = colors[k]
+            else:
+                color = self.STALE_COLOR if k in self.stale else self.DEFAULT_COLOR
+            self._paste_sprite(frame, pos, self._text_sprite(k, self.text_atlas, self.data[k]), color)
+        self._frame_generation = self.data_generation
 
     def _draw_icon(self, draw: ImageDraw.ImageDraw, key: str, pos: Tuple[int, int], color: Color, fx: bool) -> None:
         """Draws the icon at the specified position with the given color and effects."""
@@ -141,4 +223,4 @@ class MainScreen(Screen):
 
     def _draw_text(self, draw: ImageDraw.ImageDraw, pos: Tuple[int, int], text: str, color: Color) -> None:
         """Draws text at the specified position with the given color."""
-        draw.text(pos, text, font=self.icon_font, fill=color)
\ No newline at end of file
+        self.icon_atlas.draw_text(draw, pos, text, color)
\ No newline at end of file
@@ -1,4 +1,6 @@
 from PIL import Image, ImageDraw
+import numpy as np
+from typing import Optional
 
 class Screen:
     """Base class for screens in the application."""
@@ -13,6 +15,22 @@ class Screen:
         """Update the screen. This method should be overridden by subclasses."""
         pass
 
+    def next_frame_time(self, now: float) -> float:
+        """Return the time.monotonic() instant at which the screen next needs a frame.
+
+        The default asks for frames continuously (capped by the frame rate);
+        screens whose content changes rarely should override it.
+        """
+        return now
+
+    def get_native_frame(self, byteorder: str) -> Optional[np.ndarray]:
+        """Return the frame as a (height, width) RGB565 array in `byteorder`, or None to be drawn instead.
+
+        Screens with precomputed content (e.g. animations) can override this
+        so the frame goes to the device without drawing or conversion.
+        """
+        return None
+
     def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
         """Draw the screen. This method should be overridden by subclasses."""
         pass
\ No newline at end of file
@@ -1,72 +1,51 @@
 from PIL import Image, ImageDraw
+import numpy as np
 import time
+from typing import Callable, Optional
 
+from utils.gif_cache import GifFrameCache
 from views.screen import Screen
 
 class SecondaryScreen(Screen):
     # Constants
     DEFAULT_GIF_PATH = "./resources/psyduck.gif"
-    DEFAULT_FRAME_DURATION_MS = 100
-    MILLISECONDS_IN_SECOND = 1000
     RESIZE_METHOD = Image.NEAREST
 
-    def __init__(self, is_raspberry: bool, screen_width: int, screen_height: int):
+    def __init__(self, is_raspberry: bool, screen_width: int, screen_height: int, cache_dir: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic):
         """Initialize the SecondaryScreen with the given parameters."""
         super().__init__(is_raspberry, screen_width, screen_height)
 
         self.gif_path = self.DEFAULT_GIF_PATH
+        self.clock = clock
 
-        self.frames = []
-        self.durations = []
+        # Frames are decoded lazily; a warm cache only reads the durations
+        self.gif = GifFrameCache(self.gif_path, (screen_width, screen_height), cache_dir, resample=self.RESIZE_METHOD)
+        self.durations = self.gif.durations
         self.current_frame_index = 0
-        self.prev_frame_index = 0
-        self.last_frame_time = time.time()
-        self.draw_position = (0, 0)  # Will be computed after loading the first frame
-
-        self.load_gif()
-
-    def load_gif(self) -> None:
-        """Load the GIF file and prepare the frames."""
-        gif = Image.open(self.gif_path)
-        
-        try:
-            while True:
-                frame = gif.copy().convert("RGBA")
-                resized_frame = frame.resize(
-                    (self.screen_width, self.screen_height),
-                    self.RESIZE_METHOD
-                )
-                self.frames.append(resized_frame)
-                duration_ms = gif.info.get('duration', self.DEFAULT_FRAME_DURATION_MS)
-                duration_s = duration_ms / self.MILLISECONDS_IN_SECOND
-                self.durations.append(duration_s)
-                gif.seek(gif.tell() + 1)
-        except EOFError:
-            pass  # end of GIF
-
-        if self.frames:
-            frame_width, frame_height = self.frames[0].size
-            self.draw_position = (
-                (self.screen_width - frame_width) // 2,
-                (self.screen_height - frame_height) // 2
-            )
+        self.last_frame_time = clock()
 
     def update(self, delta: float) -> None:
         """Update the screen with the given delta time."""
-        current_time = time.time()
+        current_time = self.clock()
         frame_duration = self.durations[self.current_frame_index]
 
         if current_time - self.last_frame_time >= frame_duration:
-            self.prev_frame_index = self.current_frame_index
-            self.current_frame_index = (self.current_frame_index + 1) % len(self.frames)
-            self.last_frame_time = current_time
+            self.current_frame_index = (self.current_frame_index + 1) % len(self.durations)
+            # Advance by the frame duration so the animation does not drift; resync if far behind
+            self.last_frame_time += frame_duration
+            if current_time - self.last_frame_time >= frame_duration:
+                self.last_frame_time = current_time
 
-    def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
-        """Draw the secondary screen with the current GIF frame."""
-        frame = self.frames[self.current_frame_index]
-        prev_frame = self.frames[self.prev_frame_index]
+    def next_frame_time(self, now: float) -> float:
+        """Return the instant at which the current GIF frame ends."""
+        return self.last_frame_time + self.durations[self.current_frame_index]
 
-        x, y = self.draw_position
+    def get_native_frame(self, byteorder: str) -> np.ndarray:
+        """Return the current GIF frame as ready-to-send RGB565, composited onto black."""
+        return self.gif.native_frames(byteorder)[self.current_frame_index]
 
-        image.paste(prev_frame, (x, y), prev_frame.convert("L"))
-        image.paste(frame, (x, y))
\ No newline at end of file
+    def draw(self, draw: ImageDraw.ImageDraw, image: Image.Image) -> None:
+        """Draw the secondary screen with the current GIF frame."""
+        # Frames cover the whole screen, so a plain paste replaces everything
+        image.paste(self.gif.image(self.current_frame_index), (0, 0))